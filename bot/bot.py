@@ -1,14 +1,19 @@
+import re
+from datetime import datetime
+from pathlib import Path
 from time import perf_counter
 from typing import Awaitable, Callable, List, override
 # from bot.analytics.analytics import Analytics
 from bot.army_composition.army_composition_manager import ArmyCompositionManager, get_composition_manager
 from bot.buildings.builder import Builder
 from bot.buildings.handler import BuildingsHandler
+from bot.combat.ability_availability import AbilityAvailability, get_ability_availability
 from bot.combat.select_orders import SelectOrders
 from bot.debug import Debug
 from bot.macro.expansion_manager import Expansions, get_expansions
 from bot.macro.macro import Macro
 from bot.macro.map.map import MapData, get_map
+from bot.macro.map.pathing_distances import PathingDistances, get_pathing_distances
 from bot.macro.resources import Resources
 from bot.scout import Scout
 from bot.scouting.ghost_units.manager import GhostUnitsManager, get_ghost_units
@@ -19,15 +24,18 @@ from bot.superbot import Superbot
 from bot.technology.search import Search
 from bot.units.trainer import Trainer
 from bot.strategy.build_order.addon_swap import AddonSwapManager
+from bot.utils.map_cache import DATA_FOLDER
 from bot.utils.matchup import Matchup, get_matchup
 from sc2.bot_ai import Race
 from sc2.data import Result
 from sc2.ids.unit_typeid import UnitTypeId
+from sc2.step_profiler import section_name
 from sc2.unit import Unit
 from sc2.units import Units
 from .utils.unit_tags import zerg_townhalls, creep
 
 VERSION: str = "12.16.2"
+PROFILE_FOLDER: Path = Path(DATA_FOLDER) / "step_profiles"
 
 class WickedBot(Superbot):
     NAME: str = "WickedBot"
@@ -43,11 +51,17 @@ class WickedBot(Superbot):
     # analytics: Analytics
     opponent_random: bool = False
     tag_to_update: bool = False
+    last_step_start: float = 0
 
     def __init__(self) -> None:
         super().__init__()
         self.raw_affects_selection = False
         self.enable_feature_layer = False
+        # pathing grid is patched locally between two game info requests
+        self.game_info_refresh_interval = 16
+        # single round trip steps, off until they have been run against a live game
+        self.pipelined_steps = False
+        self.profile_steps = True
         self.builder = Builder(self)
         self.buildings = BuildingsHandler(self)
         self.addon_swap = AddonSwapManager(self)
@@ -106,6 +120,16 @@ class WickedBot(Superbot):
     def ghost_units(self) -> GhostUnitsManager:
         return get_ghost_units(self)
 
+    @property
+    @override
+    def abilities(self) -> AbilityAvailability:
+        return get_ability_availability(self)
+
+    @property
+    @override
+    def pathing_distances(self) -> PathingDistances:
+        return get_pathing_distances(self)
+
     @override
     async def on_start(self):
         """
@@ -126,13 +150,14 @@ class WickedBot(Superbot):
             return
         # General Game Stuff
         if (iteration == 1):
-            await self.greetings()
-            await self.expansions.set_expansion_list()
-            self.map.initialize()
-            await self.macro.speed_mining.start()
-            self.map.influence_maps.init_influence_maps()
-            self.build_order.select_build(self.matchup)
-            await self.tag_game()
+            with self.profiler.section("initialize"):
+                await self.greetings()
+                await self.expansions.set_expansion_list()
+                self.map.initialize()
+                await self.macro.speed_mining.start()
+                self.map.influence_maps.init_influence_maps()
+                self.build_order.select_build(self.matchup)
+                await self.tag_game()
             # self.analytics.write("Test")
             # await self.client.debug_fast_build()
             # await self.client.debug_all_resources()
@@ -148,59 +173,101 @@ class WickedBot(Superbot):
             # await self.client.debug_create_unit([[UnitTypeId.QUEEN, 2, self._game_info.map_center.towards(self.enemy_start_locations[0], 2.5), 2]])
         
         start_time: float = perf_counter()
-        await self.check_surrend_condition()
+        with self.profiler.section("check_surrend_condition"):
+            await self.check_surrend_condition()
         # Update random tag
         if (self.tag_to_update):
-            await self.tag_game()
+            with self.profiler.section("tag_game"):
+                await self.tag_game()
         
         # Update Building grid and last known enemy positions
-        self.structures_memory = self.structures.copy()
-        self.expansions.update_scout_status()
-        self.map.influence_maps.update()
-        self.ghost_units.update_ghost_units()
+        with self.profiler.section("structures_memory"):
+            self.structures_memory = self.structures.copy()
+        with self.profiler.section("expansions.update_scout_status"):
+            self.expansions.update_scout_status()
+        with self.profiler.section("map.influence_maps.update"):
+            self.map.influence_maps.update()
+        with self.profiler.section("ghost_units.update_ghost_units"):
+            self.ghost_units.update_ghost_units()
+        # Single batched query of the abilities checked by micro this frame
+        with self.profiler.section("abilities.update"):
+            await self.abilities.update()
         
         # General Worker management
-        await self.macro.speed_mining.execute()
-        await self.macro.distribute_workers(iteration)
-        await self.macro.mule_idle()
-        await self.macro.unbug_workers()
+        with self.profiler.section("macro.speed_mining.execute"):
+            await self.macro.speed_mining.execute()
+        with self.profiler.section("macro.distribute_workers"):
+            await self.macro.distribute_workers(iteration)
+        with self.profiler.section("macro.mule_idle"):
+            await self.macro.mule_idle()
+        with self.profiler.section("macro.unbug_workers"):
+            await self.macro.unbug_workers()
         
         # Assement of the situation
-        self.scouting.detect_enemy_army()
-        self.scouting.detect_enemy_workers()
-        self.scouting.detect_enemy_buildings()
-        await self.scouting.detect_enemy_upgrades()
-        await self.strategy.update_situation()
-        await self.macro.update_threat_level()
-        self.composition_manager.update_composition()
+        with self.profiler.section("scouting.detect_enemy_army"):
+            self.scouting.detect_enemy_army()
+        with self.profiler.section("scouting.detect_enemy_workers"):
+            self.scouting.detect_enemy_workers()
+        with self.profiler.section("scouting.detect_enemy_buildings"):
+            self.scouting.detect_enemy_buildings()
+        with self.profiler.section("scouting.detect_enemy_upgrades"):
+            await self.scouting.detect_enemy_upgrades()
+        with self.profiler.section("strategy.update_situation"):
+            await self.strategy.update_situation()
+        with self.profiler.section("macro.update_threat_level"):
+            await self.macro.update_threat_level()
+        with self.profiler.section("composition_manager.update_composition"):
+            self.composition_manager.update_composition()
         
         # Specific Worker Management & Strategy updates
-        await self.macro.workers_response_to_threat()
-        await self.strategy.cheese_response()
-        await self.buildings.repair_buildings()
-        await self.buildings.cancel_buildings()
-        await self.buildings.finish_construction()
-        await self.builder.supply_depot.move_worker_first()
-        await self.builder.command_center.move_worker_expand()
-        await self.scout.scout_proxy()
+        with self.profiler.section("macro.workers_response_to_threat"):
+            await self.macro.workers_response_to_threat()
+        with self.profiler.section("strategy.cheese_response"):
+            await self.strategy.cheese_response()
+        with self.profiler.section("buildings.repair_buildings"):
+            await self.buildings.repair_buildings()
+        with self.profiler.section("buildings.cancel_buildings"):
+            await self.buildings.cancel_buildings()
+        with self.profiler.section("buildings.finish_construction"):
+            await self.buildings.finish_construction()
+        with self.profiler.section("builder.supply_depot.move_worker_first"):
+            await self.builder.supply_depot.move_worker_first()
+        with self.profiler.section("builder.command_center.move_worker_expand"):
+            await self.builder.command_center.move_worker_expand()
+        with self.profiler.section("scout.scout_proxy"):
+            await self.scout.scout_proxy()
 
         # Control buildings
-        self.buildings.reserve_bunkers()
-        await self.buildings.scan()
-        await self.buildings.drop_mules()
-        await self.buildings.handle_supplies()
-        await self.buildings.rally_points()
-        await self.buildings.lift_townhalls()
-        await self.buildings.land_townhalls()
-        self.addon_swap.on_step()
-        await self.buildings.reposition_buildings()
-        await self.buildings.salvage_bunkers()
+        with self.profiler.section("buildings.reserve_bunkers"):
+            self.buildings.reserve_bunkers()
+        with self.profiler.section("buildings.scan"):
+            await self.buildings.scan()
+        with self.profiler.section("buildings.drop_mules"):
+            await self.buildings.drop_mules()
+        with self.profiler.section("buildings.handle_supplies"):
+            await self.buildings.handle_supplies()
+        with self.profiler.section("buildings.rally_points"):
+            await self.buildings.rally_points()
+        with self.profiler.section("buildings.lift_townhalls"):
+            await self.buildings.lift_townhalls()
+        with self.profiler.section("buildings.land_townhalls"):
+            await self.buildings.land_townhalls()
+        with self.profiler.section("addon_swap.on_step"):
+            self.addon_swap.on_step()
+        with self.profiler.section("buildings.reposition_buildings"):
+            await self.buildings.reposition_buildings()
+        with self.profiler.section("buildings.salvage_bunkers"):
+            await self.buildings.salvage_bunkers()
         
         # Control Attacking Units
-        await self.combat.select_orders(iteration)
-        await self.combat.execute_orders()
-        await self.combat.handle_bunkers()
-        await self.combat.micro_planetary_fortresses()
+        with self.profiler.section("combat.select_orders"):
+            await self.combat.select_orders(iteration)
+        with self.profiler.section("combat.execute_orders"):
+            await self.combat.execute_orders()
+        with self.profiler.section("combat.handle_bunkers"):
+            await self.combat.handle_bunkers()
+        with self.profiler.section("combat.micro_planetary_fortresses"):
+            await self.combat.micro_planetary_fortresses()
 
         # Spend Money
         money_spenders: List[Callable[[Resources], Awaitable[Resources]]] = []
@@ -277,67 +344,77 @@ class WickedBot(Superbot):
             (self.vespene, False)
         )
 
-        for money_spender in money_spenders:
-            if (resources.is_short_both):
-                break
-            resources = await money_spender(resources)
+        with self.profiler.section("money_spenders"):
+            for money_spender in money_spenders:
+                if (resources.is_short_both):
+                    break
+                with self.profiler.section(section_name(money_spender)):
+                    resources = await money_spender(resources)
 
 
         # Debug stuff
         
         end_time: float = perf_counter()
-        await self.debug.drop_path()
-        # await self.debug.unscouted_b2()
-        # await self.debug.colorize_bunkers()
-        # await self.debug.placement_grid()
-        # await self.debug.pathing_grid()
-        # await self.debug.building_grid()
-        # await self.macro.debug_bases_threat()
-        # await self.debug.bases_content()
-        # await self.debug.bases_bunkers()
-        # self.debug.bunker_data()
-        # await self.debug.bases_distance()
-        # await self.debug.selection()
-        # self.debug.type_id()
-        # self.debug.weapon_cooldown()
-        # self.debug.orders()
-        # self.debug.buffs()
-        # self.debug.wall()
-        # self.debug.height()
-        # self.debug.building()
-        # await self.debug.invisible_units()
-        # await self.debug.loaded_stuff(iteration)
-        # await self.debug.bunker_positions()
-        # await self.debug.wall_placement()
-        # self.debug.full_composition(iteration)
-        # self.debug.effects()
-        # self.debug.danger_map()
-        self.debug.free_bases()
-        # self.debug.danger_trajectories()
-        # self.debug.invisible_units()
-        # self.debug.tag()
-        # self.debug.radius()
-        # self.debug.addon_position()
-        # self.debug.range()
-        # self.debug.creep_map()
-        # self.debug.unit_type()
-        # self.debug.detection_map()
-        # self.macro.supply_block_update()
-        # self.debug.changelings()
-        self.debug.enemy_composition()
-        # self.debug.burrowed_units()
-        self.debug.ghost_units()
-        await self.combat.debug_army_orders()
-        await self.combat.debug_drop_target()
-        await self.debug.chat_commands()
-        await self.debug.build_order()
-        await self.debug.composition_manager()
-        await self.debug.composition_priorities()
+        with self.profiler.section("debug"):
+            await self.debug.drop_path()
+            # await self.debug.unscouted_b2()
+            # await self.debug.colorize_bunkers()
+            # await self.debug.placement_grid()
+            # await self.debug.pathing_grid()
+            # await self.debug.building_grid()
+            # await self.macro.debug_bases_threat()
+            # await self.debug.bases_content()
+            # await self.debug.bases_bunkers()
+            # self.debug.bunker_data()
+            # await self.debug.bases_distance()
+            # await self.debug.selection()
+            # self.debug.type_id()
+            # self.debug.weapon_cooldown()
+            # self.debug.orders()
+            # self.debug.buffs()
+            # self.debug.wall()
+            # self.debug.height()
+            # self.debug.building()
+            # await self.debug.invisible_units()
+            # await self.debug.loaded_stuff(iteration)
+            # await self.debug.bunker_positions()
+            # await self.debug.wall_placement()
+            # self.debug.full_composition(iteration)
+            # self.debug.effects()
+            # self.debug.danger_map()
+            self.debug.free_bases()
+            # self.debug.danger_trajectories()
+            # self.debug.invisible_units()
+            # self.debug.tag()
+            # self.debug.radius()
+            # self.debug.addon_position()
+            # self.debug.range()
+            # self.debug.creep_map()
+            # self.debug.unit_type()
+            # self.debug.detection_map()
+            # self.macro.supply_block_update()
+            # self.debug.changelings()
+            self.debug.enemy_composition()
+            # self.debug.burrowed_units()
+            self.debug.ghost_units()
+            await self.combat.debug_army_orders()
+            await self.combat.debug_drop_target()
+            await self.debug.chat_commands()
+            await self.debug.build_order()
+            await self.debug.composition_manager()
+            await self.debug.composition_priorities()
         
         self.client.debug_text_screen(
             f'Step Time: {(end_time - start_time)*1000:.2f} ms',
             (0.01, 0.01),
         )
+        # full loop, including observation, game info and game step round trips
+        if (self.last_step_start > 0):
+            self.client.debug_text_screen(
+                f'Loop Time: {(start_time - self.last_step_start)*1000:.2f} ms | Game Info: {self._game_info_requests}/{iteration} | Round Trips: {self.client.round_trips} | Abilities: {self.abilities.queried_units} queried, {self.abilities.skipped_units} predicted',
+                (0.01, 0.03),
+            )
+        self.last_step_start = start_time
         
                     
     async def check_surrend_condition(self):
@@ -385,3 +462,25 @@ class WickedBot(Superbot):
         Do things here after the game ends
         """
         print("Game ended.")
+        # keep the distances queried during the game for the next game on this map
+        self.pathing_distances.save()
+        self.save_step_profile(result)
+
+    def save_step_profile(self, result: Result):
+        """
+        Prints the slowest sections of the steps and writes all of them to a json file, to find what made a step too long
+        """
+        if (not self.profiler.enabled):
+            return
+        print("Slowest sections (p95):")
+        for path, stats in self.profiler.slowest(10):
+            print(f'  {path}: p50 {stats["p50_ms"]:.2f} ms | p95 {stats["p95_ms"]:.2f} ms | p99 {stats["p99_ms"]:.2f} ms | max {stats["max_ms"]:.2f} ms')
+        map_name: str = re.sub(r"[^A-Za-z0-9_-]", "", self.game_info.map_name)
+        self.profiler.dump(
+            PROFILE_FOLDER / f'{datetime.now():%Y%m%d_%H%M%S}_{map_name}.json',
+            version=VERSION,
+            map=self.game_info.map_name,
+            matchup=str(self.matchup),
+            result=result.name,
+            game_loop=self.state.game_loop,
+        )
@@ -1,6 +1,6 @@
 from __future__ import annotations
 import math
-from typing import List
+from typing import List, Optional
 from bot.buildings.builders.armory import Armory
 from bot.buildings.builders.barracks_addon import BarracksReactor, BarracksTechlab
 from bot.buildings.builders.barracks import Barracks
@@ -100,10 +100,14 @@ class Builder:
         )
     
     async def build(self, unit_type: UnitTypeId, position: Point2, radius: float, has_addon: bool = False, force_position: bool = False):
-        theorical_location: Point2 = dfs_in_pathing(self.bot, position, unit_type, self.bot._game_info.map_center, radius, has_addon)
         if (force_position):
-            location: Point2 = position
+            location: Optional[Point2] = position
         else:
+            theorical_location: Optional[Point2] = dfs_in_pathing(
+                self.bot, position, unit_type, self.bot._game_info.map_center, radius, has_addon
+            )
+            if (theorical_location is None):
+                return
             location = await self.bot.find_placement(unit_type, near=theorical_location)
             if (location is None or not self.bot.map.influence_maps.buildings.can_build(location, unit_type)):
                 await self.bot.client.chat_send(f'Tag:Build_{unit_type.name}_incorrect', False)
@@ -25,7 +25,10 @@ class MissileTurret(Building):
                 turrets.amount == 0
                 or (
                     turrets.closest_distance_to(expansion.turret_mineral_line) > 10
-                    and turrets.closest_distance_to(expansion.turret_wall_position) > 10
+                    and (
+                        expansion.turret_wall_position is None
+                        or turrets.closest_distance_to(expansion.turret_wall_position) > 10
+                    )
                 )
             )
         )
@@ -48,4 +51,5 @@ class MissileTurret(Building):
     @property
     @override
     def position(self) -> Point2:
-        return self.expansions_without_turret.first.turret_wall_position
\ No newline at end of file
+        expansion = self.expansions_without_turret.first
+        return expansion.turret_wall_position or expansion.turret_mineral_line
\ No newline at end of file
@@ -119,11 +119,13 @@ class Building(CachedClass):
             print("Error, no valid position for {self.name}")
             return resources_updated
         
-        position: Point2 = (
+        position: Optional[Point2] = (
             dfs_in_pathing(self.bot, pos, self.unitId, self.bot.game_info.map_center, self.radius, self.has_addon)
             if not self.force_position
             else pos
         )
+        if (position is None):
+            return resources_updated
         
         if (position != pos):
             print(f"position changed for {self.name} from {pos.round(2)} to {position}")
@@ -1,5 +1,5 @@
 import math
-from typing import List, Set
+from typing import List, Optional, Set
 from bot.macro.expansion import Expansion
 from bot.macro.expansion_manager import Expansions
 from bot.macro.map.influence_maps.layers.buildings_layer import BuildingLayer
@@ -530,7 +530,9 @@ class BuildingsHandler:
                 if (self.bot.expansions.taken.safe.amount == 0):
                     continue
                 safest_base: Expansion = self.bot.expansions.taken.safe.closest_to(townhall.position)
-                safe_spot: Point2 = dfs_in_pathing(self.bot, safest_base.position, UnitTypeId.COMMANDCENTER, landing_spot, 2.5)
+                safe_spot: Optional[Point2] = dfs_in_pathing(self.bot, safest_base.position, UnitTypeId.COMMANDCENTER, landing_spot, 2.5)
+                if (safe_spot is None):
+                    continue
                 if (townhall.type_id == UnitTypeId.COMMANDCENTERFLYING):
                     townhall(AbilityId.LAND_COMMANDCENTER, safe_spot)
                 else:
@@ -614,7 +616,7 @@ class BuildingsHandler:
                 flying_building(AbilityId.LAND, wall_position)
                 continue
 
-            land_position: Point2 = dfs_in_pathing(
+            land_position: Optional[Point2] = dfs_in_pathing(
                 self.bot,
                 flying_building.position,
                 land_type,
@@ -622,6 +624,8 @@ class BuildingsHandler:
                 1.5,
                 True,
             )
+            if (land_position is None):
+                continue
             print(f"[reposition_buildings] Landing {flying_building.name}")
             flying_building(AbilityId.LAND, land_position)
         
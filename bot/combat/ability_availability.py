@@ -0,0 +1,120 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Set, Tuple
+
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.unit import Unit
+from sc2.units import Units
+if TYPE_CHECKING:
+    from bot.superbot import Superbot  # only imported for type hints
+
+ability_availability: AbilityAvailability | None = None
+
+# Abilities the micro handlers check, by unit type
+TRACKED_ABILITIES: Dict[UnitTypeId, Set[AbilityId]] = {
+    UnitTypeId.MEDIVAC: {AbilityId.EFFECT_MEDIVACIGNITEAFTERBURNERS},
+    UnitTypeId.REAPER: {AbilityId.KD8CHARGE_KD8CHARGE},
+    UnitTypeId.CYCLONE: {AbilityId.LOCKON_LOCKON},
+    UnitTypeId.THOR: {AbilityId.MORPH_THORHIGHIMPACTMODE},
+    UnitTypeId.THORAP: {AbilityId.MORPH_THOREXPLOSIVEMODE},
+    UnitTypeId.RAVEN: {
+        AbilityId.EFFECT_INTERFERENCEMATRIX,
+        AbilityId.EFFECT_ANTIARMORMISSILE,
+        AbilityId.BUILDAUTOTURRET_AUTOTURRET,
+    },
+}
+
+# Cooldowns (in game seconds) used to skip queries, they are lower bounds of the real cooldowns:
+# a value too low only costs a query, a value too high would hide an available ability
+PREDICTED_COOLDOWNS: Dict[AbilityId, float] = {
+    AbilityId.EFFECT_MEDIVACIGNITEAFTERBURNERS: 9,
+    AbilityId.KD8CHARGE_KD8CHARGE: 13,
+}
+# Game seconds a use waits for a query showing the ability is gone, after that the command is assumed dropped
+CONFIRMATION_DELAY: float = 2
+
+
+class AbilityAvailability:
+    """
+    Available abilities of our units, queried once per frame for every unit of TRACKED_ABILITIES
+    in a single request, micro handlers then read them with `available`.
+    Units whose tracked abilities are all known to be on cooldown are left out of the query.
+    A cooldown is only known once a query confirmed that the ability used is gone,
+    a rejected command (unit loaded, not enough energy, dropped) never hides the ability.
+    """
+    bot: Superbot
+    abilities: Dict[int, FrozenSet[AbilityId]]
+    cooldowns: Dict[Tuple[int, AbilityId], float]
+    pending_uses: Dict[Tuple[int, AbilityId], float]
+    queried_units: int = 0
+    skipped_units: int = 0
+
+    def __init__(self, bot: Superbot) -> None:
+        self.bot = bot
+        self.abilities = {}
+        self.cooldowns = {}
+        self.pending_uses = {}
+
+    def on_cooldown(self, unit: Unit, ability: AbilityId) -> bool:
+        return self.cooldowns.get((unit.tag, ability), 0) > self.bot.time
+
+    def used(self, unit: Unit, ability: AbilityId) -> None:
+        """
+        Record that `unit` just used `ability`, it won't be available again this frame.
+        Once a query confirms the ability is gone, the predictor skips it until its cooldown is over.
+        """
+        self.abilities[unit.tag] = self.abilities.get(unit.tag, frozenset()) - {ability}
+        if (ability in PREDICTED_COOLDOWNS):
+            self.pending_uses[(unit.tag, ability)] = self.bot.time
+
+    async def update(self) -> None:
+        tracked_units: Units = self.bot.units(TRACKED_ABILITIES.keys())
+        self.cooldowns = {
+            key: end for key, end in self.cooldowns.items()
+            if end > self.bot.time and key[0] in tracked_units.tags
+        }
+        self.pending_uses = {
+            key: used_time for key, used_time in self.pending_uses.items()
+            if used_time + CONFIRMATION_DELAY >= self.bot.time and key[0] in tracked_units.tags
+        }
+        abilities: Dict[int, FrozenSet[AbilityId]] = {}
+        units_to_query: List[Unit] = []
+        for unit in tracked_units:
+            if (all(self.on_cooldown(unit, ability) for ability in TRACKED_ABILITIES[unit.type_id])):
+                abilities[unit.tag] = self.abilities.get(unit.tag, frozenset()) - TRACKED_ABILITIES[unit.type_id]
+            else:
+                units_to_query.append(unit)
+        if (units_to_query):
+            queried: Dict[int, Set[AbilityId]] = await self.bot.client.query_available_abilities_with_tag(units_to_query)
+            queried_abilities: Dict[int, FrozenSet[AbilityId]] = {
+                tag: frozenset(unit_abilities) for tag, unit_abilities in queried.items()
+            }
+            abilities.update(queried_abilities)
+            self.confirm_uses(queried_abilities)
+        self.abilities = abilities
+        self.queried_units = len(units_to_query)
+        self.skipped_units = tracked_units.amount - len(units_to_query)
+
+    def confirm_uses(self, queried: Dict[int, FrozenSet[AbilityId]]) -> None:
+        """
+        Starts the predicted cooldown of the pending uses whose ability is gone from the query,
+        counted from the use: the cast can't be earlier so the prediction stays a lower bound.
+        Uses whose ability is still available stay pending, the unit keeps being queried.
+        """
+        for (tag, ability), used_time in list(self.pending_uses.items()):
+            if (tag in queried and ability not in queried[tag]):
+                self.cooldowns[(tag, ability)] = used_time + PREDICTED_COOLDOWNS[ability]
+                del self.pending_uses[(tag, ability)]
+
+    def available(self, unit: Unit) -> FrozenSet[AbilityId]:
+        """
+        Abilities of `unit` available this frame, empty for units that weren't queried.
+        """
+        return self.abilities.get(unit.tag, frozenset())
+
+
+def get_ability_availability(bot: Superbot) -> AbilityAvailability:
+    global ability_availability
+    if (ability_availability is None):
+        ability_availability = AbilityAvailability(bot)
+    return ability_availability
@@ -0,0 +1,82 @@
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+from sc2.unit import Unit
+from sc2.units import Units
+
+
+def cluster_labels(tree: cKDTree, radius: float) -> np.ndarray:
+    """
+    Label of the cluster of each point of the tree, two points being in the same cluster
+    if they are linked by a chain of points at most `radius` away from each other.
+    """
+    amount: int = tree.n
+    if (amount == 0):
+        return np.empty(0, dtype=np.int32)
+    pairs: np.ndarray = tree.query_pairs(radius, output_type='ndarray')
+    graph: coo_matrix = coo_matrix(
+        (np.ones(len(pairs), dtype=bool), (pairs[:, 0], pairs[:, 1])),
+        shape=(amount, amount),
+    )
+    _, labels = connected_components(graph, directed=False)
+    return labels
+
+
+class ArmyClusters:
+    """
+    Groups units into clusters and keeps the id of each cluster across frames:
+    a new cluster takes the id most of its units had before.
+    """
+    labels: Dict[int, int]
+    next_id: int
+
+    def __init__(self) -> None:
+        self.labels = {}
+        self.next_id = 0
+
+    def update(self, units: Units, radius: float) -> List[Tuple[int, List[Unit]]]:
+        """
+        Recompute the clusters of `units`, ordered by their first unit in `units`.
+        """
+        components: Dict[int, List[Unit]] = {}
+        if (units.amount >= 1):
+            for label, unit in zip(cluster_labels(units.spatial_index.tree, radius), units):
+                components.setdefault(label, []).append(unit)
+
+        # biggest clusters keep their id first
+        cluster_ids: Dict[int, int] = {}
+        taken: set[int] = set()
+        for label, members in sorted(components.items(), key=lambda item: len(item[1]), reverse=True):
+            votes: Counter = Counter(self.labels[unit.tag] for unit in members if unit.tag in self.labels)
+            cluster_id: int | None = next(
+                (previous_id for previous_id, _ in votes.most_common() if previous_id not in taken),
+                None,
+            )
+            if (cluster_id is None):
+                cluster_id = self.next_id
+                self.next_id += 1
+            taken.add(cluster_id)
+            cluster_ids[label] = cluster_id
+
+        self.labels = {
+            unit.tag: cluster_ids[label]
+            for label, members in components.items()
+            for unit in members
+        }
+        return [(cluster_ids[label], members) for label, members in components.items()]
+
+    def group(self, units: Units) -> List[Tuple[int, List[Unit]]]:
+        """
+        Group `units` by the clusters of the last update, units unknown at that time are left out.
+        """
+        clusters: Dict[int, List[Unit]] = {}
+        for unit in units:
+            cluster_id: int | None = self.labels.get(unit.tag)
+            if (cluster_id is not None):
+                clusters.setdefault(cluster_id, []).append(unit)
+        return list(clusters.items())
@@ -58,11 +58,11 @@ class Execute(CachedClass):
             else self.bot.expansions.main.position
         )
         
-        sorted_enemy_bases: Expansions = self.bot.expansions.potential_enemy_bases.sorted(
-            lambda base: base.position._distance_squared(furthest_point),
-            reverse=True,
-        )
-        return sorted_enemy_bases.first.mineral_line
+        # the enemy army has to walk to defend, bases out of its reach come first
+        enemy_bases: Expansions = self.bot.expansions.potential_enemy_bases
+        distances: List[float] = self.bot.map.pathfinder.ground_distances(furthest_point, enemy_bases.positions)
+        furthest_index: int = max(range(enemy_bases.amount), key=lambda index: distances[index])
+        return enemy_bases[furthest_index].mineral_line
     
     @custom_cache_once_per_frame
     def best_edge(self) -> Point2:
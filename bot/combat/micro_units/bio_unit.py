@@ -56,7 +56,7 @@ class MicroBioUnit(MicroUnit):
                     close_enemies.amount >= 1 and
                     close_enemies.closest_to(bio_unit).type_id in always_stim_against
                 ) or (
-                    self.bot.map.influence_maps.danger.ground[bio_unit.position] >= DANGER_THRESHOLD
+                    self.bot.map.influence_maps.danger.ground_terrain[bio_unit.position] >= DANGER_THRESHOLD
                     and not bio_unit.weapon_ready
                 )
             )
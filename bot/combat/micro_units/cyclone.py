@@ -73,9 +73,7 @@ class MicroCyclone(MicroUnit):
                 return
 
         enemies_in_range: Units = self.get_enemy_units_in_range(cyclone)
-        available_abilities = (await self.bot.get_available_abilities([cyclone]))[0]
-
-        if (AbilityId.LOCKON_LOCKON not in available_abilities):
+        if (AbilityId.LOCKON_LOCKON not in self.bot.abilities.available(cyclone)):
             self._fight_on_lock_cooldown(cyclone, enemies_in_range, local_enemies)
             return
 
@@ -71,9 +71,9 @@ class MicroMedivac(MicroUnit):
         )
 
     async def boost(self, medivac: Unit):
-        available_abilities = (await self.bot.get_available_abilities([medivac]))[0]
-        if (AbilityId.EFFECT_MEDIVACIGNITEAFTERBURNERS in available_abilities):
+        if (AbilityId.EFFECT_MEDIVACIGNITEAFTERBURNERS in self.bot.abilities.available(medivac)):
             medivac(AbilityId.EFFECT_MEDIVACIGNITEAFTERBURNERS)
+            self.bot.abilities.used(medivac, AbilityId.EFFECT_MEDIVACIGNITEAFTERBURNERS)
     
     async def pickup(self, medivac: Unit, local_units: Units):
         # stop unloading if we are
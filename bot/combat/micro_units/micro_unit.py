@@ -2,6 +2,8 @@ from __future__ import annotations
 import math
 from typing import List, TYPE_CHECKING
 
+import numpy as np
+
 from bot.macro.expansion import Expansion
 from bot.macro.expansion_manager import Expansions
 from bot.scouting.ghost_units.ghost_units import GhostUnit, GhostUnits
@@ -12,8 +14,10 @@ from sc2.ids.buff_id import BuffId
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.position import Point2
 from sc2.unit import Unit
+from sc2.unit_snapshot import UnitSnapshot
 from sc2.units import Units
-from bot.utils.unit_tags import dont_attack, menacing, menacing_air, tower_types, creep, building_priorities, priority_targets
+from bot.utils.unit_tags import dont_attack, tower_types, creep, building_priorities, priority_targets
+from bot.utils.unit_traits import UnitTrait, has_trait
 
 if TYPE_CHECKING:
     from bot.superbot import Superbot  # only imported for type hints
@@ -36,21 +40,21 @@ class MicroUnit(CachedClass):
     def is_valid_enemy(self, unit: Unit) -> bool:
         # if (not unit.can_be_attacked):
         #     return False
-        if (unit.type_id in dont_attack):
+        if (has_trait(unit.type_id, UnitTrait.DONT_ATTACK)):
             return False
         return True
 
     def is_fighting_unit(self, unit: Unit) -> bool:
-        return unit.can_attack or unit.type_id in menacing
+        return unit.can_attack or has_trait(unit.type_id, UnitTrait.MENACING)
     
     def can_threaten_air(self, unit: Unit) -> bool:
-        return unit.can_attack_air or unit.type_id in menacing_air
+        return unit.can_attack_air or has_trait(unit.type_id, UnitTrait.MENACING_AIR)
 
     def is_tower(self, unit: Unit) -> bool:
-        return unit.type_id in tower_types
+        return has_trait(unit.type_id, UnitTrait.TOWER)
     
     def is_creep_tumor(self, unit: Unit) -> bool:
-        return unit.type_id in creep
+        return has_trait(unit.type_id, UnitTrait.CREEP)
     
     def can_be_attacked(self, enemy: Unit, unit: Unit) -> bool:
         if (not enemy.can_be_attacked):
@@ -78,20 +82,33 @@ class MicroUnit(CachedClass):
     @custom_cache_once_per_frame
     def enemy_all(self) -> Units:
         """Everything worth considering: real units, towers, and creep tumors."""
-        units = self.bot.enemy_units.filter(self.is_valid_enemy)
-        towers = self.bot.enemy_structures.filter(self.is_tower)
-        tumors = self.bot.enemy_structures.filter(self.is_creep_tumor)
-        return units + towers + tumors
+        snapshot: UnitSnapshot = self.bot.unit_snapshot
+        units: np.ndarray = snapshot.enemy_units & ~snapshot.of_type(dont_attack)
+        towers: np.ndarray = snapshot.enemy_structures & snapshot.of_type(tower_types)
+        tumors: np.ndarray = snapshot.enemy_structures & snapshot.of_type(creep) & ~towers
+        return snapshot.units(
+            np.concatenate((np.flatnonzero(units), np.flatnonzero(towers), np.flatnonzero(tumors)))
+        )
 
     @custom_cache_once_per_frame
     def enemy_fighting(self) -> Units:
         return self.enemy_all.filter(self.is_fighting_unit)
+
+    @custom_cache_once_per_frame
+    def enemy_max_air_range(self) -> float:
+        return max((enemy.air_range for enemy in self.enemy_fighting), default=0)
+
+    @custom_cache_once_per_frame
+    def enemy_max_ground_range(self) -> float:
+        return max((enemy.ground_range for enemy in self.enemy_fighting), default=0)
            
     def enemies_threatening_air_in_range(
             self, unit: Unit, safety_distance: float = 0, range_override: float | None = None
         ) -> Units:
-        # Step 1: get globally valid combat enemies
-        threats = self.enemy_all.filter(self.is_fighting_unit)
+        # Step 1: get globally valid combat enemies, close enough for the longest air range
+        threats = self.enemy_fighting.in_radius(
+            unit, unit.radius + self.enemy_max_air_range + safety_distance, include_radius=True
+        )
 
         # Step 2: optional proximity filter
         if (range_override):
@@ -111,8 +128,10 @@ class MicroUnit(CachedClass):
         Returns enemy units that can threaten the given unit (ground target logic).
         If range_override is set, only considers enemies within that radius first.
         """
-        # Step 1: get globally valid combat enemies
-        threats = self.enemy_all.filter(self.is_fighting_unit)
+        # Step 1: get globally valid combat enemies, close enough for the longest ground range
+        threats = self.enemy_fighting.in_radius(
+            unit, unit.radius + self.enemy_max_ground_range + safety_distance, include_radius=True
+        )
 
         # Step 2: optional proximity filter
         if (range_override):
@@ -121,7 +140,7 @@ class MicroUnit(CachedClass):
         # Step 3: threat capability check
         threats = threats.filter(
             lambda enemy: (
-                (enemy.can_attack_ground or enemy.type_id in menacing)
+                (enemy.can_attack_ground or has_trait(enemy.type_id, UnitTrait.MENACING))
                 and enemy.distance_to(unit) <= unit.radius + enemy.radius + enemy.ground_range + safety_distance
             )
         )
@@ -133,7 +152,9 @@ class MicroUnit(CachedClass):
             return Units([], self.bot)
         base_range: float = unit.distance_to_weapon_ready + unit.radius
 
-        return self.enemy_all.filter(
+        return self.enemy_all.in_radius(
+            unit, base_range + max(unit.ground_range, unit.air_range), include_radius=True
+        ).filter(
             lambda enemy: enemy.distance_to(unit) <= (
                 base_range + enemy.radius + 
                 (unit.ground_range if not enemy.is_flying else unit.air_range)
@@ -154,16 +175,13 @@ class MicroUnit(CachedClass):
         )
     
     def get_local_enemy_units(self, position: Point2, radius: float = 20, only_menacing: bool = False, include_structures: bool = True) -> Units:
-        enemies = self.enemy_all
-        if (only_menacing):
-            enemies = enemies.filter(self.is_fighting_unit)
+        enemies = self.enemy_fighting if only_menacing else self.enemy_all
+        enemies = enemies.in_radius(position, radius, include_radius=True)
 
         if (not include_structures):
             enemies = enemies.filter(lambda unit: unit.is_structure == False)
 
-        return enemies.filter(
-            lambda enemy: enemy.distance_to(position) <= radius + enemy.radius
-        )
+        return enemies
 
     def get_local_enemy_buildings(self, position: Point2) -> Units:
         return self.bot.enemy_structures.filter(
@@ -210,8 +228,12 @@ class MicroUnit(CachedClass):
             # select enemy harassing
             enemy_units_harassing: Units = self.bot.enemy_units.in_distance_of_group(self.bot.expansions.taken.ccs, 15)
             if (enemy_units_harassing.amount >= 1):
-                return self.bot.expansions.taken.closest_to(enemy_units_harassing.center).retreat_position
-        return self.bot.expansions.taken.without_main.closest_to(self.bot.scouting.known_enemy_army.center).retreat_position
+                return self.closest_base_by_ground(self.bot.expansions.taken, enemy_units_harassing.center).retreat_position
+        return self.closest_base_by_ground(self.bot.expansions.taken.without_main, self.bot.scouting.known_enemy_army.center).retreat_position
+    
+    def closest_base_by_ground(self, expansions: Expansions, position: Point2) -> Expansion:
+        # a base across a cliff can be close by air but far to walk to
+        return expansions[self.bot.map.pathfinder.closest(position, expansions.positions)]
     
         
     async def a_move(self, unit: Unit, target_position: Point2):
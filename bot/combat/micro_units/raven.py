@@ -1,4 +1,4 @@
-from typing import Optional, Set, override
+from typing import FrozenSet, Optional, Set, override
 
 from bot.combat.micro_units.micro_unit import MicroUnit
 from bot.utils.unit_supply import get_unit_supply
@@ -120,7 +120,7 @@ class MicroRaven(MicroUnit):
         
         if (raven.is_using_ability(raven_abilities)):
             return
-        available_abilities = (await self.bot.get_available_abilities([raven]))[0]
+        available_abilities: FrozenSet[AbilityId] = self.bot.abilities.available(raven)
         if (AbilityId.EFFECT_INTERFERENCEMATRIX in available_abilities and raven.energy >= INTERFERENCE_MATRIX_ENERGY_COST):
             if (await self.raven_interference_matrix(raven)):
                 return
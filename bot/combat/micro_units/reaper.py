@@ -9,8 +9,7 @@ from sc2.units import Units
 
 class MicroReaper(MicroScoutingUnit):
     async def reaper_grenade(self, reaper: Unit) -> bool:
-        available_abilities = (await self.bot.get_available_abilities([reaper]))[0]
-        if (AbilityId.KD8CHARGE_KD8CHARGE not in available_abilities):
+        if (AbilityId.KD8CHARGE_KD8CHARGE not in self.bot.abilities.available(reaper)):
             return False
         
         # best_target, score = self.bot.map.influence_maps.best_grenade_target(reaper)
@@ -29,6 +28,7 @@ class MicroReaper(MicroScoutingUnit):
             return False
         best_target: Point2 = potential_targets.first.position
         reaper(AbilityId.KD8CHARGE_KD8CHARGE, best_target)
+        self.bot.abilities.used(reaper, AbilityId.KD8CHARGE_KD8CHARGE)
         return True
     
     @override
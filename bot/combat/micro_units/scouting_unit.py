@@ -37,7 +37,7 @@ class MicroScoutingUnit(MicroUnit):
         # --- CASE 1: Weapon Ready ---
         if (unit.weapon_cooldown <= self.WEAPON_READY_THRESHOLD):
             # if we can safely shoot, just shoot
-            local_danger: float = self.bot.map.influence_maps.danger.ground[unit.position]
+            local_danger: float = self.bot.map.influence_maps.danger.ground_terrain[unit.position]
             if (threats.amount == 0 or (unit.health >= LIFE_THRESHOLD and unit.health > local_danger)):
                 if (enemy_ground_in_range.amount >= 1):
                     # shoot weakest enemy in range
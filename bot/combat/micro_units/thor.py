@@ -1,4 +1,4 @@
-from typing import List, override
+from typing import FrozenSet, List, override
 
 from bot.combat.micro_units.micro_unit import MicroUnit
 from bot.utils.unit_supply import get_unit_supply
@@ -16,7 +16,7 @@ class MicroThor(MicroUnit):
     WEAPON_DURATION_COOLDOWN: int = 40
 
     async def thor_switch_mode(self, thor: Unit):
-        available_abilities = (await self.bot.get_available_abilities([thor]))[0]
+        available_abilities: FrozenSet[AbilityId] = self.bot.abilities.available(thor)
         enemy_flying_units: Units = self.bot.scouting.known_enemy_army.units.filter(lambda unit: unit.is_flying)
         air_supply: int = 0
         light_air_supply: int = 0
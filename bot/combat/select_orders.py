@@ -1,9 +1,10 @@
 import math
-from typing import List, Optional, Set
+from typing import List, Optional
 from unittest import case
 from bot.macro.expansion import Expansion
 from bot.macro.expansion_manager import Expansions
 from bot.macro.map.influence_maps.manager import InfluenceMapManager
+from bot.combat.army_clusters import ArmyClusters
 from bot.combat.execute_orders import Execute
 from bot.combat.orders import Orders
 from bot.macro.macro import BASE_SIZE
@@ -26,19 +27,22 @@ from sc2.ids.upgrade_id import UpgradeId
 from sc2.position import Point2, Point3
 from sc2.unit import Unit
 from sc2.units import Units
-from ..utils.unit_tags import tower_types, worker_types, dont_attack, bio, menacing, creep, anti_air, scouting_units
+from ..utils.unit_tags import tower_types, worker_types, bio, menacing, creep, anti_air, scouting_units
+from ..utils.unit_traits import UnitTrait, has_trait
 
 WEAPON_READY_THRESHOLD: float = 6.0
 
 class SelectOrders:
     bot: Superbot
     execute: Execute
+    clusters: ArmyClusters
     armies: List[Army] = []
     DEFENSE_RANGE_LIMIT: int = 40
     
     def __init__(self, bot: Superbot) -> None:
         self.bot = bot
         self.execute = Execute(bot)
+        self.clusters = ArmyClusters()
     
     @property
     def army_supply(self) -> float:
@@ -51,28 +55,18 @@ class SelectOrders:
     def armies_size(self) -> float:
         return math.sqrt(self.army_supply) + 10
             
-    def load_clusters(self) -> List[Army]:
+    def load_clusters(self, army: Units) -> List[Army]:
+        orders: dict[int, Orders] = {
+            previous_army.cluster_id: previous_army.orders for previous_army in self.armies
+        }
         clusters: List[Army] = []
-        for army in self.armies:
-            units: List[Unit] = []
-            for tag in army.tags:
-                unit: Unit = self.bot.units.find_by_tag(tag)
-                if (unit is not None):
-                    units.append(unit)
-            if (len(units) == 0):
-                continue
-            new_army: Army = Army(Units(units, self.bot), self.bot)
-            new_army.orders = army.orders
+        for cluster_id, units in self.clusters.group(army):
+            new_army: Army = Army(Units(units, self.bot), self.bot, cluster_id)
+            new_army.orders = orders.get(cluster_id, new_army.orders)
             clusters.append(new_army)
         return clusters
     
     def get_army_clusters(self, iteration: int, radius: float = 15) -> List[Army]:
-        # calculate the army cluster only every 4 frames
-        if (iteration % 4 != 0 and len(self.armies) >= 1):
-            clusters: List[Army] = self.load_clusters()
-            if (len(clusters) >= 1):
-                return clusters
-
         army: Units = self.bot.units.of_type([
             UnitTypeId.REAPER,
             UnitTypeId.MARINE,
@@ -91,45 +85,23 @@ class SelectOrders:
             UnitTypeId.RAVEN,
         ])
 
-        # deep copy to ensure self.units isn't modified
-        units_copy: Units = army.copy()
-        visited_ids: Set[int] = set()
-        clusters: List[Army] = []
-        
-        for unit in units_copy:
-            if unit.tag in visited_ids:
-                continue  # Skip if already visited
+        # calculate the army cluster only every 4 frames
+        if (iteration % 4 != 0 and len(self.armies) >= 1):
+            clusters: List[Army] = self.load_clusters(army)
+            if (len(clusters) >= 1):
+                return clusters
 
-            # Start a new cluster
-            cluster: List[Unit] = []
-            stack: List[int] = [unit.tag]
+        return [
+            Army(Units(units, self.bot), self.bot, cluster_id)
+            for cluster_id, units in self.clusters.update(army, radius)
+        ]
 
-            while(stack):
-                current_id: int = stack.pop()
-                if current_id in visited_ids:
-                    continue
-                
-                visited_ids.add(current_id)
-                cluster.append(units_copy.find_by_tag(current_id))
-
-                # Find neighbors within the radius
-                for other_unit in units_copy:
-                    if (
-                        other_unit.tag not in visited_ids
-                        and unit.position.distance_to(other_unit.position) <= radius
-                    ):
-                        stack.append(other_unit.tag)
-
-            clusters.append(Army(Units(cluster, self.bot), self.bot))
-        return clusters
-
-    
     @property
     def global_enemy_units(self) -> Units:
         return self.bot.enemy_units.filter(
             lambda unit: (
                 # unit.can_be_attacked and
-                unit.type_id not in dont_attack
+                not has_trait(unit.type_id, UnitTrait.DONT_ATTACK)
             )
         )
     
@@ -473,11 +473,13 @@ class Debug:
 
     async def bunker_positions(self):
         for expansion in self.bot.expansions.not_defended:
-            bunker_position: Point2 = expansion.bunker_position
-            self.draw_grid_on_world(bunker_position, 3, "Bunker")
+            bunker_position: Optional[Point2] = expansion.bunker_position
+            if (bunker_position is not None):
+                self.draw_grid_on_world(bunker_position, 3, "Bunker")
             
-            bunker_position: Point2 = expansion.bunker_forward_in_pathing
-            self.draw_grid_on_world(bunker_position, 3, "Bunker forward")
+            bunker_position = expansion.bunker_forward_in_pathing
+            if (bunker_position is not None):
+                self.draw_grid_on_world(bunker_position, 3, "Bunker forward")
             
     async def wall_placement(self):
         self.draw_grid_on_world(self.bot.map.wall_placement[0], 2, "Depot")
@@ -353,10 +353,13 @@ class Expansion(CachedClass):
         return position_behind_worker_line(self.mineral_fields + self.vespene_geysers, self.position)
     
     @custom_cache_once_per_frame
-    def turret_wall_position(self) -> Point2:
+    def turret_wall_position(self) -> Optional[Point2]:
+        bunker_position: Optional[Point2] = self.bunker_position
+        if (bunker_position is None):
+            return None
         if (self.is_main):
-            return Point2(self.bunker_ramp.towards(self.position, 2)).rounded
-        return center([self.position, self.bunker_position])
+            return Point2(bunker_position.towards(self.position, 2)).rounded
+        return center([self.position, bunker_position])
     
     @custom_cache_once_per_frame
     def defending_structure(self) -> Optional[Unit]:
@@ -4,6 +4,7 @@ import random
 from typing import Any, Callable, Generator, List, Optional
 from bot.macro.expansion import Expansion
 from bot.macro.map.map import MapData, get_map
+from bot.macro.map.pathing_distances import PathingDistances, get_pathing_distances
 from sc2.bot_ai import BotAI
 from sc2.cache import CachedClass, custom_cache_once_per_frame
 from sc2.ids.unit_typeid import UnitTypeId
@@ -271,11 +272,22 @@ class Expansions(CachedClass):
 
     async def set_expansion_list(self):
         expansions: List[Expansion] = []
+        player_start: Point2 = self.bot.game_info.player_start_location
+        enemy_start: Point2 = self.bot.enemy_start_locations[0]
+        # distances are loaded from the map cache, missing ones are fetched in a single query
+        # base to base distances are fetched as well, so drops and scouting can read them without a query
+        pathing_distances: PathingDistances = get_pathing_distances(self.bot)
+        pathing_distances.load()
+        locations: List[Point2] = self.bot.expansion_locations_list
+        await pathing_distances.fetch(
+            (start, location)
+            for index, start in enumerate(locations)
+            for location in locations[index + 1:]
+        )
+        pathing_distances.save()
         for location in self.bot.expansion_locations_list:
-            player_start: Point2 = self.bot.game_info.player_start_location
-            enemy_start: Point2 = self.bot.enemy_start_locations[0]
-            d = await self.bot.client.query_pathing(player_start, location)
-            enemy_d = await self.bot.client.query_pathing(enemy_start, location)
+            d = pathing_distances.get(player_start, location)
+            enemy_d = pathing_distances.get(enemy_start, location)
             if (d is None or enemy_d is None):
                 continue
             expansions.append(Expansion(self.bot, location, d - enemy_d))
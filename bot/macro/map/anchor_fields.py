@@ -0,0 +1,103 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.ndimage import distance_transform_edt
+from scipy.sparse.csgraph import dijkstra
+
+from bot.macro.map.pathfinder import PathingGraph
+from bot.utils.map_cache import grid_hash, load_array, save_array
+from sc2.bot_ai import BotAI
+from sc2.position import Point2
+
+
+class AnchorFields:
+    """
+    Ground distance fields from the key points of the map (every expansion location and ramp),
+    computed once per game on the initial pathing grid and cached on disk per map.
+    fields[i, y, x] is the ground distance from anchor i to tile (x, y), unwalkable tiles take the value
+    of their closest walkable tile so structures and flying units can be looked up as well.
+    """
+    bot: BotAI
+    anchors: List[Point2]
+    indices: Dict[Tuple[float, float], int]
+    fields: np.ndarray
+
+    def __init__(self, bot: BotAI, anchors: List[Point2]) -> None:
+        self.bot = bot
+        self.anchors = []
+        self.indices = {}
+        for anchor in anchors:
+            key: Tuple[float, float] = (round(anchor.x, 1), round(anchor.y, 1))
+            if (key not in self.indices):
+                self.indices[key] = len(self.anchors)
+                self.anchors.append(anchor)
+        self.fields = self.load_or_compute()
+
+    def load_or_compute(self) -> np.ndarray:
+        pathing: np.ndarray = self.bot.game_info.pathing_grid.data_numpy
+        map_name: str = self.bot.game_info.map_name
+        anchors_array: np.ndarray = np.array([(anchor.x, anchor.y) for anchor in self.anchors], dtype=np.float32)
+        key: str = f'{grid_hash(pathing)}_{grid_hash(anchors_array)}'
+        fields: Optional[np.ndarray] = load_array(map_name, "anchor_fields", key)
+        if (fields is None or fields.shape != (len(self.anchors), *pathing.shape)):
+            fields = self.compute(pathing)
+            save_array(map_name, "anchor_fields", key, fields)
+        return fields
+
+    def compute(self, pathing: np.ndarray) -> np.ndarray:
+        height, width = pathing.shape
+        walkable: np.ndarray = pathing != 0
+        graph: PathingGraph = PathingGraph(np.where(walkable, 1.0, np.inf))
+        # anchors sit on townhall spots or ramp edges, start from their closest walkable tile
+        _, (closest_y, closest_x) = distance_transform_edt(~walkable, return_indices=True)
+        sources: List[int] = []
+        for anchor in self.anchors:
+            x: int = min(max(int(anchor.x), 0), width - 1)
+            y: int = min(max(int(anchor.y), 0), height - 1)
+            sources.append(int(closest_y[y, x]) * width + int(closest_x[y, x]))
+        distances: np.ndarray = dijkstra(graph.matrix, directed=True, indices=sources)
+        fields: np.ndarray = distances.astype(np.float32).reshape(len(self.anchors), height, width)
+        # unwalkable tiles read their closest walkable tile
+        return fields[:, closest_y, closest_x]
+
+    def index(self, anchor: Point2) -> int:
+        """ Index of the field of `anchor`, which must be one of the anchors. """
+        return self.indices[(round(anchor.x, 1), round(anchor.y, 1))]
+
+    def field(self, anchor: Point2) -> np.ndarray:
+        return self.fields[self.index(anchor)]
+
+    def tiles(self, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """ Tile indices of positions, clamped to the map. """
+        _, height, width = self.fields.shape
+        return (
+            np.clip(np.asarray(ys, dtype=np.int64), 0, height - 1),
+            np.clip(np.asarray(xs, dtype=np.int64), 0, width - 1),
+        )
+
+    def distance(self, anchor: Point2, position: Point2) -> float:
+        """ Ground distance from anchor to position, inf if there is no path. """
+        _, height, width = self.fields.shape
+        x: int = min(max(int(position.x), 0), width - 1)
+        y: int = min(max(int(position.y), 0), height - 1)
+        return float(self.fields[self.index(anchor), y, x])
+
+    def distances(self, anchor: Point2, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """ Ground distances from anchor to every position of the arrays. """
+        tile_ys, tile_xs = self.tiles(xs, ys)
+        return self.fields[self.index(anchor)][tile_ys, tile_xs]
+
+    def closer_to(self, anchor: Point2, other: Point2, xs: np.ndarray, ys: np.ndarray, ratio: float = 1) -> np.ndarray:
+        """
+        Mask of the positions whose ground distance to anchor times `ratio` is below their distance to other,
+        e.g. which side of the map each position is on with the two mains.
+        """
+        tile_ys, tile_xs = self.tiles(xs, ys)
+        return (
+            self.fields[self.index(anchor)][tile_ys, tile_xs] * ratio
+            < self.fields[self.index(other)][tile_ys, tile_xs]
+        )
+
+    def is_closer_to(self, anchor: Point2, other: Point2, position: Point2, ratio: float = 1) -> bool:
+        return self.distance(anchor, position) * ratio < self.distance(other, position)
@@ -1,7 +1,9 @@
 import math
-from typing import List
+from itertools import chain
+from typing import List, Optional
 
 import numpy as np
+from attr import dataclass
 from bot.macro.map.influence_maps.influence_map import InfluenceMap
 from bot.scouting.ghost_units.ghost_units import GhostUnit, GhostUnits
 from bot.utils.point2_functions.utils import center
@@ -10,18 +12,46 @@ from sc2.ids.buff_id import BuffId
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.position import Point2
 from sc2.unit import Unit
+from sc2.unit_snapshot import UnitSnapshot
 from sc2.units import Units
 from ....utils.unit_tags import tower_types
 
+@dataclass(frozen=True)
+class DangerStamp:
+    """ What a single unit added to the danger maps, so it can be removed later. """
+    position: Point2
+    anchor: tuple[int, int, int, int]
+    ground_rings: tuple[tuple[float, float], ...]
+    ground_dps: float
+    air_rings: tuple[tuple[float, float], ...]
+    air_dps: float
+    min_radius: float
+
+    @property
+    def signature(self) -> tuple:
+        """ Two stamps with the same signature use the same kernel at the same tile. """
+        return (self.anchor, self.ground_rings, self.ground_dps, self.air_rings, self.air_dps, self.min_radius)
+
+
 class DangerMap:
     """
     Computes per-unit danger and applies wall/blocking modifiers when asked.
     Contains two InfluenceMaps: ground and air.
+    In incremental mode, only units whose stamp changed since last update are removed and re-added,
+    with a full rebuild every FULL_REBUILD_INTERVAL updates to clear floating point drift.
     """
     bot: BotAI
     ground: InfluenceMap
     ground_terrain: InfluenceMap
     air: InfluenceMap
+    incremental: bool = True
+    stamps: dict[int, DangerStamp]
+    dirty_boxes: Optional[list[tuple[int, int, int, int]]]
+    updates_since_rebuild: int
+    terrain_penalty: Optional[np.ndarray] = None
+    previous_block_mask: Optional[np.ndarray] = None
+    FULL_REBUILD_INTERVAL: int = 100
+    MAX_DIRTY_BOXES: int = 64
     FALLOFF_LEVELS: List[tuple[float, float]] = [
         (1.00, 1.0),   # inside range
         (0.50, 2.0),   # medium threat
@@ -36,13 +66,22 @@ class DangerMap:
     ):
         self.bot = bot
         self.ground = InfluenceMap(bot, map)
-        self.ground_terrain = InfluenceMap(bot, map)
+        # ground_terrain needs its own array, terrain penalty must not leak into ground:
+        # ground only holds the unit stamps kept for the incremental update, readers use ground_terrain
+        self.ground_terrain = InfluenceMap(bot, None if map is None else map.copy())
         self.air = InfluenceMap(bot)
+        self.stamps = {}
+        self.dirty_boxes = None
+        # first update always starts from a clean map
+        self.updates_since_rebuild = self.FULL_REBUILD_INTERVAL
 
     def reset(self):
         self.ground.map[:] = 0
         self.ground_terrain.map[:] = 0
         self.air.map[:] = 0
+        self.stamps.clear()
+        self.dirty_boxes = None
+        self.updates_since_rebuild = 0
 
     def get_unit_property(self, unit: Unit) -> tuple[Point2, float, float, float, float, float, float, float]:
         RADIUS_BUFFER: float = 1.1
@@ -101,22 +140,32 @@ class DangerMap:
         )
 
     def update(self, include_structures: bool = True):
-        self.reset()
-        units: Units = self.bot.enemy_units
+        snapshot: UnitSnapshot = self.bot.unit_snapshot
+        rows: np.ndarray = snapshot.enemy_units
         if (include_structures):
-            units += self.bot.enemy_structures(tower_types)
+            rows = rows | (snapshot.enemy_structures & snapshot.of_type(tower_types))
+        units: Units = snapshot.units(rows)
+        ghost_units: GhostUnits = self.bot.ghost_units.assumed_enemy_units
+
+        if (not self.incremental or self.updates_since_rebuild >= self.FULL_REBUILD_INTERVAL):
+            self.reset()
+        else:
+            self.updates_since_rebuild += 1
+            self.dirty_boxes = []
         
-        for unit in units:
+        present_tags: set[int] = set()
+        for unit in chain(units, ghost_units):
+            present_tags.add(unit.tag)
             self.update_unit(unit)
 
-        ghost_units: GhostUnits = self.bot.ghost_units.assumed_enemy_units
-        for ghost in ghost_units:
-            self.update_unit(ghost)
+        # units that died, expired or got revealed are removed from the maps
+        for tag in [tag for tag in self.stamps if tag not in present_tags]:
+            self.remove_unit(tag)
     
-    def update_unit(self, unit: Unit | GhostUnit):
+    def get_stamp(self, unit: Unit | GhostUnit) -> Optional[DangerStamp]:
         # Unit that are matrixed are ignored
         if (unit.has_buff(BuffId.RAVENSCRAMBLERMISSILE)):
-            return
+            return None
         (
             unit_position,
             unit_radius,
@@ -128,12 +177,49 @@ class DangerMap:
             minimum_range,
         ) = self.get_unit_property(unit)
 
-        for weight, ms_factor in self.FALLOFF_LEVELS:
-            ground_radius = unit_radius + ground_range + move_speed * ms_factor / 2
-            air_radius = unit_radius + air_range + move_speed * ms_factor / 2
-            effective_min_radius: float = unit_radius + minimum_range  if (minimum_range > 0) else 0
-            self.ground.update(unit_position, ground_radius, ground_dps * weight, effective_min_radius)
-            self.air.update(unit_position, air_radius, air_dps * weight, effective_min_radius)
+        # all falloff levels are added at once with a single precomputed stamp
+        ground_rings: tuple[tuple[float, float], ...] = tuple(
+            (unit_radius + ground_range + move_speed * ms_factor / 2, weight)
+            for weight, ms_factor in self.FALLOFF_LEVELS
+        )
+        air_rings: tuple[tuple[float, float], ...] = tuple(
+            (unit_radius + air_range + move_speed * ms_factor / 2, weight)
+            for weight, ms_factor in self.FALLOFF_LEVELS
+        )
+        effective_min_radius: float = unit_radius + minimum_range  if (minimum_range > 0) else 0
+        return DangerStamp(
+            position=unit_position,
+            anchor=self.ground.kernels.anchor(unit_position.x, unit_position.y),
+            ground_rings=ground_rings,
+            ground_dps=ground_dps,
+            air_rings=air_rings,
+            air_dps=air_dps,
+            min_radius=effective_min_radius,
+        )
+
+    def update_unit(self, unit: Unit | GhostUnit):
+        stamp: Optional[DangerStamp] = self.get_stamp(unit)
+        previous: Optional[DangerStamp] = self.stamps.get(unit.tag)
+        if (previous is not None and stamp is not None and previous.signature == stamp.signature):
+            return
+        if (previous is not None):
+            self.remove_unit(unit.tag)
+        if (stamp is not None):
+            self.apply_stamp(stamp, 1)
+            self.stamps[unit.tag] = stamp
+
+    def remove_unit(self, tag: int):
+        stamp: Optional[DangerStamp] = self.stamps.pop(tag, None)
+        if (stamp is not None):
+            self.apply_stamp(stamp, -1)
+
+    def apply_stamp(self, stamp: DangerStamp, sign: int):
+        box: Optional[tuple[int, int, int, int]] = self.ground.stamp(
+            stamp.position, stamp.ground_rings, sign * stamp.ground_dps, stamp.min_radius
+        )
+        self.air.stamp(stamp.position, stamp.air_rings, sign * stamp.air_dps, stamp.min_radius)
+        if (box is not None and self.dirty_boxes is not None):
+            self.dirty_boxes.append(box)
 
 
     def apply_wall_and_blocking(self, wall_distance: np.ndarray, block_mask: np.ndarray):
@@ -142,12 +228,32 @@ class DangerMap:
         # Distance 1 → dangerous * 0.5
         # Distance 2 → dangerous * 0.25
         # >2 → safe-ish
-
-        self.ground_terrain.map[:] = self.ground.map.copy()
-        self.ground_terrain.map += np.where(
-            wall_distance == 0,
-            999,
-            np.exp(-wall_distance * 0.75) * 5.0
-        )
-        # absolute blockers
-        self.ground_terrain.map[block_mask] = 999
\ No newline at end of file
+        if (self.terrain_penalty is None or self.terrain_penalty.shape != wall_distance.shape):
+            self.terrain_penalty = np.where(
+                wall_distance == 0,
+                999,
+                np.exp(-wall_distance * 0.75) * 5.0
+            ).astype(np.float32)
+            self.dirty_boxes = None
+        
+        # tiles that got blocked or unblocked since last update are dirty too
+        boxes: Optional[list[tuple[int, int, int, int]]] = self.dirty_boxes
+        if (self.previous_block_mask is None or self.previous_block_mask.shape != block_mask.shape):
+            boxes = None
+        elif (boxes is not None):
+            changed_ys, changed_xs = np.nonzero(block_mask != self.previous_block_mask)
+            if (len(changed_xs) > 0):
+                boxes.append((changed_xs.min(), changed_ys.min(), changed_xs.max() + 1, changed_ys.max() + 1))
+        self.previous_block_mask = block_mask.copy()
+        
+        if (boxes is None or len(boxes) > self.MAX_DIRTY_BOXES):
+            height, width = self.ground.shape
+            boxes = [(0, 0, width, height)]
+        
+        for x1, y1, x2, y2 in boxes:
+            self.ground_terrain.map[y1:y2, x1:x2] = (
+                self.ground.map[y1:y2, x1:x2] + self.terrain_penalty[y1:y2, x1:x2]
+            )
+            # absolute blockers
+            self.ground_terrain.map[y1:y2, x1:x2][block_mask[y1:y2, x1:x2]] = 999
+        self.dirty_boxes = []
@@ -1,6 +1,7 @@
 import math
 from typing import Iterator, Optional
 import numpy as np
+from bot.macro.map.influence_maps.radial_kernels import RadialKernels
 from sc2.bot_ai import BotAI
 from sc2.position import Point2
 from sc2.unit import Unit
@@ -9,6 +10,8 @@ from sc2.unit import Unit
 class InfluenceMap:
     bot: BotAI
     map: np.ndarray[np.float32]
+    # shared by every map, stamps only depend on their geometry
+    kernels: RadialKernels = RadialKernels()
     
     def __init__(self, bot: BotAI, map: np.ndarray = None, dtype: type = np.float32) -> None:
         self.bot = bot
@@ -153,5 +156,44 @@ class InfluenceMap:
 
         self.map[y1:y2, x1:x2] += delta
 
+    def stamp(
+        self,
+        position: Point2,
+        rings: tuple[tuple[float, float], ...],
+        value: float,
+        min_radius: float = 0.0,
+        density_alpha: float = 0.3,
+    ) -> Optional[tuple[int, int, int, int]]:
+        """
+        Same as calling `update(position, radius, value * weight, ...)` for each (radius, weight) ring,
+        using a single cached kernel and one slice addition.
+        Returns the bounding box (x1, y1, x2, y2) that was modified, if any.
+        """
+        if (value == 0):
+            return None
+        
+        height, width = self.shape
+
+        # --- clamp center into map ---
+        cx: float = float(min(max(position.x, 0), width - 1))
+        cy: float = float(min(max(position.y, 0), height - 1))
+
+        x, y, offset_x, offset_y = self.kernels.anchor(cx, cy)
+        kernel: np.ndarray = self.kernels.stamp(rings, min_radius, density_alpha, offset_x, offset_y)
+        half: int = kernel.shape[0] // 2
+
+        # kernel bounding box clipped to the map
+        x1: int = max(0, x - half)
+        x2: int = min(width, x + half + 1)
+        y1: int = max(0, y - half)
+        y2: int = min(height, y + half + 1)
+        if (x1 >= x2 or y1 >= y2):
+            return None
+
+        kx1: int = x1 - (x - half)
+        ky1: int = y1 - (y - half)
+        self.map[y1:y2, x1:x2] += value * kernel[ky1:ky1 + (y2 - y1), kx1:kx1 + (x2 - x1)]
+        return x1, y1, x2, y2
+
     def reset(self):
         self.map[:] = 0.0
\ No newline at end of file
@@ -1,6 +1,7 @@
 import math
 from operator import pos
-from typing import List
+from typing import List, Optional
+import numpy as np
 from attr import dataclass
 from numpy.ma import size
 from bot.macro.map.influence_maps.influence_map import InfluenceMap
@@ -33,10 +34,33 @@ def one_block_under(pos: Point2) -> Point2:
 def _lane(x_values: list[int], y_range: range) -> list[tuple[int, int]]:
     return [(x, y) for x in x_values for y in y_range]
 
+def window_sums(mask: np.ndarray, size: int) -> np.ndarray:
+    """
+    Sum of every size x size window of mask with a summed-area table, indexed by the window origin [y, x].
+    """
+    height, width = mask.shape
+    if (size > height or size > width):
+        return np.zeros((0, 0), dtype=np.int32)
+    table: np.ndarray = np.zeros((height + 1, width + 1), dtype=np.int32)
+    table[1:, 1:] = mask.cumsum(axis=0, dtype=np.int32).cumsum(axis=1, dtype=np.int32)
+    return table[size:, size:] - table[:-size, size:] - table[size:, :-size] + table[:-size, :-size]
+
 class BuildingLayer:
+    """
+    Occupancy and reservations of the building grid.
+    Footprint checks read a raster of valid origins per unit type and footprint size,
+    rebuilt from the occupancy, creep, placement and pathing grids when the frame or the layer changes.
+    """
     bot: BotAI
     occupancy: InfluenceMap
     reservations: dict[Point2, set[UnitTypeId]]
+    # id of the reservation class (set of unit types) of each tile, 0 when not reserved
+    reservation_ids: np.ndarray
+    reservation_classes: dict[frozenset[UnitTypeId], int]
+    # bumped on every occupancy or reservation change
+    version: int
+    origin_rasters: dict[tuple[UnitTypeId, int], np.ndarray]
+    origin_rasters_key: tuple[int, int]
     _grounded_buildings: set[int] = set()
     
     def __init__(self, bot: BotAI):
@@ -44,6 +68,11 @@ class BuildingLayer:
         self.occupancy = InfluenceMap(bot)
         self.occupancy.map[:] = 1.0  # All buildable at start
         self.reservations = {}
+        self.reservation_ids = np.zeros(self.occupancy.shape, dtype=np.int16)
+        self.reservation_classes = {}
+        self.version = 0
+        self.origin_rasters = {}
+        self.origin_rasters_key = (-1, -1)
 
     def _initialize_static_blockers(self) -> None:
         # Minerals
@@ -142,44 +171,55 @@ class BuildingLayer:
         pos = pos.rounded
         size: int = int(round(radius * 2))
         half: int = size // 2
-        origin: Point2 = Point2((pos.x - half, pos.y - half))
-        
-        points: list[Point2] = [
-            Point2((origin.x + x, origin.y + y))
-            for x in range(size)
-            for y in range(size)
-        ]
-        
-        # 1) Hard blocked
-        if (any(self.can_build(point, unit_type) == False for point in points)):
-            return False
-        
-        # 2) Reservation + Height check
-        reserved_amount: int = 0
-        # TODO : implement this once LeyLine isn't bugged
-        # max_height: float = self.bot.get_terrain_height(points[0])
-        # min_height: float = max_height
-        for point in points:
-            # If too much height difference, it's not buildable
-            # point_height: float = self.bot.get_terrain_height(point)
-            # if (point_height > max_height):
-            #     max_height = point_height
-            # elif (point_height < min_height):
-            #     min_height = point_height
-            # if (max_height - min_height > 5):
-            #     return False
-            
-            reserved_for = self.reservations.get(point)
-            if (reserved_for is not None and unit_type not in reserved_for):
-                return False
-            if (reserved_for is not None and unit_type in reserved_for):
-                reserved_amount += 1
-
-        # either no point was reserved, or all points were reserved for this unit type
+        origin_x: int = int(pos.x) - half
+        origin_y: int = int(pos.y) - half
+        # TODO : check the height difference once LeyLine isn't bugged
+        valid_origins: np.ndarray = self.valid_origins(unit_type, size)
+        height, width = valid_origins.shape
+        return (0 <= origin_x < width and 0 <= origin_y < height and bool(valid_origins[origin_y, origin_x]))
+
+    def valid_origins(self, unit_type: UnitTypeId, size: int) -> np.ndarray:
+        """
+        Raster of the origins (bottom left tile) where a size x size footprint of unit_type can be built:
+        every tile is buildable (same as can_build), and either no tile or every tile is reserved for unit_type.
+        Cached until the next frame or the next change of the layer.
+        """
+        key: tuple[int, int] = (self.bot.state.game_loop, self.version)
+        if (self.origin_rasters_key != key):
+            self.origin_rasters_key = key
+            self.origin_rasters = {}
+        raster: Optional[np.ndarray] = self.origin_rasters.get((unit_type, size))
+        if (raster is not None):
+            return raster
+
+        allowed_classes, reserved_classes = self._reservation_tables(unit_type)
+        buildable: np.ndarray = self._buildable_tiles() & allowed_classes[self.reservation_ids]
+        reserved: np.ndarray = reserved_classes[self.reservation_ids]
+        reserved_count: np.ndarray = window_sums(reserved, size)
+        raster = (
+            (window_sums(buildable, size) == size * size)
+            & ((reserved_count == 0) | (reserved_count == size * size))
+        )
+        self.origin_rasters[(unit_type, size)] = raster
+        return raster
+
+    def _buildable_tiles(self) -> np.ndarray:
+        """ Tiles that aren't occupied nor on creep, and in the placement and pathing grids. """
         return (
-            reserved_amount == 0 or
-            reserved_amount == len(points)
+            (self.occupancy.map > 0)
+            & (self.bot.state.creep.data_numpy != 1)
+            & (self.bot.game_info.placement_grid.data_numpy == 1)
+            & (self.bot.game_info.pathing_grid.data_numpy == 1)
         )
+
+    def _reservation_tables(self, unit_type: UnitTypeId) -> tuple[np.ndarray, np.ndarray]:
+        """ For each reservation class id: can unit_type be built there, and is the class reserved for unit_type. """
+        reserved: np.ndarray = np.zeros(len(self.reservation_classes) + 1, dtype=bool)
+        for unit_types, class_id in self.reservation_classes.items():
+            reserved[class_id] = unit_type in unit_types
+        allowed: np.ndarray = reserved.copy()
+        allowed[0] = True
+        return allowed, reserved
     
     def can_build(self, pos: Point2, unit_type: UnitTypeId) -> bool:
         pos = pos.rounded
@@ -239,6 +279,7 @@ class BuildingLayer:
             oy : oy + size,
             ox : ox + size
         ] = 0.0
+        self.version += 1
     
     def unblock_area(self, origin: Point2, size: int) -> None:
         ox = int(origin.x)
@@ -248,12 +289,29 @@ class BuildingLayer:
             oy : oy + size,
             ox : ox + size
         ] = 1.0
+        self.version += 1
 
     def reserve_tile(self, pos: Point2, unit_types: set[UnitTypeId]) -> None:
-        self.reservations[pos.rounded] = unit_types
+        tile: Point2 = pos.rounded
+        self.reservations[tile] = unit_types
+        unit_types_key: frozenset[UnitTypeId] = frozenset(unit_types)
+        class_id: Optional[int] = self.reservation_classes.get(unit_types_key)
+        if (class_id is None):
+            class_id = len(self.reservation_classes) + 1
+            self.reservation_classes[unit_types_key] = class_id
+        self._set_reservation_id(tile, class_id)
     
     def unreserve_tile(self, pos: Point2) -> None:
-        self.reservations.pop(pos.rounded, None)
+        tile: Point2 = pos.rounded
+        if (self.reservations.pop(tile, None) is not None):
+            self._set_reservation_id(tile, 0)
+
+    def _set_reservation_id(self, tile: Point2, class_id: int) -> None:
+        height, width = self.reservation_ids.shape
+        x, y = int(tile.x), int(tile.y)
+        if (0 <= x < width and 0 <= y < height):
+            self.reservation_ids[y, x] = class_id
+        self.version += 1
     
     def reserve_area(self, origin: Point2, size: int, unit_types: set[UnitTypeId]):
         ox = int(origin.x)
@@ -262,7 +320,7 @@ class BuildingLayer:
 
         for x in range(ox, ox + size):
             for y in range(oy, oy + size):
-                self.reservations[Point2((x, y)).rounded] = unit_types
+                self.reserve_tile(Point2((x, y)), unit_types)
     
     def unreserve_area(self, origin: Point2, size: int) -> None:
         ox = int(origin.x)
@@ -271,7 +329,7 @@ class BuildingLayer:
 
         for y in range(oy, oy + size):
             for x in range(ox, ox + size):
-                self.reservations.pop(Point2((x, y)).rounded, None)
+                self.unreserve_tile(Point2((x, y)))
     
     def reserve_cc(self, pos: Point2) -> None:
         size = CC_RADIUS * 2
@@ -346,7 +404,7 @@ class BuildingLayer:
                 tile: Point2 = Point2((x, y)).rounded
                 # Never overwrite an existing reservation
                 if (tile not in self.reservations or UnitTypeId.COMMANDCENTER not in self.reservations[tile]):
-                    self.reservations[tile] = {UnitTypeId.BUNKER}
+                    self.reserve_tile(tile, {UnitTypeId.BUNKER})
 
     def is_cc_reserved(self, pos: Point2) -> bool:
         size: int = int(CC_RADIUS * 2)
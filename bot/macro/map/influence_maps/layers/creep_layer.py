@@ -1,6 +1,7 @@
+from typing import Dict, List, Optional, Tuple
 import numpy as np
-from scipy.ndimage import distance_transform_edt, convolve
-from scipy.signal import convolve2d
+from scipy.ndimage import distance_transform_edt, convolve, find_objects, label
+from scipy.spatial import cKDTree
 
 from bot.macro.map.influence_maps.influence_map import InfluenceMap
 from bot.scouting.scouting import Scouting, get_scouting
@@ -9,7 +10,15 @@ from sc2.position import Point2
 from sc2.unit import Unit
 from .....utils.unit_tags import creep
 
+Box = Tuple[int, int, int, int]  # y0, y1, x0, x1
+
 class CreepLayer:
+    """
+    Creep maps, updated incrementally: the raw and assumed creep are diffed against the previous frame
+    and the distances and edges are only recomputed in boxes around the changed tiles.
+    Distances are capped at DISTANCE_CAP so a change only affects the tiles within DISTANCE_CAP of it,
+    the density is therefore flat (and its gradient 0) deeper than DISTANCE_CAP inside the creep.
+    """
     bot: BotAI
     creep_map: InfluenceMap              # boolean mask
     creep_assumed: InfluenceMap          # float32, creep assuming unknown tiles are creep too
@@ -25,6 +34,19 @@ class CreepLayer:
     
     grad_x: np.ndarray
     grad_y: np.ndarray
+
+    # incremental update state
+    previous_creep: Optional[np.ndarray]    # raw creep of the last update, None to rebuild everything
+    previous_assumed: Optional[np.ndarray]  # assumed creep of the last update
+    neighbor_count: np.ndarray           # creep tiles in the 3x3 neighborhood
+    dist_to_noncreep: np.ndarray         # distance from assumed creep to the closest tile without creep
+    full_rebuild: bool                   # whether the last update recomputed the whole map
+
+    # query indices, rebuilt on the first query after their mask changed
+    edge_mask: Optional[np.ndarray]      # edge tiles of the edge index
+    edge_tiles: Optional[np.ndarray]     # (n, 2) x, y of the edge tiles
+    edge_tree: Optional[cKDTree]
+    clamp_indices: Dict[float, Tuple[np.ndarray, Optional[np.ndarray]]]  # threshold: (mask, closest mask tile [2, y, x])
     
     CREEP_BONUS: float = 1.2
     TUMOR_RADIUS: float = 10
@@ -34,6 +56,9 @@ class CreepLayer:
     DECAY_STRENGTH: float = 0.4          # reduce influence after tumor kill
     ASSUMPTION_RADIUS: int = 5           # fog creep expansion like before
     CLEAR_RADIUS: int = 6  # tiles around killed tumor to invalidate creep
+    DISTANCE_CAP: int = 16               # distances to and from creep are exact below this value
+    DIRTY_BLOCK_SIZE: int = 16           # changed tiles are grouped by blocks of this size
+    FULL_REBUILD_RATIO: float = 0.5      # rebuild everything when the dirty boxes cover more of the map
 
     def __init__(self, bot: BotAI):
         self.bot = bot
@@ -53,6 +78,17 @@ class CreepLayer:
         # Gradient of density map (grad_x, grad_y)
         self.grad_x = None
         self.grad_y = None
+
+        self.previous_creep = None
+        self.previous_assumed = None
+        self.neighbor_count = np.zeros_like(self.creep_map.map)
+        self.dist_to_noncreep = np.zeros_like(self.creep_map.map)
+        self.full_rebuild = True
+
+        self.edge_mask = None
+        self.edge_tiles = None
+        self.edge_tree = None
+        self.clamp_indices = {}
         
     
     def compute_raw_creep(self):
@@ -72,6 +108,9 @@ class CreepLayer:
         self.bonus.map[:] = 1
         self.grad_x = np.zeros_like(self.density.map)
         self.grad_y = np.zeros_like(self.density.map)
+        self.previous_creep = None
+        self.previous_assumed = None
+        self.invalidate_query_indices()
     
     def compute_assumed_creep(self):
         """
@@ -92,32 +131,27 @@ class CreepLayer:
         # decay cleared tile memory
         cleared_active: np.ndarray = self.creep_decay.map > self.bot.state.game_loop
         
-        # --- 1. build radius-5 disk kernel ---
-        R: float = self.ASSUMPTION_RADIUS
-        y, x = np.ogrid[-R:R+1, -R:R+1]
-        kernel = (x*x + y*y <= R*R).astype(np.float32)
-
-        # --- 2. convolve to find tiles near real creep ---
-        creep_near: np.ndarray = convolve2d(creep, kernel, mode="same", boundary="fill", fillvalue=0)
+        # --- 1. tiles near real creep: a creep tile is within the radius-5 disk ---
+        creep_near: np.ndarray = self.distance_to_creep.map <= self.ASSUMPTION_RADIUS
 
-        # --- 3. mark unseen tiles near creep as creep ---
-        assumed: np.ndarray = (creep == 1) | ((creep_near > 0) & speculative)
+        # --- 2. mark unseen tiles near creep as creep ---
+        assumed: np.ndarray = (creep == 1) | (creep_near & speculative)
 
         # --- clear overrides everything ---
         assumed[cleared_active] = 0
         
         self.creep_assumed.map[:] = assumed.astype(np.float32)
     
-    def compute_creep_density(self):
+    def compute_creep_density(self, boxes: Optional[List[Box]] = None):
         creep: np.ndarray = self.creep_assumed.map
 
-        # distance to non-creep
-        dist_to_noncreep: np.ndarray = distance_transform_edt(creep != 0)
+        # distance to non-creep, only around the tiles whose assumed creep changed
+        self.capped_distance(creep != 0, self.dist_to_noncreep, boxes)
 
-        # Normalize by radius to get values in [0, ~2]
+        # Normalize by radius to get values in [0, DISTANCE_CAP / R]
         R = self.TUMOR_RADIUS
 
-        density: np.ndarray = dist_to_noncreep / R   # 0 = border, >=1 inside thick creep
+        density: np.ndarray = self.dist_to_noncreep / R   # 0 = border, >=1 inside thick creep
         density = np.clip(density, 0, None).astype(np.float32)
         
         # Reduce priority where tumor was recently killed
@@ -128,17 +162,22 @@ class CreepLayer:
     def compute_gradients(self):
         self.grad_y, self.grad_x = np.gradient(self.density.map)
     
-    def compute_distance_to_creep(self):
-        self.distance_to_creep.map[:] = distance_transform_edt(1 - self.creep_map.map)
+    def compute_distance_to_creep(self, boxes: Optional[List[Box]] = None):
+        self.capped_distance(self.creep_map.map == 0, self.distance_to_creep.map, boxes)
 
-    def compute_creep_edge(self):
+    def compute_creep_edge(self, boxes: Optional[List[Box]] = None):
         """Return binary map of tiles on the edge/frontier of creep."""
         # Kernel for neighborhood (3x3)
         kernel: np.ndarray = np.ones((3, 3), dtype=np.float32)
-        neighbor_count: np.ndarray = convolve(self.creep_map.map, kernel, mode='constant', cval=0.0)
+        height, width = self.creep_map.map.shape
+        for box in ([(0, height, 0, width)] if boxes is None else boxes):
+            y0, y1, x0, x1 = self.padded(box, 1)
+            iy0, iy1, ix0, ix1 = self.padded(box, 2)
+            counts: np.ndarray = convolve(self.creep_map.map[iy0:iy1, ix0:ix1], kernel, mode='constant', cval=0.0)
+            self.neighbor_count[y0:y1, x0:x1] = counts[y0 - iy0:y1 - iy0, x0 - ix0:x1 - ix0]
 
         # Edge = tile is creep but has at least one neighbor without creep
-        edge: np.ndarray = (self.creep_assumed.map == 1) & (neighbor_count < 9)
+        edge: np.ndarray = (self.creep_assumed.map == 1) & (self.neighbor_count < 9)
         self.edge.map[:] = edge.astype(np.float32)
     
     def compute_tumor_candidates(self):
@@ -199,37 +238,116 @@ class CreepLayer:
         now = self.bot.state.game_loop
         self.last_seen_frame[visibility == 2] = now
     
+    def padded(self, box: Box, pad: int) -> Box:
+        height, width = self.creep_map.map.shape
+        y0, y1, x0, x1 = box
+        return (max(y0 - pad, 0), min(y1 + pad, height), max(x0 - pad, 0), min(x1 + pad, width))
+
+    def dirty_boxes(self, changed: np.ndarray) -> Optional[List[Box]]:
+        """
+        Bounding boxes of the groups of changed tiles (tiles are grouped by blocks of DIRTY_BLOCK_SIZE).
+        None if the boxes padded by DISTANCE_CAP cover too much of the map, in which case everything is recomputed.
+        """
+        height, width = changed.shape
+        size: int = self.DIRTY_BLOCK_SIZE
+        blocks_y, blocks_x = -(-height // size), -(-width // size)
+        padded: np.ndarray = np.zeros((blocks_y * size, blocks_x * size), dtype=bool)
+        padded[:height, :width] = changed
+        blocks: np.ndarray = padded.reshape(blocks_y, size, blocks_x, size).any(axis=(1, 3))
+        labels, _ = label(blocks, structure=np.ones((3, 3)))
+        boxes: List[Box] = []
+        area: int = 0
+        for rows, columns in find_objects(labels):
+            y0, x0 = rows.start * size, columns.start * size
+            # tighten the group of blocks to its changed tiles
+            ys, xs = np.nonzero(changed[y0:rows.stop * size, x0:columns.stop * size])
+            box: Box = (y0 + int(ys.min()), y0 + int(ys.max()) + 1, x0 + int(xs.min()), x0 + int(xs.max()) + 1)
+            boxes.append(box)
+            py0, py1, px0, px1 = self.padded(box, self.DISTANCE_CAP)
+            area += (py1 - py0) * (px1 - px0)
+        if (area > self.FULL_REBUILD_RATIO * height * width):
+            return None
+        return boxes
+
+    def capped_distance(self, foreground: np.ndarray, target: np.ndarray, boxes: Optional[List[Box]] = None) -> None:
+        """
+        Writes the distance from each foreground tile to the closest background tile (0 on background), capped at
+        DISTANCE_CAP, into target. Only the tiles within DISTANCE_CAP of the boxes are recomputed,
+        from the tiles within DISTANCE_CAP of them, which is enough for the capped values to be exact.
+        """
+        cap: int = self.DISTANCE_CAP
+        height, width = foreground.shape
+        for box in ([(0, height, 0, width)] if boxes is None else boxes):
+            y0, y1, x0, x1 = self.padded(box, cap)
+            iy0, iy1, ix0, ix1 = self.padded(box, 2 * cap)
+            window: np.ndarray = foreground[iy0:iy1, ix0:ix1]
+            if (window.all()):
+                # no background around, every distance is above the cap
+                target[y0:y1, x0:x1] = cap
+                continue
+            distances: np.ndarray = np.minimum(distance_transform_edt(window), cap)
+            target[y0:y1, x0:x1] = distances[y0 - iy0:y1 - iy0, x0 - ix0:x1 - ix0]
+
     def update(self) -> None:
         self.compute_raw_creep()
         if (not self.creep_map.map.any()):
             self.compute_empty_maps()
             return
         self.compute_decay()
+        creep: np.ndarray = self.creep_map.map != 0
+        creep_boxes: Optional[List[Box]] = None
+        if (self.previous_creep is not None):
+            creep_boxes = self.dirty_boxes(creep != self.previous_creep)
+        self.full_rebuild = creep_boxes is None
+        self.compute_distance_to_creep(creep_boxes)
         self.compute_assumed_creep()
-        self.compute_distance_to_creep()
-        self.compute_creep_edge()        
-        self.compute_creep_density()
+        self.compute_creep_edge(creep_boxes)
+        # the assumed creep also changes with vision, fog age and killed tumors
+        assumed: np.ndarray = self.creep_assumed.map != 0
+        assumed_boxes: Optional[List[Box]] = None
+        if (not self.full_rebuild):
+            assumed_boxes = self.dirty_boxes(assumed != self.previous_assumed)
+            self.full_rebuild = assumed_boxes is None
+        self.compute_creep_density(assumed_boxes)
         self.compute_gradients()
         self.compute_tumor_candidates()
         self.compute_bonus()
+        self.previous_creep = creep
+        self.previous_assumed = assumed
+        self.invalidate_query_indices()
     
     # -----------------------------
     # Queries
     # -----------------------------
+    def invalidate_query_indices(self) -> None:
+        """Drops the query indices whose mask changed with this update."""
+        if (self.edge_mask is not None and not np.array_equal(self.edge_mask, self.edge.map != 0)):
+            self.edge_mask = None
+            self.edge_tiles = None
+            self.edge_tree = None
+        for threshold, (mask, _) in list(self.clamp_indices.items()):
+            if (not np.array_equal(mask, self.density.map >= threshold)):
+                del self.clamp_indices[threshold]
+
     def closest_creep_edge(self, pos: Point2) -> Point2 | None:
         """Return nearest edge tile (creep frontier) to a position."""
-        y_idxs, x_idxs = np.where(self.edge.map)
-        if len(x_idxs) == 0:
+        if (self.edge_mask is None):
+            self.edge_mask = self.edge.map != 0
+            y_idxs, x_idxs = np.nonzero(self.edge_mask)
+            self.edge_tiles = np.column_stack((x_idxs, y_idxs))
+            self.edge_tree = cKDTree(self.edge_tiles) if len(x_idxs) > 0 else None
+        if (self.edge_tree is None):
             return None
-
-        dx = x_idxs - pos.x
-        dy = y_idxs - pos.y
-        dist2 = dx*dx + dy*dy
-        idx = np.argmin(dist2)
-        return Point2((x_idxs[idx], y_idxs[idx]))
+        _, idx = self.edge_tree.query((pos.x, pos.y))
+        x, y = self.edge_tiles[idx]
+        return Point2((x, y))
 
     def direction_to_tumor(self, pos: Point2) -> Point2 | None:
-        """Return normalized vector pointing toward nearest tumor based on gradient."""
+        """
+        Return normalized vector pointing toward nearest tumor based on gradient.
+        Where the density is flat, toward the nearest edge outside of creep, away from it deep inside the creep
+        (the way the uncapped density grows).
+        """
         y, x = int(pos.y), int(pos.x)
         grad_x = self.grad_x[y, x]
         grad_y = self.grad_y[y, x]
@@ -241,6 +359,8 @@ class CreepLayer:
             if target is None:
                 return None
             vec = np.array([target.x - pos.x, target.y - pos.y], dtype=np.float32)
+            if (self.dist_to_noncreep[y, x] >= self.DISTANCE_CAP):
+                vec = -vec
             length = np.linalg.norm(vec)
             if length < 1e-3:
                 return None
@@ -250,26 +370,28 @@ class CreepLayer:
     # Nearest creep tile to a given position
     # ----------------------------------------------------------
     def closest_creep_clamp(self, pos: Point2, threshold: float = 0.5) -> Point2 | None:
-        density_map = self.density.map
-        h, w = density_map.shape
-
-        ys, xs = np.where(self.density.map >= threshold)
-        if (len(xs) == 0):
+        """
+        Tile with a density of at least threshold closest to pos (to its closest tile corner,
+        so within a tile of the exact closest one), None if there is none.
+        """
+        clamp_index: Optional[Tuple[np.ndarray, Optional[np.ndarray]]] = self.clamp_indices.get(threshold)
+        if (clamp_index is None):
+            mask: np.ndarray = self.density.map >= threshold
+            # closest tile of the mask for every tile, there is none if the mask is empty
+            closest: Optional[np.ndarray] = (
+                distance_transform_edt(~mask, return_distances=False, return_indices=True) if mask.any() else None
+            )
+            clamp_index = (mask, closest)
+            self.clamp_indices[threshold] = clamp_index
+        if (clamp_index[1] is None):
             return None
-        
-        # Clamp inside map bounds
-        cx = max(0, min(pos.x, w - 1))
-        cy = max(0, min(pos.x, h - 1))
+        h, w = self.density.map.shape
 
-        # Compute squared distance to avoid sqrt cost
-        dx = xs - cx
-        dy = ys - cy
-        dist2 = dx*dx + dy*dy
-
-        idx = np.argmin(dist2)
-
-        # 4) Convert tile → world Point2
-        return Point2((xs[idx], ys[idx]))
+        # Clamp inside map bounds
+        cx = int(round(max(0, min(pos.x, w - 1))))
+        cy = int(round(max(0, min(pos.y, h - 1))))
+        closest_y, closest_x = clamp_index[1][:, cy, cx]
+        return Point2((int(closest_x), int(closest_y)))
     
     def max_density_in_radius(self, pos: Point2, radius: float) -> tuple[float, Point2 | None]:
         x1, y1, masked = self.density.read_values(pos, radius)
@@ -1,58 +1,68 @@
+from typing import Optional
+
 import numpy as np
+from scipy.ndimage import distance_transform_cdt, distance_transform_edt
+
 from bot.macro.map.influence_maps.influence_map import InfluenceMap
+from bot.utils.map_cache import grid_hash, load_array, save_array
 from sc2.bot_ai import BotAI
 from sc2.ids.unit_typeid import UnitTypeId
 
 
+def wall_distance_transform(pathing: np.ndarray, metric: str = "manhattan") -> np.ndarray:
+    """
+    Distance from each tile to the nearest unpathable tile (0 on unpathable tiles).
+    metric is one of "manhattan", "chebyshev" or "euclidean".
+    """
+    pathable: np.ndarray = pathing != 0
+    if (pathable.all()):
+        return np.full(pathing.shape, fill_value=9999, dtype=np.float32)
+    
+    match (metric):
+        case "manhattan":
+            dist: np.ndarray = distance_transform_cdt(pathable, metric="taxicab")
+        case "chebyshev":
+            dist: np.ndarray = distance_transform_cdt(pathable, metric="chessboard")
+        case "euclidean":
+            dist: np.ndarray = distance_transform_edt(pathable)
+        case _:
+            raise ValueError(f'Unknown wall distance metric: {metric}')
+    return dist.astype(np.float32)
+
+
 class StaticLayer:
     """
     Computes static data:
-     - wall_distance: distance to nearest unpathable tile (Manhattan BFS)
+     - wall_distance: distance to nearest unpathable tile (manhattan by default)
      - dynamic_block_grid: boolean InfluenceMap indicating blocked tiles (buildings)
     """
     bot: BotAI
     wall_distance: np.ndarray
     dynamic_block_grid: InfluenceMap
+    WALL_DISTANCE_METRIC: str = "manhattan"
 
     def __init__(self, bot: BotAI):
         self.bot = bot
         self.compute_wall_distance()
         self.dynamic_block_grid = InfluenceMap(bot, dtype=bool)
         
-    def compute_wall_distance(self) -> np.ndarray:
+    def compute_wall_distance(self, metric: Optional[str] = None) -> np.ndarray:
         """
         Compute distance from each tile to nearest unpathable tile.
+        Results are cached on disk per map and pathing grid.
         """
+        metric = metric or self.WALL_DISTANCE_METRIC
         pathing: np.ndarray = self.bot.game_info.pathing_grid.data_numpy
-        wall_mask: np.ndarray = (pathing == 0)
-
-        # Distance transform (cheap even for 200x200)
-        dist: np.ndarray = np.full_like(pathing, fill_value=9999, dtype=np.float32)
-
-        # Unpathable tiles = distance 0
-        dist[wall_mask] = 0
-
-        # BFS expansion (Manhattan distance, good enough)
-        # 4-neighborhood offsets
-        offsets = [(1,0), (-1,0), (0,1), (0,-1)]
-
-        queue = list(zip(*np.where(wall_mask)))
-
-        idx = 0
-        while idx < len(queue):
-            y, x = queue[idx]
-            idx += 1
-
-            d = dist[y, x] + 1
+        map_name: str = self.bot.game_info.map_name
+        key: str = f'{metric}_{grid_hash(pathing)}'
 
-            for dy, dx in offsets:
-                ny, nx = y + dy, x + dx
-                if 0 <= ny < dist.shape[0] and 0 <= nx < dist.shape[1]:
-                    if d < dist[ny, nx]:
-                        dist[ny, nx] = d
-                        queue.append((ny, nx))
+        dist: Optional[np.ndarray] = load_array(map_name, "wall_distance", key)
+        if (dist is None or dist.shape != pathing.shape):
+            dist = wall_distance_transform(pathing, metric)
+            save_array(map_name, "wall_distance", key, dist)
 
         self.wall_distance = dist
+        return dist
     
     def update_dynamic_block_grid(self):
         """
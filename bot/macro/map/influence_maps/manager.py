@@ -1,7 +1,6 @@
 from typing import Optional
 
 import numpy as np
-from bot.macro.map.influence_maps.danger.danger_evaluator import DangerEvaluator
 from bot.macro.map.influence_maps.danger_map import DangerMap
 from bot.macro.map.influence_maps.influence_map import InfluenceMap
 from bot.macro.map.influence_maps.layers.buildings_layer import BuildingLayer
@@ -9,7 +8,6 @@ from bot.macro.map.influence_maps.layers.creep_layer import CreepLayer
 from bot.macro.map.influence_maps.layers.detection_layer import DetectionLayer
 from bot.macro.map.influence_maps.layers.effect_layer import EffectLayer
 from bot.macro.map.influence_maps.layers.static_layer import StaticLayer
-from bot.utils.point2_functions.utils import sample_tile_path
 from sc2.bot_ai import BotAI
 from sc2.position import Point2
 from sc2.unit import Unit
@@ -22,16 +20,17 @@ class InfluenceMapManager:
     creep: CreepLayer
     detection: DetectionLayer
     buildings: BuildingLayer
+    composites: dict[tuple[bool, bool, bool, bool], InfluenceMap]
 
     def __init__(self, bot: BotAI) -> None:
         self.bot = bot
+        self.composites = {}
         
     
     def init_influence_maps(self):
         self.static = StaticLayer(self.bot)
         self.effects = EffectLayer(self.bot)
-        # precompute wall_distance and dynamic block grid
-        self.static.compute_wall_distance()
+        # wall_distance is computed by the static layer, precompute dynamic block grid
         self.static.update_dynamic_block_grid()
         self.creep = CreepLayer(self.bot)
         self.detection = DetectionLayer(self.bot)
@@ -56,21 +55,28 @@ class InfluenceMapManager:
 
         # 4) effects
         self.effects.update()
+
+        # 5) combined maps are rebuilt lazily from this frame's layers
+        self.composites.clear()
     
     # ---- Query helpers ----
-    def read(
+    def composite(
         self,
-        pos: Point2,
-        radius: float,
         air: bool = False,
         include_danger: bool = True,
         include_terrain_penalty: bool = True,
         include_effects: bool = True,
         include_creep: bool = True
-    ) -> tuple[int, int, np.ma.MaskedArray]:
+    ) -> InfluenceMap:
         """
-        Return x1,y1, masked_values from the combined map for reading/picking.
+        Return the combined map for this set of layers.
+        Built lazily on first use and shared by every query until the next update.
         """
+        # include_terrain_penalty doesn't change the map, see below
+        key: tuple[bool, bool, bool, bool] = (air, include_danger, include_effects, include_creep)
+        if (key in self.composites):
+            return self.composites[key]
+        
         height, width = self.bot.game_info.pathing_grid.data_numpy.shape
         temporary_map: np.ndarray = np.zeros((height, width), dtype=np.float32)
         if (air):
@@ -82,18 +88,34 @@ class InfluenceMapManager:
             pathing: np.ndarray = self.bot.game_info.pathing_grid.data_numpy
             temporary_map = np.ma.masked_where(pathing == 0, temporary_map)
             if (include_danger):
-                if (include_terrain_penalty):
-                    temporary_map += self.danger.ground_terrain.map
-                else:
-                    temporary_map += self.danger.ground.map
+                # the terrain penalty has always been part of the ground danger read here,
+                # include_terrain_penalty=False (e.g. best_grenade_target) keeps that behavior
+                temporary_map += self.danger.ground_terrain.map
             if (include_effects):
                 temporary_map += self.effects.ground.map
         
         if (include_creep):
             temporary_map *= self.creep.bonus.map
         
-        tmp: InfluenceMap = InfluenceMap(self.bot, temporary_map)
-        return tmp.read_values(pos, radius)
+        self.composites[key] = InfluenceMap(self.bot, temporary_map)
+        return self.composites[key]
+    
+    def read(
+        self,
+        pos: Point2,
+        radius: float,
+        air: bool = False,
+        include_danger: bool = True,
+        include_terrain_penalty: bool = True,
+        include_effects: bool = True,
+        include_creep: bool = True
+    ) -> tuple[int, int, np.ma.MaskedArray]:
+        """
+        Return x1,y1, masked_values from the combined map for reading/picking.
+        The window is a read-only view of the shared composite map.
+        """
+        composite: InfluenceMap = self.composite(air, include_danger, include_terrain_penalty, include_effects, include_creep)
+        return composite.read_values(pos, radius)
     
     def pick_tile(
         self,
@@ -107,25 +129,18 @@ class InfluenceMapManager:
         effects: bool = True,
         trajectory: bool = True,
     ) -> tuple[Point2, float]:
-        
+        """
+        Score every valid tile of the window at once and return the best one.
+        `score_fn(value, towards, extend)` receives whole-window arrays and must
+        return an array of scores (plain arithmetic lambdas work as is).
+        """
         # Get the masked window: returns x1, y1, masked_values
         x1, y1, masked_values = self.read(pos, radius, air, include_danger=danger, include_terrain_penalty=terrain, include_effects=effects)
-
-        # Build candidate tiles (masked values auto-skip)
-        ys, xs = np.where(~masked_values.mask)
-
-        # Precompute direction vector if provided
-        if (prefer_direction is not None):
-            vec: Point2 = prefer_direction - pos
-            length: float = (vec.x * vec.x + vec.y * vec.y) ** 0.5
-
-            if (length < 1e-6):
-                Dx = Dy = None
-            else:
-                Dx = vec.x / length
-                Dy = vec.y / length
-        else:
-            Dx = Dy = None
+        valid: np.ndarray = ~np.ma.getmaskarray(masked_values)
+        
+        if (not valid.any()):
+            print("Error - no best point found")
+            return (prefer_direction or pos, -999)
 
         # Base position
         # TODO why are we rounding here ?
@@ -133,60 +148,60 @@ class InfluenceMapManager:
         x: int = int(rounded.x)
         y: int = int(rounded.y)
 
-        evaluator = DangerEvaluator(self.bot, masked_values, x1, y1)
-        
-        best_point: Point2 | None = None
-        best_score: float = -999
-
-        for iy, ix in zip(ys, xs):
-            
-            px: int = x1 + ix
-            py: int = y1 + iy
-
-            dx: int = px - x
-            dy: int = py - y
+        towards, extend = self._window_projections(pos, x1 - x, y1 - y, masked_values.shape, prefer_direction)
 
-            start: Point2 = Point2((x, y))
-            end: Point2 = Point2((px, py))
+        # path and tile values were always the same, `trajectory` is kept for callers only
+        values: np.ndarray = masked_values.filled(0)
+        scores: np.ndarray = np.broadcast_to(
+            np.asarray(score_fn(values, towards, extend), dtype=np.float64),
+            values.shape,
+        )
+        scores = np.where(valid, scores, -np.inf)
 
-            path: list[Point2] = sample_tile_path(
-                start,
-                end,
-            )
+        # argmax returns the first best tile in row-major order, like the former loop did
+        index: int = int(scores.argmax())
+        best_score: float = float(scores.flat[index])
+        if (not best_score > -999):
+            print("Error - no best point found")
+            return (prefer_direction or pos, -999)
 
-            path_value: float = masked_values[iy, ix]
-            # path_value: float = evaluator.evaluate_path(path)
-            value: float = masked_values[iy, ix]
+        iy, ix = np.unravel_index(index, scores.shape)
+        return Point2((x1 + int(ix), y1 + int(iy))), best_score
 
-            if (Dx is not None):
-                # 1. Forward/backward component
-                towards: float = dx * Dx + dy * Dy  # dot product
+    @staticmethod
+    def _window_projections(
+        pos: Point2 | Unit,
+        offset_x: int,
+        offset_y: int,
+        shape: tuple[int, int],
+        prefer_direction: Point2 | None,
+    ) -> tuple[np.ndarray | float, np.ndarray | float]:
+        """
+        Return the `towards` (forward component) and `extend` (perpendicular spread)
+        arrays of every tile of the window relative to the preferred direction.
+        """
+        if (prefer_direction is None):
+            return 0.0, 0.0
+        
+        vec: Point2 = prefer_direction - pos.position
+        length: float = (vec.x * vec.x + vec.y * vec.y) ** 0.5
+        if (length < 1e-6):
+            return 0.0, 0.0
+        Dx: float = vec.x / length
+        Dy: float = vec.y / length
 
-                # 2. Perpendicular spreading component
-                proj_x: float = towards * Dx
-                proj_y: float = towards * Dy
-                perp_x: float = dx - proj_x
-                perp_y: float = dy - proj_y
-                extend: float = (perp_x * perp_x + perp_y * perp_y) ** 0.5
-            else:
-                towards: float = 0.0
-                extend: float = 0.0
+        height, width = shape
+        dy, dx = np.ogrid[offset_y:offset_y + height, offset_x:offset_x + width]
 
-            # Compute score
-            score: float = (
-                score_fn(path_value, towards, extend)
-                if trajectory == True
-                else score_fn(value, towards, extend)
-            )
+        # 1. Forward/backward component
+        towards: np.ndarray = dx * Dx + dy * Dy
 
-            if (best_score is None or score > best_score):
-                best_score = score
-                best_point = Point2((px, py))
+        # 2. Perpendicular spreading component
+        perp_x: np.ndarray = dx - towards * Dx
+        perp_y: np.ndarray = dy - towards * Dy
+        extend: np.ndarray = np.sqrt(perp_x * perp_x + perp_y * perp_y)
 
-        if (best_point is None):
-            print("Error - no best point found")
-            return (prefer_direction or pos, best_score)
-        return best_point, best_score
+        return towards, extend
 
     def best_grenade_target(self, reaper: Unit) -> tuple[Point2, float]:
         # assume most units have the same range as the reaper
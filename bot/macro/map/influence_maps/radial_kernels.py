@@ -0,0 +1,88 @@
+import math
+
+import numpy as np
+
+
+class RadialKernels:
+    """
+    Cache of precomputed radial stamps, so adding a unit to an InfluenceMap is a single slice addition.
+    A stamp is the sum of several weighted rings (same shape as InfluenceMap.update),
+    keyed by quantized radii, weights, min_radius, density_alpha and sub-tile offset.
+    """
+    RADIUS_QUANTUM: float = 0.1
+    OFFSET_QUANTUM: float = 0.25
+    MAX_KERNELS: int = 1024
+    kernels: dict[tuple, np.ndarray]
+
+    def __init__(self) -> None:
+        self.kernels = {}
+
+    def _quantize(self, value: float, quantum: float) -> int:
+        return round(value / quantum)
+
+    def anchor(self, x: float, y: float) -> tuple[int, int, int, int]:
+        """
+        Return the integer tile and the quantized sub-tile offset (in quantum steps) of a center.
+        """
+        qx: int = self._quantize(x, self.OFFSET_QUANTUM)
+        qy: int = self._quantize(y, self.OFFSET_QUANTUM)
+        steps: int = round(1 / self.OFFSET_QUANTUM)
+        return qx // steps, qy // steps, qx % steps, qy % steps
+
+    def stamp(
+        self,
+        rings: tuple[tuple[float, float], ...],
+        min_radius: float,
+        density_alpha: float,
+        offset_x: int,
+        offset_y: int,
+    ) -> np.ndarray:
+        """
+        Return the kernel for `rings` ((radius, weight) pairs) centered at the given quantized offset.
+        The kernel is square, of side 2 * half + 1, its center tile is index [half, half].
+        """
+        key: tuple = (
+            tuple((self._quantize(radius, self.RADIUS_QUANTUM), weight) for radius, weight in rings),
+            self._quantize(min_radius, self.RADIUS_QUANTUM),
+            density_alpha,
+            offset_x,
+            offset_y,
+        )
+        kernel: np.ndarray | None = self.kernels.get(key)
+        if (kernel is not None):
+            return kernel
+
+        if (len(self.kernels) >= self.MAX_KERNELS):
+            self.kernels.clear()
+        kernel = self._build(key)
+        self.kernels[key] = kernel
+        return kernel
+
+    def _build(self, key: tuple) -> np.ndarray:
+        quantized_rings, quantized_min_radius, density_alpha, offset_x, offset_y = key
+        rings: list[tuple[float, float]] = [
+            (radius * self.RADIUS_QUANTUM, weight) for radius, weight in quantized_rings
+        ]
+        min_radius: float = quantized_min_radius * self.RADIUS_QUANTUM
+        max_radius: float = max((radius for radius, _ in rings), default=0)
+        half: int = math.ceil(max_radius) + 1
+
+        # distance from the exact center to every tile of the kernel
+        yy, xx = np.ogrid[-half:half + 1, -half:half + 1]
+        dx: np.ndarray = xx - offset_x * self.OFFSET_QUANTUM
+        dy: np.ndarray = yy - offset_y * self.OFFSET_QUANTUM
+        dist: np.ndarray = np.sqrt(dx * dx + dy * dy)
+
+        kernel: np.ndarray = np.zeros(dist.shape, dtype=np.float32)
+        in_inner: np.ndarray = (dist <= min_radius) if (min_radius > 0) else np.zeros(dist.shape, dtype=bool)
+        effective_dist: np.ndarray = np.clip(dist - min_radius, 0.0, None)
+        for radius, weight in rings:
+            if (radius <= 0 or weight == 0):
+                continue
+            # same ring as InfluenceMap.update
+            density: np.ndarray = ((dist <= radius) & ~in_inner).astype(float)
+            effective_radius: float = max(radius - min_radius, 1e-6)
+            center_bonus: np.ndarray = 1.0 + density_alpha * np.clip(1.0 - effective_dist / effective_radius, 0.0, 1.0)
+            kernel += weight * density * center_bonus
+
+        return kernel
@@ -1,6 +1,8 @@
 from __future__ import annotations
 from typing import List
+from bot.macro.map.anchor_fields import AnchorFields
 from bot.macro.map.influence_maps.manager import InfluenceMapManager
+from bot.macro.map.pathfinder import Pathfinder
 from sc2.bot_ai import BotAI
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.position import Point2, Rect
@@ -15,10 +17,13 @@ class MapData:
     right_center: Point2
     wall_placement: List[Point2] = []
     influence_maps: InfluenceMapManager
+    pathfinder: Pathfinder
+    anchor_fields: AnchorFields
         
     def __init__(self, bot: BotAI) -> None:
         self.bot = bot
         self.influence_maps = InfluenceMapManager(bot)
+        self.pathfinder = Pathfinder(bot, self.influence_maps)
         
     def initialize(self) -> None:
         playable_area: Rect = self.bot.game_info.playable_area
@@ -41,6 +46,12 @@ class MapData:
             depots_positions[1],
         ]
 
+        # Ground distance fields from every base and ramp
+        anchors: List[Point2] = [self.bot.game_info.player_start_location, *self.bot.enemy_start_locations]
+        anchors.extend(self.bot.expansion_locations_list)
+        anchors.extend(ramp.top_center for ramp in self.bot.game_info.map_ramps)
+        self.anchor_fields = AnchorFields(self.bot, anchors)
+
     @property
     def centers(self) -> list[Point2]:
         return [
@@ -0,0 +1,286 @@
+from __future__ import annotations
+import heapq
+import math
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from bot.utils.map_cache import grid_hash
+from sc2.bot_ai import BotAI
+from sc2.position import Point2
+if TYPE_CHECKING:
+    from bot.macro.map.influence_maps.manager import InfluenceMapManager
+
+SQRT2: float = math.sqrt(2)
+OCTILE_DIAGONAL: float = SQRT2 - 2
+# (dy, dx, length) of the 8 moves, diagonals can't cut corners
+MOVES: List[Tuple[int, int, float]] = [
+    (0, 1, 1), (0, -1, 1), (1, 0, 1), (-1, 0, 1),
+    (1, 1, SQRT2), (1, -1, SQRT2), (-1, 1, SQRT2), (-1, -1, SQRT2),
+]
+
+
+class PathingGraph:
+    """
+    8-connected graph of the walkable tiles of a layer, an edge costs its length times the average cost of its two tiles.
+    Tiles are numbered y * width + x, the sparse matrix (Dijkstra) and the padded cost list (A*) are built on first use.
+    """
+    cost: np.ndarray
+    walkable: np.ndarray
+    _matrix: Optional[csr_matrix] = None
+    _padded_costs: Optional[List[float]] = None
+
+    def __init__(self, cost: np.ndarray) -> None:
+        self.cost = cost
+        self.walkable = np.isfinite(cost)
+
+    @property
+    def matrix(self) -> csr_matrix:
+        if (self._matrix is None):
+            height, width = self.cost.shape
+            walkable_padded: np.ndarray = np.pad(self.walkable, 1, constant_values=False)
+            cost_padded: np.ndarray = np.pad(self.cost, 1, constant_values=np.inf)
+            ys, xs = np.nonzero(self.walkable)
+            sources: List[np.ndarray] = []
+            targets: List[np.ndarray] = []
+            weights: List[np.ndarray] = []
+            for dy, dx, length in MOVES:
+                allowed: np.ndarray = walkable_padded[ys + 1 + dy, xs + 1 + dx]
+                if (dx != 0 and dy != 0):
+                    allowed &= walkable_padded[ys + 1 + dy, xs + 1] & walkable_padded[ys + 1, xs + 1 + dx]
+                sources.append((ys * width + xs)[allowed])
+                targets.append(((ys + dy) * width + xs + dx)[allowed])
+                weights.append(length * (self.cost[ys, xs] + cost_padded[ys + 1 + dy, xs + 1 + dx])[allowed] / 2)
+            self._matrix = csr_matrix(
+                (np.concatenate(weights), (np.concatenate(sources), np.concatenate(targets))),
+                shape=(height * width, height * width),
+            )
+        return self._matrix
+
+    @property
+    def padded_costs(self) -> List[float]:
+        """ Costs with a border of inf, flattened to a list so A* needs no bounds checks nor numpy scalar access. """
+        if (self._padded_costs is None):
+            self._padded_costs = np.pad(self.cost, 1, constant_values=np.inf).ravel().tolist()
+        return self._padded_costs
+
+
+class Pathfinder:
+    """
+    Local pathfinding on the pathing grid, so ground distances don't need a query to the game.
+     - distance / path: A* between two points, for a few queries from a source
+     - distance_field: Dijkstra distances from a point to every tile, for many queries from the same source
+     - ground_distances / closest: distances from a moving source (e.g. an army center) to a few points
+    Costs can include the danger maps with `danger_weight`, a tile then costs 1 + danger_weight * danger.
+    Graphs and fields are cached until the version of their layer changes:
+    the pathing grid for the plain ground layer, the pathing grid and the frame for layers using danger.
+    """
+    bot: BotAI
+    influence_maps: InfluenceMapManager
+    graphs: Dict[tuple, Tuple[tuple, PathingGraph]]
+    fields: Dict[tuple, np.ndarray]
+    pathing_version: Tuple[int, str]
+    SNAP_RADIUS: int = 4
+    MAX_FIELDS: int = 64
+    SOURCE_GRID: int = 4
+
+    def __init__(self, bot: BotAI, influence_maps: InfluenceMapManager) -> None:
+        self.bot = bot
+        self.influence_maps = influence_maps
+        self.graphs = {}
+        self.fields = {}
+        self.pathing_version = (-1, "")
+
+    @property
+    def ground_version(self) -> str:
+        """ Hash of the pathing grid, computed at most once per frame. """
+        game_loop: int = self.bot.state.game_loop
+        if (self.pathing_version[0] != game_loop):
+            self.pathing_version = (game_loop, grid_hash(self.bot.game_info.pathing_grid.data_numpy))
+        return self.pathing_version[1]
+
+    def layer_version(self, air: bool, danger_weight: float) -> tuple:
+        ground: str = "" if air else self.ground_version
+        frame: int = self.bot.state.game_loop if danger_weight > 0 else -1
+        return (ground, frame)
+
+    def cost_grid(self, air: bool, danger_weight: float) -> np.ndarray:
+        """ Cost of entering each tile, inf on tiles that can't be crossed. """
+        if (air):
+            cost: np.ndarray = np.ones(self.bot.game_info.pathing_grid.data_numpy.shape, dtype=np.float64)
+            if (danger_weight > 0):
+                cost += danger_weight * np.clip(self.influence_maps.danger.air.map, 0, None)
+            return cost
+        pathable: np.ndarray = self.bot.game_info.pathing_grid.data_numpy != 0
+        cost = np.where(pathable, 1.0, np.inf)
+        if (danger_weight > 0):
+            cost += danger_weight * np.clip(self.influence_maps.danger.ground_terrain.map, 0, None)
+        return cost
+
+    def graph(self, air: bool = False, danger_weight: float = 0) -> PathingGraph:
+        key: tuple = (air, danger_weight)
+        version: tuple = self.layer_version(air, danger_weight)
+        cached: Optional[Tuple[tuple, PathingGraph]] = self.graphs.get(key)
+        if (cached is not None and cached[0] == version):
+            return cached[1]
+        graph: PathingGraph = PathingGraph(self.cost_grid(air, danger_weight))
+        self.graphs[key] = (version, graph)
+        return graph
+
+    def snap(self, graph: PathingGraph, point: Point2) -> Optional[Tuple[int, int]]:
+        """ Closest walkable tile of point (structures and townhall spots aren't walkable), None if there is none around. """
+        height, width = graph.walkable.shape
+        x: int = min(max(int(point.x), 0), width - 1)
+        y: int = min(max(int(point.y), 0), height - 1)
+        if (graph.walkable[y, x]):
+            return (x, y)
+        x1, y1 = max(x - self.SNAP_RADIUS, 0), max(y - self.SNAP_RADIUS, 0)
+        window: np.ndarray = graph.walkable[y1:y + self.SNAP_RADIUS + 1, x1:x + self.SNAP_RADIUS + 1]
+        ys, xs = np.nonzero(window)
+        if (len(xs) == 0):
+            return None
+        closest: int = int(np.argmin((xs + x1 + 0.5 - point.x) ** 2 + (ys + y1 + 0.5 - point.y) ** 2))
+        return (int(xs[closest]) + x1, int(ys[closest]) + y1)
+
+    def distance_field(self, source: Point2, air: bool = False, danger_weight: float = 0) -> np.ndarray:
+        """
+        Cost of the shortest path from source to every tile (indexed [y, x]), inf where unreachable.
+        """
+        graph: PathingGraph = self.graph(air, danger_weight)
+        tile: Optional[Tuple[int, int]] = self.snap(graph, source)
+        key: tuple = (air, danger_weight, tile, self.layer_version(air, danger_weight))
+        field: Optional[np.ndarray] = self.fields.get(key)
+        if (field is not None):
+            return field
+        if (tile is None):
+            field = np.full(graph.cost.shape, np.inf, dtype=np.float32)
+        else:
+            height, width = graph.cost.shape
+            distances: np.ndarray = dijkstra(graph.matrix, directed=True, indices=tile[1] * width + tile[0])
+            field = distances.astype(np.float32).reshape(height, width)
+        if (len(self.fields) >= self.MAX_FIELDS):
+            self.fields.clear()
+        self.fields[key] = field
+        return field
+
+    def field_distance(self, field: np.ndarray, point: Point2, air: bool = False, danger_weight: float = 0) -> Optional[float]:
+        """ Value of a distance field at point, None if unreachable. """
+        tile: Optional[Tuple[int, int]] = self.snap(self.graph(air, danger_weight), point)
+        if (tile is None):
+            return None
+        distance: float = float(field[tile[1], tile[0]])
+        return distance if math.isfinite(distance) else None
+
+    def ground_distances(self, source: Point2, points: List[Point2]) -> List[float]:
+        """
+        Ground distances from source to every point with a single distance field, inf where there is no path.
+        The source is rounded to a grid of SOURCE_GRID tiles so a source moving a bit every frame reuses its field,
+        distances are then a few tiles off at most. Straight line distances if source is far from any walkable tile.
+        """
+        graph: PathingGraph = self.graph()
+        rounded: Point2 = Point2((
+            round(source.x / self.SOURCE_GRID) * self.SOURCE_GRID,
+            round(source.y / self.SOURCE_GRID) * self.SOURCE_GRID,
+        ))
+        if (self.snap(graph, rounded) is None):
+            if (self.snap(graph, source) is None):
+                return [source.distance_to(point) for point in points]
+            rounded = source
+        field: np.ndarray = self.distance_field(rounded)
+        distances: List[float] = []
+        for point in points:
+            distance: Optional[float] = self.field_distance(field, point)
+            distances.append(math.inf if distance is None else distance)
+        return distances
+
+    def closest(self, source: Point2, points: List[Point2]) -> int:
+        """ Index of the point closest to source by ground, by straight line if none of them can be reached. """
+        distances: List[float] = self.ground_distances(source, points)
+        if (all(math.isinf(distance) for distance in distances)):
+            distances = [source.distance_to(point) for point in points]
+        return int(np.argmin(distances))
+
+    def path(self, start: Point2, end: Point2, air: bool = False, danger_weight: float = 0) -> Optional[List[Point2]]:
+        """
+        Tiles (centers) of the cheapest path from start to end with A*, None if there is no path.
+        """
+        result: Optional[Tuple[float, List[int]]] = self._astar(start, end, air, danger_weight)
+        if (result is None):
+            return None
+        width: int = self.bot.game_info.pathing_grid.data_numpy.shape[1]
+        return [Point2((node % width + 0.5, node // width + 0.5)) for node in result[1]]
+
+    def distance(self, start: Point2, end: Point2, air: bool = False, danger_weight: float = 0) -> Optional[float]:
+        """
+        Cost of the cheapest path from start to end with A*, None if there is no path.
+        Without danger this is the ground distance in tiles.
+        A distance field already computed from start is read instead.
+        """
+        graph: PathingGraph = self.graph(air, danger_weight)
+        field: Optional[np.ndarray] = self.fields.get((air, danger_weight, self.snap(graph, start), self.layer_version(air, danger_weight)))
+        if (field is not None):
+            return self.field_distance(field, end, air, danger_weight)
+        result: Optional[Tuple[float, List[int]]] = self._astar(start, end, air, danger_weight)
+        return None if result is None else result[0]
+
+    def _astar(self, start: Point2, end: Point2, air: bool, danger_weight: float) -> Optional[Tuple[float, List[int]]]:
+        """ Cost and tiles (y * width + x) of the cheapest path. """
+        graph: PathingGraph = self.graph(air, danger_weight)
+        start_tile: Optional[Tuple[int, int]] = self.snap(graph, start)
+        end_tile: Optional[Tuple[int, int]] = self.snap(graph, end)
+        if (start_tile is None or end_tile is None):
+            return None
+        width: int = graph.cost.shape[1]
+        # A* works on the padded grid, the border tiles cost inf so they are never entered
+        padded_width: int = width + 2
+        costs_list: List[float] = graph.padded_costs
+        moves: List[Tuple[int, float, int, int]] = [
+            (dy * padded_width + dx, length, dy * padded_width if dx and dy else 0, dx if dx and dy else 0)
+            for dy, dx, length in MOVES
+        ]
+        start_node: int = (start_tile[1] + 1) * padded_width + start_tile[0] + 1
+        end_node: int = (end_tile[1] + 1) * padded_width + end_tile[0] + 1
+        end_x, end_y = end_tile[0] + 1, end_tile[1] + 1
+
+        def heuristic(node: int) -> float:
+            # octile distance, admissible since every tile costs at least 1
+            y, x = divmod(node, padded_width)
+            dx: int = x - end_x if x > end_x else end_x - x
+            dy: int = y - end_y if y > end_y else end_y - y
+            return dx + dy + OCTILE_DIAGONAL * (dx if dx < dy else dy)
+
+        inf: float = math.inf
+        best: List[float] = [inf] * len(costs_list)
+        parents: Dict[int, int] = {}
+        best[start_node] = 0.0
+        # ties on f are broken towards the deepest node (-cost), which expands fewer tiles on open ground
+        queue: List[Tuple[float, float, int]] = [(heuristic(start_node), 0.0, start_node)]
+        while (queue):
+            _, negative_cost, node = heapq.heappop(queue)
+            cost: float = -negative_cost
+            if (node == end_node):
+                path: List[int] = [node]
+                while (node in parents):
+                    node = parents[node]
+                    path.append(node)
+                path.reverse()
+                return cost, [(node // padded_width - 1) * width + node % padded_width - 1 for node in path]
+            if (cost > best[node]):
+                continue
+            node_cost: float = costs_list[node]
+            for offset, length, corner_y, corner_x in moves:
+                neighbor: int = node + offset
+                neighbor_cost: float = costs_list[neighbor]
+                if (neighbor_cost == inf):
+                    continue
+                # diagonals can't cut corners
+                if (corner_x and (costs_list[node + corner_y] == inf or costs_list[node + corner_x] == inf)):
+                    continue
+                new_cost: float = cost + length * (node_cost + neighbor_cost) / 2
+                if (new_cost < best[neighbor]):
+                    best[neighbor] = new_cost
+                    parents[neighbor] = node
+                    heapq.heappush(queue, (new_cost + heuristic(neighbor), -new_cost, neighbor))
+        return None
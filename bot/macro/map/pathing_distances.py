@@ -0,0 +1,101 @@
+from __future__ import annotations
+import math
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from bot.utils.map_cache import grid_hash, load_array, save_array
+from sc2.position import Point2
+if TYPE_CHECKING:
+    from bot.superbot import Superbot  # only imported for type hints
+
+pathing_distances: PathingDistances | None = None
+
+PathKey = Tuple[Tuple[float, float], Tuple[float, float]]
+
+
+def path_key(start: Point2, end: Point2) -> PathKey:
+    """ Ground distances are symmetric, so both directions share the same key. """
+    a: Tuple[float, float] = (round(start.x, 1), round(start.y, 1))
+    b: Tuple[float, float] = (round(end.x, 1), round(end.y, 1))
+    return (a, b) if a <= b else (b, a)
+
+
+class PathingDistances:
+    """
+    Cache of ground pathing distances between points, None when there is no path.
+    Missing distances are fetched with a single batched query_pathings call,
+    and the cache is persisted per map and start location so the next game on the same map starts with it.
+    """
+    bot: Superbot
+    distances: Dict[PathKey, Optional[float]]
+    new_entries: int
+
+    def __init__(self, bot: Superbot) -> None:
+        self.bot = bot
+        self.distances = {}
+        self.new_entries = 0
+
+    @property
+    def cache_key(self) -> str:
+        start: Point2 = self.bot.game_info.player_start_location
+        placement: np.ndarray = self.bot.game_info.placement_grid.data_numpy
+        return f'{start.x:.1f}_{start.y:.1f}_{grid_hash(placement)}'
+
+    def load(self) -> None:
+        array: Optional[np.ndarray] = load_array(self.bot.game_info.map_name, "pathing_distances", self.cache_key)
+        if (array is None or array.ndim != 2 or array.shape[1] != 5):
+            return
+        for start_x, start_y, end_x, end_y, distance in array.tolist():
+            key: PathKey = ((start_x, start_y), (end_x, end_y))
+            self.distances[key] = None if math.isnan(distance) else distance
+
+    def save(self) -> None:
+        if (self.new_entries == 0):
+            return
+        array: np.ndarray = np.array(
+            [
+                (start[0], start[1], end[0], end[1], np.nan if distance is None else distance)
+                for (start, end), distance in self.distances.items()
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 5)
+        save_array(self.bot.game_info.map_name, "pathing_distances", self.cache_key, array)
+        self.new_entries = 0
+
+    def known(self, start: Point2, end: Point2) -> bool:
+        return path_key(start, end) in self.distances
+
+    def get(self, start: Point2, end: Point2) -> Optional[float]:
+        """
+        Cached distance from start to end, None if there is no path or if it wasn't fetched yet.
+        """
+        return self.distances.get(path_key(start, end))
+
+    async def fetch(self, pairs: Iterable[Tuple[Point2, Point2]]) -> None:
+        """
+        Fetch every missing distance of `pairs` in a single query.
+        """
+        missing: Dict[PathKey, Tuple[Point2, Point2]] = {}
+        for start, end in pairs:
+            key: PathKey = path_key(start, end)
+            if (key not in self.distances):
+                missing[key] = (start, end)
+        if (not missing):
+            return
+        results: List[float] = await self.bot.client.query_pathings(list(missing.values()))
+        for key, distance in zip(missing, results):
+            # query_pathings returns 0 when there is no path
+            self.distances[key] = distance if distance > 0 else None
+        self.new_entries += len(missing)
+
+    async def distance(self, start: Point2, end: Point2) -> Optional[float]:
+        await self.fetch([(start, end)])
+        return self.get(start, end)
+
+
+def get_pathing_distances(bot: Superbot) -> PathingDistances:
+    global pathing_distances
+    if (pathing_distances is None):
+        pathing_distances = PathingDistances(bot)
+    return pathing_distances
@@ -1,6 +1,8 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List
+import numpy as np
 from bot.scouting.ghost_units.ghost_units import GhostUnit, GhostUnits
+from bot.scouting.ghost_units.store import GhostUnitStore
 if TYPE_CHECKING:
     from bot.superbot import Superbot  # only imported for type hints
 
@@ -8,98 +10,57 @@ ghost_units_manager: GhostUnitsManager | None = None
 
 class GhostUnitsManager:
     bot: Superbot
-    ghost_units: dict[int, GhostUnit] = {}
+    store: GhostUnitStore
+    assumed_key: tuple[int, int]
+    assumed: List[GhostUnit]
 
     def __init__(self, bot: Superbot) -> None:
         self.bot = bot
+        self.store = GhostUnitStore()
+        self.assumed_key = (-1, -1)
+        self.assumed = []
 
     def update_ghost_units(self):
         frame = self.bot.state.game_loop
         # 1- Add / refresh visible enemy units
-        for unit in self.bot.enemy_units:
-            lifetime = 300 - unit.real_speed * 60
-
-            self.ghost_units[unit.tag] = GhostUnit(
-                tag=unit.tag,
-                type_id=unit.type_id,
-                position=unit.position,
-                radius=unit.radius,
-                ground_dps=unit.ground_dps,
-                ground_range=unit.ground_range,
-                air_dps=unit.air_dps,
-                air_range=unit.air_range,
-                real_speed=unit.real_speed,
-                health=unit.health,
-                health_max=unit.health_max,
-                health_percentage=unit.health_percentage,
-                shield=unit.shield,
-                shield_max=unit.shield_max,
-                shield_percentage=unit.shield_percentage,
-                energy=unit.energy,
-                energy_max=unit.energy_max,
-                energy_percentage=unit.energy_percentage,
-                is_flying=unit.is_flying,
-                is_armored=unit.is_armored,
-                can_attack=unit.can_attack,
-                can_attack_ground=unit.can_attack_ground,
-                can_attack_air=unit.can_attack_air,
-                is_visible=unit.is_visible,
-                is_cloaked=unit.is_cloaked,
-                last_seen_frame=frame,
-                expiry_frame=round(frame + lifetime),
-            )
+        self.store.refresh(frame, self.bot.unit_snapshot, self.bot.unit_snapshot.enemy_units)
 
         # 2- Remove expired ghost units
-        expired = [
-            tag for tag, ghost in self.ghost_units.items()
-            if ghost.expiry_frame < frame
-        ]
-        for tag in expired:
-            del self.ghost_units[tag]
+        self.store.keep(self.store["expiry_frame"] >= frame)
 
         # 3- Remove ghosts that are disproven by vision + detection
-        visible_enemy_tags = {u.tag for u in self.bot.enemy_units}
-
-        to_remove = []
-
-        for tag, ghost in self.ghost_units.items():
-            if (tag in visible_enemy_tags):
-                continue  # already refreshed above
-
-            if (self.bot.is_visible(ghost.position)):
-                if (self.bot.map.influence_maps.detection.detected[ghost.position] == 1):
-                    # Vision + detection → unit truly not present
-                    to_remove.append(tag)
-                else:
-                    # Vision but no detection → unit may be burrowed or cloaked
-                    ghost.is_possibly_hidden = True
-
-        for tag in to_remove:
-            del self.ghost_units[tag]
+        if (len(self.store) == 0):
+            return
+        ys, xs = self.store.tiles()
+        visibility: np.ndarray = self.bot.state.visibility.data_numpy
+        height, width = visibility.shape
+        ys, xs = np.clip(ys, 0, height - 1), np.clip(xs, 0, width - 1)
+        # units seen this frame were already refreshed above
+        visible: np.ndarray = (self.store["last_seen_frame"] != frame) & (visibility[ys, xs] == 2)
+        detected: np.ndarray = self.bot.map.influence_maps.detection.detected.map[ys, xs] == 1
+        # Vision but no detection → unit may be burrowed or cloaked
+        self.store.mark_possibly_hidden(visible & ~detected)
+        # Vision + detection → unit truly not present
+        self.store.keep(~(visible & detected))
 
     def remove_by_tag(self, tag: int):
-        if (tag not in self.ghost_units.keys()):
-            return
-        del self.ghost_units[tag]
-    
+        self.store.remove(tag)
+
     @property
     def assumed_enemy_units(self) -> GhostUnits:
+        """ Remembered enemy units that aren't visible this frame, built once per frame and change of the store. """
         frame = self.bot.state.game_loop
+        key: tuple[int, int] = (frame, self.store.version)
+        if (self.assumed_key != key):
+            self.assumed_key = key
+            # the units seen this frame are real units
+            self.assumed = self.store.ghost_units(
+                (self.store["last_seen_frame"] != frame) & (self.store["expiry_frame"] >= frame)
+            )
+        return GhostUnits(self.bot, self.assumed.copy())
 
-        assumed = []
-
-        visible_tags = {u.tag for u in self.bot.enemy_units}
-
-        for tag, ghost in self.ghost_units.items():
-            if (tag in visible_tags):
-                continue  # real unit already visible
-            if (ghost.expiry_frame >= frame):
-                assumed.append(ghost)
-
-        return GhostUnits(self.bot, assumed)
-    
 def get_ghost_units(bot: Superbot) -> GhostUnitsManager:
     global ghost_units_manager
     if (ghost_units_manager is None):
         ghost_units_manager = GhostUnitsManager(bot)
-    return ghost_units_manager
\ No newline at end of file
+    return ghost_units_manager
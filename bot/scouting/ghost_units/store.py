@@ -0,0 +1,184 @@
+from __future__ import annotations
+from typing import Dict, List
+
+import numpy as np
+
+from bot.scouting.ghost_units.ghost_units import GhostUnit
+from sc2.constants import IS_CLOAKED
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+from sc2.unit import Unit
+from sc2.unit_snapshot import UnitSnapshot
+
+# columns copied from the unit snapshot every frame the unit is seen
+SNAPSHOT_COLUMNS: Dict[str, type] = {
+    "type_id": np.int32,
+    "x": np.float64,
+    "y": np.float64,
+    "radius": np.float64,
+    "health": np.float64,
+    "health_max": np.float64,
+    "shield": np.float64,
+    "shield_max": np.float64,
+    "energy": np.float64,
+    "is_flying": bool,
+    "can_attack": bool,
+}
+# columns read from the Unit properties, only when the unit is new, morphed or its stats are old
+STAT_COLUMNS: Dict[str, type] = {
+    "ground_dps": np.float64,
+    "ground_range": np.float64,
+    "air_dps": np.float64,
+    "air_range": np.float64,
+    "real_speed": np.float64,
+    "energy_max": np.float64,
+    "is_armored": bool,
+    "can_attack_ground": bool,
+    "can_attack_air": bool,
+}
+COLUMNS: Dict[str, type] = {
+    "tag": np.uint64,
+    **SNAPSHOT_COLUMNS,
+    **STAT_COLUMNS,
+    "is_visible": bool,
+    "is_cloaked": bool,
+    "is_possibly_hidden": bool,
+    "last_seen_frame": np.int64,
+    "stats_frame": np.int64,
+    "expiry_frame": np.int64,
+}
+
+
+class GhostUnitStore:
+    """
+    Memory of the enemy units, one row per unit and one numpy array per field (same fields as GhostUnit),
+    plus the row of each tag. Rows are refreshed in bulk from the unit snapshot,
+    expired or disproven rows are dropped with a single mask.
+    """
+    columns: Dict[str, np.ndarray]
+    rows: Dict[int, int]
+    version: int
+    STATS_REFRESH_FRAMES: int = 22
+
+    def __init__(self) -> None:
+        self.columns = {name: np.zeros(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self.rows = {}
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.columns["tag"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def refresh(self, frame: int, snapshot: UnitSnapshot, snapshot_rows: np.ndarray) -> None:
+        """ Adds or refreshes the units of the selected snapshot rows, seen this frame. """
+        indices: np.ndarray = np.flatnonzero(snapshot_rows) if snapshot_rows.dtype == bool else snapshot_rows
+        if (len(indices) == 0):
+            return
+        tags: np.ndarray = snapshot.tag[indices]
+        rows: np.ndarray = np.fromiter((self.rows.get(tag, -1) for tag in tags.tolist()), dtype=np.int64, count=len(tags))
+        new: np.ndarray = rows < 0
+        if (new.any()):
+            rows[new] = self._append(tags[new])
+        morphed: np.ndarray = ~new & (self.columns["type_id"][rows] != snapshot.type_id[indices])
+
+        for name in SNAPSHOT_COLUMNS:
+            self.columns[name][rows] = getattr(snapshot, name)[indices]
+        self.columns["is_visible"][rows] = snapshot.is_visible[indices]
+        self.columns["is_possibly_hidden"][rows] = False
+        self.columns["last_seen_frame"][rows] = frame
+        # cloaking is not part of the snapshot, it's read from the protos directly
+        self.columns["is_cloaked"][rows] = np.fromiter(
+            (snapshot.all_units[index]._proto.cloak in IS_CLOAKED for index in indices.tolist()), dtype=bool, count=len(indices)
+        )
+
+        stale: np.ndarray = new | morphed | (self.columns["stats_frame"][rows] + self.STATS_REFRESH_FRAMES <= frame)
+        if (stale.any()):
+            self._refresh_stats(frame, [snapshot.all_units[index] for index in indices[stale].tolist()], rows[stale])
+        lifetime: np.ndarray = 300 - self.columns["real_speed"][rows] * 60
+        self.columns["expiry_frame"][rows] = np.round(frame + lifetime).astype(np.int64)
+        self.version += 1
+
+    def _append(self, tags: np.ndarray) -> np.ndarray:
+        start: int = len(self)
+        for name, dtype in COLUMNS.items():
+            self.columns[name] = np.concatenate((self.columns[name], np.zeros(len(tags), dtype=dtype)))
+        self.columns["tag"][start:] = tags
+        # new rows have never been seen, their stats are read right away
+        self.columns["stats_frame"][start:] = np.iinfo(np.int64).min // 2
+        for row, tag in enumerate(tags.tolist(), start):
+            self.rows[tag] = row
+        return np.arange(start, start + len(tags))
+
+    def _refresh_stats(self, frame: int, units: List[Unit], rows: np.ndarray) -> None:
+        for name, dtype in STAT_COLUMNS.items():
+            self.columns[name][rows] = np.fromiter((getattr(unit, name) for unit in units), dtype=dtype, count=len(units))
+        self.columns["stats_frame"][rows] = frame
+
+    def keep(self, mask: np.ndarray) -> None:
+        """ Drops the rows outside of mask. """
+        if (mask.all()):
+            return
+        for name in COLUMNS:
+            self.columns[name] = self.columns[name][mask]
+        self.rows = {tag: row for row, tag in enumerate(self.columns["tag"].tolist())}
+        self.version += 1
+
+    def mark_possibly_hidden(self, mask: np.ndarray) -> None:
+        """ Rows in vision but not detected: the unit may be burrowed or cloaked there. """
+        if (mask.any()):
+            self.columns["is_possibly_hidden"][mask] = True
+            self.version += 1
+
+    def remove(self, tag: int) -> None:
+        row = self.rows.get(tag)
+        if (row is None):
+            return
+        mask: np.ndarray = np.ones(len(self), dtype=bool)
+        mask[row] = False
+        self.keep(mask)
+
+    def tiles(self) -> tuple[np.ndarray, np.ndarray]:
+        """ (y, x) tile of every row, same as Point2.rounded. """
+        return self.columns["y"].astype(np.int64), self.columns["x"].astype(np.int64)
+
+    def ghost_units(self, mask: np.ndarray) -> List[GhostUnit]:
+        """ GhostUnit of each row of mask. """
+        values: Dict[str, list] = {name: self.columns[name][mask].tolist() for name in COLUMNS}
+        ghosts: List[GhostUnit] = []
+        for row in range(len(values["tag"])):
+            health, health_max = values["health"][row], values["health_max"][row]
+            shield, shield_max = values["shield"][row], values["shield_max"][row]
+            energy, energy_max = values["energy"][row], values["energy_max"][row]
+            ghosts.append(GhostUnit(
+                tag=values["tag"][row],
+                type_id=UnitTypeId(values["type_id"][row]),
+                position=Point2((values["x"][row], values["y"][row])),
+                radius=values["radius"][row],
+                ground_dps=values["ground_dps"][row],
+                ground_range=values["ground_range"][row],
+                air_dps=values["air_dps"][row],
+                air_range=values["air_range"][row],
+                real_speed=values["real_speed"][row],
+                health=health,
+                health_max=health_max,
+                health_percentage=health / health_max if health_max else 0,
+                shield=shield,
+                shield_max=shield_max,
+                shield_percentage=shield / shield_max if shield_max else 0,
+                energy=energy,
+                energy_max=energy_max,
+                energy_percentage=energy / energy_max if energy_max else 0,
+                is_flying=values["is_flying"][row],
+                is_armored=values["is_armored"][row],
+                can_attack=values["can_attack"][row],
+                can_attack_ground=values["can_attack_ground"][row],
+                can_attack_air=values["can_attack_air"][row],
+                last_seen_frame=values["last_seen_frame"][row],
+                expiry_frame=values["expiry_frame"][row],
+                is_cloaked=values["is_cloaked"][row],
+                is_visible=values["is_visible"][row],
+                is_possibly_hidden=values["is_possibly_hidden"][row],
+            ))
+        return ghosts
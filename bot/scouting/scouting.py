@@ -1,5 +1,7 @@
 from __future__ import annotations
 from typing import List, TYPE_CHECKING
+
+import numpy as np
 from bot.strategy.strategy_types import Situation
 from bot.utils.army import Army
 from sc2.bot_ai import BotAI
@@ -7,8 +9,10 @@ from sc2.ids.unit_typeid import UnitTypeId
 from sc2.ids.upgrade_id import UpgradeId
 from sc2.position import Point2
 from sc2.unit import Unit
+from sc2.unit_snapshot import UnitSnapshot
 from sc2.units import Units
-from bot.utils.unit_tags import burrowed_units, cloaked_units, tower_types, worker_types
+from bot.utils.unit_tags import burrowed_units, cloaked_units, worker_types
+from bot.utils.unit_traits import UnitTrait, trait_mask
 
 if TYPE_CHECKING:
     from bot.superbot import Superbot  # only imported for type hints
@@ -97,18 +101,23 @@ class Scouting:
     def detect_enemy_army(self):
         main: Point2 = self.bot.expansions.main.position
         enemy_main: Point2 = self.bot.expansions.enemy_main.position
-        enemy_units: Units = self.bot.enemy_units.filter(lambda unit: (
-            unit.type_id not in tower_types
-            and unit.type_id not in worker_types
-        ))
-        agressive_enemy_units: Units = enemy_units.filter(lambda unit: (
-            unit.type_id not in [UnitTypeId.QUEEN, UnitTypeId.OVERLORD]
-            or unit.distance_to_squared(main) < unit.distance_to_squared(enemy_main)
-        ))
+        snapshot: UnitSnapshot = self.bot.unit_snapshot
+        enemy_units: np.ndarray = (
+            snapshot.enemy_units
+            & ~trait_mask(snapshot.type_id, UnitTrait.TOWER | UnitTrait.WORKER)
+        )
+        closer_to_main: np.ndarray = self.bot.map.anchor_fields.closer_to(main, enemy_main, snapshot.x, snapshot.y)
+        agressive_enemy_units: np.ndarray = enemy_units & (
+            ~snapshot.of_type([UnitTypeId.QUEEN, UnitTypeId.OVERLORD])
+            | closer_to_main
+        )
 
-        self.known_enemy_army.detect_units(agressive_enemy_units)
-        for enemy in enemy_units:
-            self.detect_enemy_composition(enemy.type_id)
+        self.known_enemy_army.detect_units(snapshot.units(agressive_enemy_units))
+        # each type once, in the order they appear
+        enemy_types: np.ndarray = snapshot.type_id[enemy_units]
+        _, first_indices = np.unique(enemy_types, return_index=True)
+        for type_id in enemy_types[np.sort(first_indices)]:
+            self.detect_enemy_composition(UnitTypeId(type_id))
 
     def detect_enemy_workers(self):
         enemy_workers: Units = self.bot.enemy_units(worker_types)
@@ -154,7 +154,7 @@ class AddonSwapManager:
 
         if (not swap.donor_flying.is_moving):
             top_position: Point2 = swap.donor_original_position + Point2((0, 2.5))
-            land_position: Point2 = dfs_in_pathing(
+            land_position: Optional[Point2] = dfs_in_pathing(
                 self.bot,
                 top_position,
                 swap.donor_type,
@@ -162,7 +162,8 @@ class AddonSwapManager:
                 1.5,
                 True,
             )
-            swap.donor_flying(AbilityId.LAND, land_position)
+            if (land_position is not None):
+                swap.donor_flying(AbilityId.LAND, land_position)
 
         # AddonDetachSwap has no recipient — go straight to DONOR_LANDING.
         if (swap.recipient_tag is None):
@@ -241,7 +242,7 @@ class AddonSwapManager:
             else swap.donor_original_position
         )
 
-        land_position: Point2 = dfs_in_pathing(
+        land_position: Optional[Point2] = dfs_in_pathing(
             self.bot,
             free_position,
             swap.donor_type,
@@ -249,6 +250,8 @@ class AddonSwapManager:
             1.5,
             True,
         )
+        if (land_position is None):
+            return
 
         print(f"[AddonSwapManager] Landing donor {swap.donor_type.name} at {land_position}.")
         swap.donor_flying(AbilityId.LAND, land_position)
\ No newline at end of file
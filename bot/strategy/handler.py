@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import Callable, List, Optional, TYPE_CHECKING
 from bot.macro.expansion import Expansion
 from bot.macro.macro import BASE_SIZE
+from bot.macro.map.anchor_fields import AnchorFields
 from bot.strategy.build_order.bo_names import BuildOrderName
 from bot.strategy.build_order.build_order import BuildOrder
 from bot.strategy.build_order.builds.defensive_reaction_builds.conservative_rax_expand import ConservativeRaxExpand
@@ -117,10 +118,11 @@ class StrategyHandler:
     def _nearby_enemy_buildings(self) -> Units:
         main: Point2 = self.bot.expansions.main.position
         enemy_main: Point2 = self.bot.expansions.enemy_main.position
+        anchor_fields: AnchorFields = self.bot.map.anchor_fields
         return self.bot.enemy_structures.filter(
             lambda building: (
                 building.type_id not in creep
-                and building.distance_to(main) < building.distance_to(enemy_main)
+                and anchor_fields.is_closer_to(main, enemy_main, building.position)
             )
         )
 
@@ -136,14 +138,18 @@ class StrategyHandler:
         return self.bot.enemy_units.filter(
             lambda unit: (
                 unit.type_id in worker_types
-                and unit.distance_to(self.bot.expansions.main.position) * 2 < unit.distance_to(self.bot.expansions.enemy_main.position)
+                and self.bot.map.anchor_fields.is_closer_to(
+                    self.bot.expansions.main.position, self.bot.expansions.enemy_main.position, unit.position, ratio=2
+                )
             )
         ).amount < 3
     
     def _enemy_units_cleared(self) -> bool:
         return self.bot.enemy_units.filter(
             lambda unit: (
-                unit.distance_to(self.bot.expansions.main.position) * 2 < unit.distance_to(self.bot.expansions.enemy_main.position)
+                self.bot.map.anchor_fields.is_closer_to(
+                    self.bot.expansions.main.position, self.bot.expansions.enemy_main.position, unit.position, ratio=2
+                )
             )
         ).amount < 3
     
@@ -204,7 +210,7 @@ class StrategyHandler:
         close_workers: Units = self.bot.enemy_units.filter(
             lambda unit: (
                 unit.type_id in worker_types
-                and unit.distance_to(main) < unit.distance_to(enemy_main)
+                and self.bot.map.anchor_fields.is_closer_to(main, enemy_main, unit.position)
             )
         )
         
@@ -2,10 +2,12 @@ from __future__ import annotations
 from typing import List
 
 from attr import dataclass
+from bot.combat.ability_availability import AbilityAvailability
 from bot.army_composition.army_composition_manager import ArmyCompositionManager
 from bot.strategy.build_order.addon_swap import AddonSwapManager
 from bot.macro.expansion_manager import Expansions
 from bot.macro.map.map import MapData
+from bot.macro.map.pathing_distances import PathingDistances
 from bot.scouting.ghost_units.manager import GhostUnitsManager
 from bot.scouting.scouting import Scouting
 from bot.strategy.build_order.manager import BuildOrderManager
@@ -53,6 +55,14 @@ class Superbot(BotAI):
     def ghost_units(self) -> GhostUnitsManager:
         pass
 
+    @property
+    def abilities(self) -> AbilityAvailability:
+        pass
+
+    @property
+    def pathing_distances(self) -> PathingDistances:
+        pass
+
     @property
     def stim_completed(self) -> bool:
         return self.already_pending_upgrade(UpgradeId.STIMPACK) == 1
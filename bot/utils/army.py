@@ -8,17 +8,20 @@ from sc2.ids.unit_typeid import UnitTypeId
 from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
-from ..utils.unit_tags import worker_types, menacing, bio, droppable_units
+from ..utils.unit_tags import bio, droppable_units
+from ..utils.unit_traits import UnitTrait, has_trait
 from ..utils.unit_supply import get_units_supply, weighted_units_supply
 
 
 class Army(CachedClass):
     units: Units
     orders: Orders = Orders.RETREAT
+    cluster_id: Optional[int] = None
 
-    def __init__(self, units: Units, bot: BotAI) -> None:
+    def __init__(self, units: Units, bot: BotAI, cluster_id: Optional[int] = None) -> None:
         super().__init__(bot)
         self.units = units
+        self.cluster_id = cluster_id
     
     @property
     def tags(self) -> List[int]:
@@ -148,7 +151,7 @@ class Army(CachedClass):
     def units_not_in_sight(self) -> Units:
         unseen_units: List[Unit] = []
         for unit in self.units:
-            if (unit.tag not in self.bot.enemy_units.tags):
+            if (unit.tag not in self.bot.enemy_units.tag_index):
                 unseen_units.append(unit)
         return Units(unseen_units, self.bot)
     
@@ -241,8 +244,8 @@ class Army(CachedClass):
     def fighting_units(self) -> Units:
         attacking_units: Units = self.units.filter(
             lambda unit: (
-                (unit.can_attack or unit.type_id in menacing)
-                and unit.type_id not in worker_types
+                (unit.can_attack or has_trait(unit.type_id, UnitTrait.MENACING))
+                and not has_trait(unit.type_id, UnitTrait.WORKER)
                 and unit.type_id != UnitTypeId.MEDIVAC
                 and not unit.has_buff(BuffId.RAVENSCRAMBLERMISSILE)
             )
@@ -290,10 +293,9 @@ class Army(CachedClass):
         return total_range / attacking_units.amount
     
     def detect_units(self, enemy_units: Units) -> None:
-        for enemy in enemy_units:
-            if (enemy.tag in self.units.tags):
-                self.remove_by_tag(enemy.tag)
-            self.units.append(enemy)
+        # replace the known units by their new version in a single pass
+        detected_tags: frozenset[int] = enemy_units.tags
+        self.units[:] = [unit for unit in self.units if unit.tag not in detected_tags] + list(enemy_units)
     
     def remove_by_tag(self, tag: int) -> None:
         destroyed_unit: Unit = self.units.by_tag(tag)
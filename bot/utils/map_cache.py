@@ -0,0 +1,42 @@
+import hashlib
+import re
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+DATA_FOLDER: str = "data"
+CACHE_FOLDER: Path = Path(DATA_FOLDER) / "map_cache"
+
+
+def grid_hash(grid: np.ndarray) -> str:
+    """ Short stable hash of a grid, changes whenever the map layout changes. """
+    grid = np.ascontiguousarray(grid)
+    digest = hashlib.sha1(str(grid.shape).encode())
+    digest.update(grid.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def cache_file(map_name: str, name: str, key: str, extension: str) -> Path:
+    safe_map_name: str = re.sub(r"[^A-Za-z0-9_-]", "", map_name)
+    return CACHE_FOLDER / safe_map_name / f"{name}_{key}.{extension}"
+
+
+def load_array(map_name: str, name: str, key: str) -> Optional[np.ndarray]:
+    path: Path = cache_file(map_name, name, key, "npy")
+    if (not path.is_file()):
+        return None
+    try:
+        return np.load(path, allow_pickle=False)
+    except (OSError, ValueError) as error:
+        print(f'Error: could not read map cache {path}: {error}')
+        return None
+
+
+def save_array(map_name: str, name: str, key: str, array: np.ndarray) -> None:
+    path: Path = cache_file(map_name, name, key, "npy")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, array, allow_pickle=False)
+    except OSError as error:
+        print(f'Error: could not write map cache {path}: {error}')
@@ -1,12 +1,35 @@
-from collections import deque
-from typing import List, Optional
-from bot.macro.map.influence_maps.layers.buildings_layer import ADDON_RADIUS
+import math
+from typing import Dict, Optional, Tuple
+import numpy as np
+from bot.macro.map.influence_maps.layers.buildings_layer import ADDON_RADIUS, BuildingLayer
 from bot.macro.map.map import MapData, get_map
 from bot.utils.point2_functions.utils import addon_offset
 from sc2.bot_ai import BotAI
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.position import Point2
 
+SEARCH_RADIUS: int = 24
+
+def _ring_offsets(radius: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ (dx, dy) offsets within radius sorted by distance, their ring (rounded distance) and the first index of each ring. """
+    dxs, dys = np.meshgrid(np.arange(-radius, radius + 1), np.arange(-radius, radius + 1))
+    dxs, dys = dxs.ravel(), dys.ravel()
+    distances_squared: np.ndarray = dxs ** 2 + dys ** 2
+    inside: np.ndarray = distances_squared <= radius ** 2
+    dxs, dys, distances_squared = dxs[inside], dys[inside], distances_squared[inside]
+    order: np.ndarray = np.argsort(distances_squared, kind="stable")
+    offsets: np.ndarray = np.stack((dxs[order], dys[order]), axis=1)
+    rings: np.ndarray = np.round(np.sqrt(distances_squared[order])).astype(np.int64)
+    ring_starts: np.ndarray = np.searchsorted(rings, np.arange(radius + 2))
+    return offsets, rings, ring_starts
+
+# offsets of the search around a position, ring by ring
+RING_OFFSETS, RINGS, RING_STARTS = _ring_offsets(SEARCH_RADIUS)
+
+# results of the searches of the current frame, until the buildings layer changes
+search_memo: Dict[tuple, Optional[Point2]] = {}
+search_memo_key: Tuple[int, int] = (-1, -1)
+
 def valid_building_position(bot: BotAI, position: Point2, unit_type: UnitTypeId, radius: float, has_addon: bool) -> bool:
     map: MapData = get_map(bot)
     if (
@@ -14,70 +37,84 @@ def valid_building_position(bot: BotAI, position: Point2, unit_type: UnitTypeId,
         and not map.influence_maps.buildings.should_build_building(addon_offset(position), UnitTypeId.BARRACKSTECHLAB, ADDON_RADIUS)
     ):
         return False
-    should_build: bool = map.influence_maps.buildings.should_build_building(position, unit_type, radius)    
+    should_build: bool = map.influence_maps.buildings.should_build_building(position, unit_type, radius)
     return should_build
 
-def dfs_in_pathing(bot: BotAI, position: Point2, unit_type: UnitTypeId, preferred_direction: Optional[Point2] = None, radius: float = 1.5, has_addon: bool = False) -> Point2:
-    """ Find a valid buildable position around the given position using BFS.
-        The radius in tiles around the position to search for valid buildable positions."""
-    size: int = int(round(radius * 2))
-    
-    def normalize(p: Point2) -> Point2:
-        # Odd size (3x3, 5x5) → rounded_half, Even size (2x2) → rounded
-        return p.rounded_half if (size % 2 != 0) else p.rounded
-
-    position = normalize(position)
+def _valid_at(raster: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """ Values of an origin raster at (xs, ys), False outside of it. """
+    height, width = raster.shape
+    inside: np.ndarray = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    return inside & raster[np.clip(ys, 0, height - 1), np.clip(xs, 0, width - 1)]
 
+def valid_building_offsets(
+    buildings: BuildingLayer, position: Point2, unit_type: UnitTypeId, radius: float, has_addon: bool, offsets: np.ndarray
+) -> np.ndarray:
+    """ valid_building_position for position + each offset at once, position being a tile center or corner matching the size. """
+    size: int = int(round(radius * 2))
+    half: int = size // 2
+    # same origin as should_build_building: floor of the center minus half the size
+    origin_x: int = math.floor(position.x) - half
+    origin_y: int = math.floor(position.y) - half
+    valid: np.ndarray = _valid_at(
+        buildings.valid_origins(unit_type, size), origin_x + offsets[:, 0], origin_y + offsets[:, 1]
+    )
+    if (has_addon):
+        addon_size: int = int(round(ADDON_RADIUS * 2))
+        addon: Point2 = addon_offset(position)
+        addon_x: int = math.floor(addon.x) - addon_size // 2
+        addon_y: int = math.floor(addon.y) - addon_size // 2
+        valid &= _valid_at(
+            buildings.valid_origins(UnitTypeId.BARRACKSTECHLAB, addon_size), addon_x + offsets[:, 0], addon_y + offsets[:, 1]
+        )
+    return valid
+
+def dfs_in_pathing(
+    bot: BotAI,
+    position: Point2,
+    unit_type: UnitTypeId,
+    preferred_direction: Optional[Point2] = None,
+    radius: float = 1.5,
+    has_addon: bool = False,
+    max_distance: int = SEARCH_RADIUS,
+) -> Optional[Point2]:
+    """ Find the closest valid buildable position around the given position, at most max_distance tiles away.
+        Candidates are checked ring by ring, in a ring the one towards preferred_direction is picked.
+        None if there is no valid position within max_distance."""
+    global search_memo, search_memo_key
+    size: int = int(round(radius * 2))
+    # Odd size (3x3, 5x5) → rounded_half, Even size (2x2) → rounded
+    position = position.rounded_half if (size % 2 != 0) else position.rounded
+
+    buildings: BuildingLayer = get_map(bot).influence_maps.buildings
+    frame_key: Tuple[int, int] = (bot.state.game_loop, buildings.version)
+    if (search_memo_key != frame_key):
+        search_memo_key = frame_key
+        search_memo = {}
+    key: tuple = (position, unit_type, has_addon, radius, preferred_direction, max_distance)
+    if (key in search_memo):
+        return search_memo[key]
 
     # If already valid, return it
     if (valid_building_position(bot, position, unit_type, radius, has_addon)):
+        search_memo[key] = position
         return position
-    
-    if (preferred_direction is None):
-        preferred_direction = position
-
-    def biased_directions(current: Point2) -> list[tuple[int, int]]:
-        dx = preferred_direction.x - current.x
-        dy = preferred_direction.y - current.y
-
-        step_x = 1 if dx > 0 else -1 if dx < 0 else 0
-        step_y = 1 if dy > 0 else -1 if dy < 0 else 0
-
-        directions: list[tuple[int, int]] = []
-
-        if step_x != 0 or step_y != 0:
-            directions.append((step_x, step_y))
-        if step_x != 0:
-            directions.append((step_x, 0))
-        if step_y != 0:
-            directions.append((0, step_y))
-
-        directions += [(1, 0), (-1, 0), (0, 1), (0, -1)]
-
-        seen = set()
-        return [d for d in directions if not (d in seen or seen.add(d))]
-
-    # BFS search for the nearest valid point
-    search_queue: deque[Point2] = deque([position])
-    visited: set[Point2] = {position}
-
-    while search_queue:
-        current = search_queue.popleft()
-
-        for dx, dy in biased_directions(current):
-            neighbor = normalize(Point2((current.x + dx, current.y + dy)))
-            
-            if (neighbor in visited):
-                continue  # Skip already checked locations
-            
-            visited.add(neighbor)
-
-            # If it's a valid buildable position, return it
-            if (valid_building_position(bot, neighbor, unit_type, radius, has_addon)):
-                return neighbor
-
-            # Otherwise, continue expanding
-            search_queue.append(neighbor)
 
-    # If no valid point is found (unlikely), return the original position
-    return position
\ No newline at end of file
+    end: int = int(RING_STARTS[min(max_distance, SEARCH_RADIUS) + 1])
+    valid: np.ndarray = valid_building_offsets(buildings, position, unit_type, radius, has_addon, RING_OFFSETS[:end])
+    if (not valid.any()):
+        search_memo[key] = None
+        return None
+
+    # closest ring with a valid candidate, then the candidate of the ring going the most towards preferred_direction
+    ring: int = int(RINGS[int(valid.argmax())])
+    ring_start, ring_end = int(RING_STARTS[ring]), int(RING_STARTS[ring + 1])
+    candidates: np.ndarray = np.nonzero(valid[ring_start:ring_end])[0] + ring_start
+    best: int = int(candidates[0])
+    if (preferred_direction is not None and preferred_direction != position):
+        direction: Point2 = preferred_direction - position
+        alignments: np.ndarray = RING_OFFSETS[candidates] @ np.array((direction.x, direction.y))
+        best = int(candidates[int(alignments.argmax())])
+    dx, dy = RING_OFFSETS[best]
+    result: Point2 = Point2((position.x + int(dx), position.y + int(dy)))
+    search_memo[key] = result
+    return result
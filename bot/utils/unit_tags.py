@@ -1,274 +1,36 @@
 from typing import List
 
+from bot.utils.unit_traits import UnitTrait, types_with
 from sc2.ids.unit_typeid import UnitTypeId
 
-townhalls: List[UnitTypeId] = [
-    UnitTypeId.COMMANDCENTER,
-    UnitTypeId.COMMANDCENTERFLYING,
-    UnitTypeId.ORBITALCOMMAND,
-    UnitTypeId.ORBITALCOMMANDFLYING,
-    UnitTypeId.PLANETARYFORTRESS,
-    UnitTypeId.HATCHERY,
-    UnitTypeId.LAIR,
-    UnitTypeId.HIVE,
-    UnitTypeId.NEXUS
-]
-zerg_townhalls: List[UnitTypeId] = [
-    UnitTypeId.HATCHERY,
-    UnitTypeId.LAIR,
-    UnitTypeId.HIVE,
-]
-must_repair: List[UnitTypeId] = [
-    UnitTypeId.PLANETARYFORTRESS,
-    UnitTypeId.ORBITALCOMMAND,
-    UnitTypeId.MISSILETURRET,
-    UnitTypeId.BUNKER,
-    UnitTypeId.SUPPLYDEPOT,
-]
-defensive_structures: List[UnitTypeId] = [
-    UnitTypeId.PLANETARYFORTRESS,
-    UnitTypeId.MISSILETURRET,
-    UnitTypeId.BUNKER,
-]
-worker_types: List[UnitTypeId] = [
-    UnitTypeId.SCV,
-    UnitTypeId.PROBE,
-    UnitTypeId.DRONE,
-    UnitTypeId.MULE
-]
-tower_types: List[UnitTypeId] = [
-    UnitTypeId.PHOTONCANNON,
-    UnitTypeId.SHIELDBATTERY,
-    UnitTypeId.BUNKER,
-    UnitTypeId.PLANETARYFORTRESS,
-    UnitTypeId.SPINECRAWLER,
-    UnitTypeId.SPORECRAWLER,
-    UnitTypeId.MISSILETURRET,
-    UnitTypeId.NYDUSCANAL,
-    UnitTypeId.AUTOTURRET,
-]
-menacing: List[UnitTypeId] = [
-    UnitTypeId.WIDOWMINE,
-    UnitTypeId.WIDOWMINEBURROWED,
-    UnitTypeId.MEDIVAC,
-    UnitTypeId.RAVEN,
-    UnitTypeId.OVERLORDTRANSPORT,
-    UnitTypeId.BANELING,
-    UnitTypeId.BANELINGCOCOON,
-    UnitTypeId.BANELINGBURROWED,
-    UnitTypeId.ZERGLINGBURROWED,
-    UnitTypeId.ROACHBURROWED,
-    UnitTypeId.RAVAGERCOCOON,
-    UnitTypeId.LURKERMPEGG,
-    UnitTypeId.INFESTOR,
-    UnitTypeId.INFESTORBURROWED,
-    UnitTypeId.SWARMHOSTMP,
-    UnitTypeId.SWARMHOSTBURROWEDMP,
-    UnitTypeId.LOCUSTMPFLYING,
-    UnitTypeId.LURKERMP,
-    UnitTypeId.VIPER,
-    UnitTypeId.CARRIER,
-    UnitTypeId.DISRUPTORPHASED,
-    UnitTypeId.WARPPRISM,
-]
-menacing_air: List[UnitTypeId] = [
-    UnitTypeId.WIDOWMINE,
-    UnitTypeId.WIDOWMINEBURROWED,
-    UnitTypeId.RAVEN,
-    UnitTypeId.INFESTOR,
-    UnitTypeId.INFESTORBURROWED,
-    UnitTypeId.CARRIER,
-]
-dont_attack: List[UnitTypeId] = [
-    UnitTypeId.EGG,
-    UnitTypeId.LARVA,
-    UnitTypeId.INTERCEPTOR
-]
-add_ons: List[UnitTypeId] = [
-    UnitTypeId.BARRACKSREACTOR,
-    UnitTypeId.BARRACKSTECHLAB,
-    UnitTypeId.FACTORYREACTOR,
-    UnitTypeId.FACTORYTECHLAB,
-    UnitTypeId.STARPORTREACTOR,
-    UnitTypeId.STARPORTTECHLAB,
-    UnitTypeId.REACTOR,
-    UnitTypeId.TECHLAB,
-    UnitTypeId.TECHREACTOR,
-]
-reactors: List[UnitTypeId] = [
-    UnitTypeId.BARRACKSREACTOR,
-    UnitTypeId.FACTORYREACTOR,
-    UnitTypeId.STARPORTREACTOR,
-    UnitTypeId.REACTOR,
-]
-techlabs: List[UnitTypeId] = [
-    UnitTypeId.BARRACKSTECHLAB,
-    UnitTypeId.FACTORYTECHLAB,
-    UnitTypeId.STARPORTTECHLAB,
-    UnitTypeId.TECHLAB,
-]
-bio: List[UnitTypeId] = [
-    UnitTypeId.REAPER,
-    UnitTypeId.MARINE,
-    UnitTypeId.MARAUDER,
-    UnitTypeId.GHOST,
-]
-bio_stimmable: List[UnitTypeId] = [
-    UnitTypeId.MARINE,
-    UnitTypeId.MARAUDER
-]
-scouting_units: List[UnitTypeId] = [
-    UnitTypeId.REAPER,
-    UnitTypeId.HELLION,
-    UnitTypeId.BANSHEE,
-]
-droppable_units: List[UnitTypeId] = [
-    UnitTypeId.MARINE,
-    UnitTypeId.MARAUDER,
-    UnitTypeId.HELLION,
-    UnitTypeId.HELLIONTANK,
-    # UnitTypeId.CYCLONE,
-    UnitTypeId.WIDOWMINE,
-]
-building_priorities: List[UnitTypeId] = [
-    UnitTypeId.COMMANDCENTER,
-    UnitTypeId.ORBITALCOMMAND,
-    UnitTypeId.PLANETARYFORTRESS,
-    UnitTypeId.HATCHERY,
-    UnitTypeId.LAIR,
-    UnitTypeId.HIVE,
-    UnitTypeId.NEXUS,
-    UnitTypeId.PYLON,
-    UnitTypeId.ENGINEERINGBAY,
-    UnitTypeId.EVOLUTIONCHAMBER,
-    UnitTypeId.FORGE
-]
-burrowed_units: List[UnitTypeId] = [
-    UnitTypeId.QUEENBURROWED,
-    UnitTypeId.DRONEBURROWED,
-    UnitTypeId.ZERGLINGBURROWED,
-    UnitTypeId.BANELINGBURROWED,
-    UnitTypeId.ROACHBURROWED,
-    UnitTypeId.RAVAGERBURROWED,
-    UnitTypeId.HYDRALISKBURROWED,
-    UnitTypeId.LURKERMP,
-    UnitTypeId.LURKERMPBURROWED,
-    UnitTypeId.INFESTORBURROWED,
-    UnitTypeId.SWARMHOSTBURROWEDMP,
-    UnitTypeId.ULTRALISKBURROWED,
-]
-cloaked_units: List[UnitTypeId] = [
-    UnitTypeId.GHOST,
-    # This one is visible
-    # UnitTypeId.WIDOWMINE,
-    UnitTypeId.WIDOWMINEBURROWED,
-    UnitTypeId.BANSHEE,
-    # These shouldn't trigger detection on their own
-    # UnitTypeId.OBSERVER,
-    # UnitTypeId.OBSERVERSIEGEMODE,
-    UnitTypeId.DARKTEMPLAR,
-    UnitTypeId.MOTHERSHIP,
-]
-friendly_fire: List[UnitTypeId] = [
-    UnitTypeId.WIDOWMINE,
-    UnitTypeId.SIEGETANK,
-]
-build_order_structures: List[UnitTypeId] = [
-    UnitTypeId.REFINERY,
-    UnitTypeId.COMMANDCENTER,
-    UnitTypeId.BARRACKS,
-    UnitTypeId.FACTORY,
-    UnitTypeId.STARPORT,
-    UnitTypeId.ENGINEERINGBAY,
-    UnitTypeId.ARMORY,
-    UnitTypeId.BARRACKSTECHLAB,
-    UnitTypeId.BARRACKSREACTOR,
-    UnitTypeId.FACTORYREACTOR,
-]
-creep: List[UnitTypeId] = [
-    UnitTypeId.CREEPTUMOR,
-    UnitTypeId.CREEPTUMORQUEEN,
-    UnitTypeId.CREEPTUMORBURROWED,
-]
-production: List[UnitTypeId] = [
-    UnitTypeId.BARRACKS,
-    UnitTypeId.FACTORY,
-    UnitTypeId.STARPORT,
-]
-enemy_production: List [UnitTypeId] = [
-    # Terran
-    UnitTypeId.BARRACKS,
-    UnitTypeId.FACTORY,
-    UnitTypeId.STARPORT,
-    # Protoss
-    UnitTypeId.GATEWAY,
-    UnitTypeId.WARPGATE,
-    UnitTypeId.ROBOTICSFACILITY,
-    UnitTypeId.STARGATE,
-]
-production_flying: List[UnitTypeId] = [
-    UnitTypeId.BARRACKSFLYING,
-    UnitTypeId.FACTORYFLYING,
-    UnitTypeId.STARPORTFLYING,
-]
-important_buildings: List[UnitTypeId] = [
-    UnitTypeId.COMMANDCENTER,
-    UnitTypeId.BUNKER,
-    UnitTypeId.SUPPLYDEPOT,
-]
-flying_units: list[UnitTypeId] = [
-    # Terran
-    UnitTypeId.VIKING,
-    UnitTypeId.MEDIVAC,
-    UnitTypeId.LIBERATOR,
-    UnitTypeId.RAVEN,
-    UnitTypeId.BANSHEE,
-    UnitTypeId.BATTLECRUISER,
-    # Zerg
-    UnitTypeId.MUTALISK,
-    UnitTypeId.CORRUPTOR,
-    UnitTypeId.VIPER,
-    UnitTypeId.BROODLORD,
-    # Protoss
-    UnitTypeId.PHOENIX,
-    UnitTypeId.VOIDRAY,
-    UnitTypeId.ORACLE,
-    UnitTypeId.CARRIER,
-    UnitTypeId.TEMPEST,
-    UnitTypeId.MOTHERSHIP,
-    UnitTypeId.COLOSSUS,
-]
-
-anti_air: List[UnitTypeId] = [
-    # Terran
-    UnitTypeId.VIKING,
-    UnitTypeId.CYCLONE,
-    UnitTypeId.THORAP,
-    # Zerg
-    UnitTypeId.CORRUPTOR,
-    UnitTypeId.MUTALISK,
-    UnitTypeId.HYDRALISK,
-    # Protoss
-    UnitTypeId.PHOENIX,
-    UnitTypeId.STALKER,
-    UnitTypeId.TEMPEST,
-]
-
-massive_flyers: List[UnitTypeId] = [
-    UnitTypeId.BATTLECRUISER,
-    UnitTypeId.TEMPEST,
-    UnitTypeId.CARRIER,
-    UnitTypeId.MOTHERSHIP,
-    UnitTypeId.BROODLORD,
-]
-
-priority_targets: List[UnitTypeId] = [
-    UnitTypeId.LURKERMPBURROWED,
-    UnitTypeId.SIEGETANKSIEGED,
-    UnitTypeId.BATTLECRUISER,
-    UnitTypeId.COLOSSUS,
-    UnitTypeId.DISRUPTORPHASED,
-    UnitTypeId.CARRIER,
-    UnitTypeId.TEMPEST,
-]
-        
\ No newline at end of file
+# Built from the trait table, new types are declared in bot.utils.unit_traits
+townhalls: List[UnitTypeId] = types_with(UnitTrait.TOWNHALL)
+zerg_townhalls: List[UnitTypeId] = types_with(UnitTrait.ZERG_TOWNHALL)
+must_repair: List[UnitTypeId] = types_with(UnitTrait.MUST_REPAIR)
+defensive_structures: List[UnitTypeId] = types_with(UnitTrait.DEFENSIVE_STRUCTURE)
+worker_types: List[UnitTypeId] = types_with(UnitTrait.WORKER)
+tower_types: List[UnitTypeId] = types_with(UnitTrait.TOWER)
+menacing: List[UnitTypeId] = types_with(UnitTrait.MENACING)
+menacing_air: List[UnitTypeId] = types_with(UnitTrait.MENACING_AIR)
+dont_attack: List[UnitTypeId] = types_with(UnitTrait.DONT_ATTACK)
+add_ons: List[UnitTypeId] = types_with(UnitTrait.ADD_ON)
+reactors: List[UnitTypeId] = types_with(UnitTrait.REACTOR)
+techlabs: List[UnitTypeId] = types_with(UnitTrait.TECHLAB)
+bio: List[UnitTypeId] = types_with(UnitTrait.BIO)
+bio_stimmable: List[UnitTypeId] = types_with(UnitTrait.BIO_STIMMABLE)
+scouting_units: List[UnitTypeId] = types_with(UnitTrait.SCOUTING_UNIT)
+droppable_units: List[UnitTypeId] = types_with(UnitTrait.DROPPABLE)
+building_priorities: List[UnitTypeId] = types_with(UnitTrait.BUILDING_PRIORITY)
+burrowed_units: List[UnitTypeId] = types_with(UnitTrait.BURROWED)
+cloaked_units: List[UnitTypeId] = types_with(UnitTrait.CLOAKED)
+friendly_fire: List[UnitTypeId] = types_with(UnitTrait.FRIENDLY_FIRE)
+build_order_structures: List[UnitTypeId] = types_with(UnitTrait.BUILD_ORDER_STRUCTURE)
+creep: List[UnitTypeId] = types_with(UnitTrait.CREEP)
+production: List[UnitTypeId] = types_with(UnitTrait.PRODUCTION)
+enemy_production: List[UnitTypeId] = types_with(UnitTrait.ENEMY_PRODUCTION)
+production_flying: List[UnitTypeId] = types_with(UnitTrait.PRODUCTION_FLYING)
+important_buildings: List[UnitTypeId] = types_with(UnitTrait.IMPORTANT_BUILDING)
+flying_units: List[UnitTypeId] = types_with(UnitTrait.FLYING)
+anti_air: List[UnitTypeId] = types_with(UnitTrait.ANTI_AIR)
+massive_flyers: List[UnitTypeId] = types_with(UnitTrait.MASSIVE_FLYER)
+priority_targets: List[UnitTypeId] = types_with(UnitTrait.PRIORITY_TARGET)
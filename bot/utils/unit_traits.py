@@ -0,0 +1,484 @@
+from enum import IntFlag
+from typing import Dict, List
+
+import numpy as np
+
+from sc2.ids.unit_typeid import UnitTypeId
+
+
+class UnitTrait(IntFlag):
+    """
+    Categories of unit types, a type can have several traits.
+    The lists of bot.utils.unit_tags are built from this table.
+    """
+    TOWNHALL = 1 << 0
+    ZERG_TOWNHALL = 1 << 1
+    MUST_REPAIR = 1 << 2
+    DEFENSIVE_STRUCTURE = 1 << 3
+    WORKER = 1 << 4
+    TOWER = 1 << 5
+    MENACING = 1 << 6
+    MENACING_AIR = 1 << 7
+    DONT_ATTACK = 1 << 8
+    ADD_ON = 1 << 9
+    REACTOR = 1 << 10
+    TECHLAB = 1 << 11
+    BIO = 1 << 12
+    BIO_STIMMABLE = 1 << 13
+    SCOUTING_UNIT = 1 << 14
+    DROPPABLE = 1 << 15
+    BUILDING_PRIORITY = 1 << 16
+    BURROWED = 1 << 17
+    CLOAKED = 1 << 18
+    FRIENDLY_FIRE = 1 << 19
+    BUILD_ORDER_STRUCTURE = 1 << 20
+    CREEP = 1 << 21
+    PRODUCTION = 1 << 22
+    ENEMY_PRODUCTION = 1 << 23
+    PRODUCTION_FLYING = 1 << 24
+    IMPORTANT_BUILDING = 1 << 25
+    FLYING = 1 << 26
+    ANTI_AIR = 1 << 27
+    MASSIVE_FLYER = 1 << 28
+    PRIORITY_TARGET = 1 << 29
+
+
+trait_types: Dict[UnitTrait, List[UnitTypeId]] = {
+    UnitTrait.TOWNHALL: [
+        UnitTypeId.COMMANDCENTER,
+        UnitTypeId.COMMANDCENTERFLYING,
+        UnitTypeId.ORBITALCOMMAND,
+        UnitTypeId.ORBITALCOMMANDFLYING,
+        UnitTypeId.PLANETARYFORTRESS,
+        UnitTypeId.HATCHERY,
+        UnitTypeId.LAIR,
+        UnitTypeId.HIVE,
+        UnitTypeId.NEXUS,
+    ],
+    UnitTrait.ZERG_TOWNHALL: [
+        UnitTypeId.HATCHERY,
+        UnitTypeId.LAIR,
+        UnitTypeId.HIVE,
+    ],
+    UnitTrait.MUST_REPAIR: [
+        UnitTypeId.PLANETARYFORTRESS,
+        UnitTypeId.ORBITALCOMMAND,
+        UnitTypeId.MISSILETURRET,
+        UnitTypeId.BUNKER,
+        UnitTypeId.SUPPLYDEPOT,
+    ],
+    UnitTrait.DEFENSIVE_STRUCTURE: [
+        UnitTypeId.PLANETARYFORTRESS,
+        UnitTypeId.MISSILETURRET,
+        UnitTypeId.BUNKER,
+    ],
+    UnitTrait.WORKER: [
+        UnitTypeId.SCV,
+        UnitTypeId.PROBE,
+        UnitTypeId.DRONE,
+        UnitTypeId.MULE,
+    ],
+    UnitTrait.TOWER: [
+        UnitTypeId.PHOTONCANNON,
+        UnitTypeId.SHIELDBATTERY,
+        UnitTypeId.BUNKER,
+        UnitTypeId.PLANETARYFORTRESS,
+        UnitTypeId.SPINECRAWLER,
+        UnitTypeId.SPORECRAWLER,
+        UnitTypeId.MISSILETURRET,
+        UnitTypeId.NYDUSCANAL,
+        UnitTypeId.AUTOTURRET,
+    ],
+    UnitTrait.MENACING: [
+        UnitTypeId.WIDOWMINE,
+        UnitTypeId.WIDOWMINEBURROWED,
+        UnitTypeId.MEDIVAC,
+        UnitTypeId.RAVEN,
+        UnitTypeId.OVERLORDTRANSPORT,
+        UnitTypeId.BANELING,
+        UnitTypeId.BANELINGCOCOON,
+        UnitTypeId.BANELINGBURROWED,
+        UnitTypeId.ZERGLINGBURROWED,
+        UnitTypeId.ROACHBURROWED,
+        UnitTypeId.RAVAGERCOCOON,
+        UnitTypeId.LURKERMPEGG,
+        UnitTypeId.INFESTOR,
+        UnitTypeId.INFESTORBURROWED,
+        UnitTypeId.SWARMHOSTMP,
+        UnitTypeId.SWARMHOSTBURROWEDMP,
+        UnitTypeId.LOCUSTMPFLYING,
+        UnitTypeId.LURKERMP,
+        UnitTypeId.VIPER,
+        UnitTypeId.CARRIER,
+        UnitTypeId.DISRUPTORPHASED,
+        UnitTypeId.WARPPRISM,
+    ],
+    UnitTrait.MENACING_AIR: [
+        UnitTypeId.WIDOWMINE,
+        UnitTypeId.WIDOWMINEBURROWED,
+        UnitTypeId.RAVEN,
+        UnitTypeId.INFESTOR,
+        UnitTypeId.INFESTORBURROWED,
+        UnitTypeId.CARRIER,
+    ],
+    UnitTrait.DONT_ATTACK: [
+        UnitTypeId.EGG,
+        UnitTypeId.LARVA,
+        UnitTypeId.INTERCEPTOR,
+    ],
+    UnitTrait.ADD_ON: [
+        UnitTypeId.BARRACKSREACTOR,
+        UnitTypeId.BARRACKSTECHLAB,
+        UnitTypeId.FACTORYREACTOR,
+        UnitTypeId.FACTORYTECHLAB,
+        UnitTypeId.STARPORTREACTOR,
+        UnitTypeId.STARPORTTECHLAB,
+        UnitTypeId.REACTOR,
+        UnitTypeId.TECHLAB,
+        UnitTypeId.TECHREACTOR,
+    ],
+    UnitTrait.REACTOR: [
+        UnitTypeId.BARRACKSREACTOR,
+        UnitTypeId.FACTORYREACTOR,
+        UnitTypeId.STARPORTREACTOR,
+        UnitTypeId.REACTOR,
+    ],
+    UnitTrait.TECHLAB: [
+        UnitTypeId.BARRACKSTECHLAB,
+        UnitTypeId.FACTORYTECHLAB,
+        UnitTypeId.STARPORTTECHLAB,
+        UnitTypeId.TECHLAB,
+    ],
+    UnitTrait.BIO: [
+        UnitTypeId.REAPER,
+        UnitTypeId.MARINE,
+        UnitTypeId.MARAUDER,
+        UnitTypeId.GHOST,
+    ],
+    UnitTrait.BIO_STIMMABLE: [
+        UnitTypeId.MARINE,
+        UnitTypeId.MARAUDER,
+    ],
+    UnitTrait.SCOUTING_UNIT: [
+        UnitTypeId.REAPER,
+        UnitTypeId.HELLION,
+        UnitTypeId.BANSHEE,
+    ],
+    UnitTrait.DROPPABLE: [
+        UnitTypeId.MARINE,
+        UnitTypeId.MARAUDER,
+        UnitTypeId.HELLION,
+        UnitTypeId.HELLIONTANK,
+        # UnitTypeId.CYCLONE,
+        UnitTypeId.WIDOWMINE,
+    ],
+    UnitTrait.BUILDING_PRIORITY: [
+        UnitTypeId.COMMANDCENTER,
+        UnitTypeId.ORBITALCOMMAND,
+        UnitTypeId.PLANETARYFORTRESS,
+        UnitTypeId.HATCHERY,
+        UnitTypeId.LAIR,
+        UnitTypeId.HIVE,
+        UnitTypeId.NEXUS,
+        UnitTypeId.PYLON,
+        UnitTypeId.ENGINEERINGBAY,
+        UnitTypeId.EVOLUTIONCHAMBER,
+        UnitTypeId.FORGE,
+    ],
+    UnitTrait.BURROWED: [
+        UnitTypeId.QUEENBURROWED,
+        UnitTypeId.DRONEBURROWED,
+        UnitTypeId.ZERGLINGBURROWED,
+        UnitTypeId.BANELINGBURROWED,
+        UnitTypeId.ROACHBURROWED,
+        UnitTypeId.RAVAGERBURROWED,
+        UnitTypeId.HYDRALISKBURROWED,
+        UnitTypeId.LURKERMP,
+        UnitTypeId.LURKERMPBURROWED,
+        UnitTypeId.INFESTORBURROWED,
+        UnitTypeId.SWARMHOSTBURROWEDMP,
+        UnitTypeId.ULTRALISKBURROWED,
+    ],
+    UnitTrait.CLOAKED: [
+        UnitTypeId.GHOST,
+        # This one is visible
+        # UnitTypeId.WIDOWMINE,
+        UnitTypeId.WIDOWMINEBURROWED,
+        UnitTypeId.BANSHEE,
+        # These shouldn't trigger detection on their own
+        # UnitTypeId.OBSERVER,
+        # UnitTypeId.OBSERVERSIEGEMODE,
+        UnitTypeId.DARKTEMPLAR,
+        UnitTypeId.MOTHERSHIP,
+    ],
+    UnitTrait.FRIENDLY_FIRE: [
+        UnitTypeId.WIDOWMINE,
+        UnitTypeId.SIEGETANK,
+    ],
+    UnitTrait.BUILD_ORDER_STRUCTURE: [
+        UnitTypeId.REFINERY,
+        UnitTypeId.COMMANDCENTER,
+        UnitTypeId.BARRACKS,
+        UnitTypeId.FACTORY,
+        UnitTypeId.STARPORT,
+        UnitTypeId.ENGINEERINGBAY,
+        UnitTypeId.ARMORY,
+        UnitTypeId.BARRACKSTECHLAB,
+        UnitTypeId.BARRACKSREACTOR,
+        UnitTypeId.FACTORYREACTOR,
+    ],
+    UnitTrait.CREEP: [
+        UnitTypeId.CREEPTUMOR,
+        UnitTypeId.CREEPTUMORQUEEN,
+        UnitTypeId.CREEPTUMORBURROWED,
+    ],
+    UnitTrait.PRODUCTION: [
+        UnitTypeId.BARRACKS,
+        UnitTypeId.FACTORY,
+        UnitTypeId.STARPORT,
+    ],
+    UnitTrait.ENEMY_PRODUCTION: [
+        # Terran
+        UnitTypeId.BARRACKS,
+        UnitTypeId.FACTORY,
+        UnitTypeId.STARPORT,
+        # Protoss
+        UnitTypeId.GATEWAY,
+        UnitTypeId.WARPGATE,
+        UnitTypeId.ROBOTICSFACILITY,
+        UnitTypeId.STARGATE,
+    ],
+    UnitTrait.PRODUCTION_FLYING: [
+        UnitTypeId.BARRACKSFLYING,
+        UnitTypeId.FACTORYFLYING,
+        UnitTypeId.STARPORTFLYING,
+    ],
+    UnitTrait.IMPORTANT_BUILDING: [
+        UnitTypeId.COMMANDCENTER,
+        UnitTypeId.BUNKER,
+        UnitTypeId.SUPPLYDEPOT,
+    ],
+    UnitTrait.FLYING: [
+        # Terran
+        UnitTypeId.VIKING,
+        UnitTypeId.MEDIVAC,
+        UnitTypeId.LIBERATOR,
+        UnitTypeId.RAVEN,
+        UnitTypeId.BANSHEE,
+        UnitTypeId.BATTLECRUISER,
+        # Zerg
+        UnitTypeId.MUTALISK,
+        UnitTypeId.CORRUPTOR,
+        UnitTypeId.VIPER,
+        UnitTypeId.BROODLORD,
+        # Protoss
+        UnitTypeId.PHOENIX,
+        UnitTypeId.VOIDRAY,
+        UnitTypeId.ORACLE,
+        UnitTypeId.CARRIER,
+        UnitTypeId.TEMPEST,
+        UnitTypeId.MOTHERSHIP,
+        UnitTypeId.COLOSSUS,
+    ],
+    UnitTrait.ANTI_AIR: [
+        # Terran
+        UnitTypeId.VIKING,
+        UnitTypeId.CYCLONE,
+        UnitTypeId.THORAP,
+        # Zerg
+        UnitTypeId.CORRUPTOR,
+        UnitTypeId.MUTALISK,
+        UnitTypeId.HYDRALISK,
+        # Protoss
+        UnitTypeId.PHOENIX,
+        UnitTypeId.STALKER,
+        UnitTypeId.TEMPEST,
+    ],
+    UnitTrait.MASSIVE_FLYER: [
+        UnitTypeId.BATTLECRUISER,
+        UnitTypeId.TEMPEST,
+        UnitTypeId.CARRIER,
+        UnitTypeId.MOTHERSHIP,
+        UnitTypeId.BROODLORD,
+    ],
+    UnitTrait.PRIORITY_TARGET: [
+        UnitTypeId.LURKERMPBURROWED,
+        UnitTypeId.SIEGETANKSIEGED,
+        UnitTypeId.BATTLECRUISER,
+        UnitTypeId.COLOSSUS,
+        UnitTypeId.DISRUPTORPHASED,
+        UnitTypeId.CARRIER,
+        UnitTypeId.TEMPEST,
+    ],
+}
+
+supply: Dict[UnitTypeId, float] = {}
+
+# Terran Units
+# creeps
+supply[UnitTypeId.MULE] = 0
+supply[UnitTypeId.AUTOTURRET] = 2
+supply[UnitTypeId.MISSILETURRET] = 0
+supply[UnitTypeId.BUNKER] = 8
+supply[UnitTypeId.PLANETARYFORTRESS] = 16
+supply[UnitTypeId.NUKE] = 50
+# Tier 1
+supply[UnitTypeId.SCV] = 1
+supply[UnitTypeId.MARINE] = 1
+supply[UnitTypeId.REAPER] = 1
+supply[UnitTypeId.MARAUDER] = 2
+supply[UnitTypeId.HELLION] = 2
+supply[UnitTypeId.HELLIONTANK] = 2
+supply[UnitTypeId.WIDOWMINE] = 2
+supply[UnitTypeId.WIDOWMINEBURROWED] = 2
+# Tier 2
+supply[UnitTypeId.SIEGETANK] = 3
+supply[UnitTypeId.SIEGETANKSIEGED] = 5
+supply[UnitTypeId.CYCLONE] = 3
+supply[UnitTypeId.MEDIVAC] = 2
+supply[UnitTypeId.VIKING] = 2
+supply[UnitTypeId.VIKINGFIGHTER] = 2
+supply[UnitTypeId.VIKINGASSAULT] = 2
+supply[UnitTypeId.BANSHEE] = 3
+supply[UnitTypeId.RAVEN] = 2
+supply[UnitTypeId.LIBERATOR] = 3
+supply[UnitTypeId.LIBERATORAG] = 5
+# Tier 3
+supply[UnitTypeId.GHOST] = 3
+supply[UnitTypeId.THOR] = 6
+supply[UnitTypeId.THORAP] = 6
+supply[UnitTypeId.BATTLECRUISER] = 6
+
+
+# Zerg units
+# creeps
+supply[UnitTypeId.EGG] = 0
+supply[UnitTypeId.LARVA] = 0
+supply[UnitTypeId.BROODLING] = 0.5
+supply[UnitTypeId.SLAYNSWARMHOSTSPAWNFLYER] = 0
+supply[UnitTypeId.LOCUSTMPFLYING] = 0
+supply[UnitTypeId.LOCUSTMP] = 2
+supply[UnitTypeId.CHANGELING] = 0
+supply[UnitTypeId.CHANGELINGMARINE] = 0
+supply[UnitTypeId.CHANGELINGMARINESHIELD] = 0
+supply[UnitTypeId.CHANGELINGZEALOT] = 0
+supply[UnitTypeId.CHANGELINGZERGLING] = 0
+supply[UnitTypeId.CHANGELINGZERGLINGWINGS] = 0
+supply[UnitTypeId.SPORECRAWLER] = 0
+supply[UnitTypeId.SPINECRAWLER] = 3
+# Tier 1
+supply[UnitTypeId.OVERLORD] = 0
+supply[UnitTypeId.OVERSEER] = 0
+supply[UnitTypeId.OVERLORDCOCOON] = 0
+supply[UnitTypeId.OVERLORDTRANSPORT] = 0
+supply[UnitTypeId.TRANSPORTOVERLORDCOCOON] = 0
+supply[UnitTypeId.DRONE] = 1
+supply[UnitTypeId.DRONEBURROWED] = 1
+supply[UnitTypeId.ZERGLING] = 0.5
+supply[UnitTypeId.ZERGLINGBURROWED] = 0.5
+supply[UnitTypeId.BANELING] = 0.5
+supply[UnitTypeId.BANELINGBURROWED] = 0.5
+supply[UnitTypeId.BANELINGCOCOON] = 0
+supply[UnitTypeId.QUEEN] = 2
+supply[UnitTypeId.QUEENBURROWED] = 2
+supply[UnitTypeId.ROACH] = 2
+supply[UnitTypeId.ROACHBURROWED] = 2
+supply[UnitTypeId.RAVAGER] = 3
+supply[UnitTypeId.RAVAGERBURROWED] = 3
+supply[UnitTypeId.RAVAGERCOCOON] = 0
+# Tier 2
+supply[UnitTypeId.HYDRALISK] = 2
+supply[UnitTypeId.HYDRALISKBURROWED] = 2
+supply[UnitTypeId.LURKER] = 3
+supply[UnitTypeId.LURKERMP] = 3
+supply[UnitTypeId.LURKERMPBURROWED] = 3
+supply[UnitTypeId.LURKERBURROWED] = 3
+supply[UnitTypeId.LURKEREGG] = 3
+supply[UnitTypeId.LURKERMPEGG] = 0
+supply[UnitTypeId.INFESTOR] = 2
+supply[UnitTypeId.INFESTORBURROWED] = 2
+supply[UnitTypeId.SWARMHOSTMP] = 3
+supply[UnitTypeId.SWARMHOSTBURROWEDMP] = 3
+supply[UnitTypeId.MUTALISK] = 2
+supply[UnitTypeId.CORRUPTOR] = 2
+# Tier 3
+supply[UnitTypeId.BROODLORDEGG] = 0
+supply[UnitTypeId.BROODLORD] = 4
+supply[UnitTypeId.BROODLORDCOCOON] = 0
+supply[UnitTypeId.VIPER] = 3
+supply[UnitTypeId.ULTRALISK] = 6
+supply[UnitTypeId.ULTRALISKBURROWED] = 6
+
+
+# Protoss Units
+# creeps
+supply[UnitTypeId.ADEPTPHASESHIFT] = 0
+supply[UnitTypeId.INTERCEPTOR] = 1
+supply[UnitTypeId.PHOTONCANNON] = 3
+
+# Tier 1
+supply[UnitTypeId.PROBE] = 1
+supply[UnitTypeId.ZEALOT] = 2
+supply[UnitTypeId.STALKER] = 3
+supply[UnitTypeId.SENTRY] = 2
+supply[UnitTypeId.ADEPT] = 2
+# Tier 2
+supply[UnitTypeId.HIGHTEMPLAR] = 2
+supply[UnitTypeId.DARKTEMPLAR] = 2
+supply[UnitTypeId.ARCHON] = 4
+supply[UnitTypeId.OBSERVER] = 0
+supply[UnitTypeId.OBSERVERSIEGEMODE] = 0
+supply[UnitTypeId.WARPPRISM] = 2
+supply[UnitTypeId.WARPPRISMPHASING] = 2
+supply[UnitTypeId.IMMORTAL] = 4
+supply[UnitTypeId.PHOENIX] = 2
+supply[UnitTypeId.ORACLE] = 3
+supply[UnitTypeId.VOIDRAY] = 4
+# Tier 3
+supply[UnitTypeId.DISRUPTOR] = 4
+supply[UnitTypeId.DISRUPTORPHASED] = 4
+supply[UnitTypeId.COLOSSUS] = 6
+supply[UnitTypeId.TEMPEST] = 4
+supply[UnitTypeId.CARRIER] = 6
+supply[UnitTypeId.MOTHERSHIP] = 8
+
+
+TABLE_SIZE: int = max(type_id.value for type_id in UnitTypeId) + 1
+
+# Bitmask of the traits of each unit type, indexed by UnitTypeId value
+TRAITS: np.ndarray = np.zeros(TABLE_SIZE, dtype=np.uint64)
+for trait, types in trait_types.items():
+    for type_id in types:
+        TRAITS[type_id.value] |= np.uint64(trait)
+# Supply of each unit type, indexed by UnitTypeId value
+SUPPLY: np.ndarray = np.zeros(TABLE_SIZE, dtype=np.float32)
+for type_id, value in supply.items():
+    SUPPLY[type_id.value] = value
+
+# Python copies for scalar lookups, indexing a list is faster than indexing a numpy array
+_traits: List[int] = [int(value) for value in TRAITS]
+_supply: List[float] = [0] * TABLE_SIZE
+for type_id, value in supply.items():
+    _supply[type_id.value] = value
+
+
+def has_trait(type_id: UnitTypeId, trait: UnitTrait) -> bool:
+    """ True if the unit type has any of the given traits. """
+    # _value_ is a plain attribute, much cheaper than the enum 'value' property and the IntFlag operators
+    return (_traits[type_id._value_] & trait._value_) != 0
+
+
+def type_supply(type_id: UnitTypeId) -> float:
+    """ Supply cost of the unit type, 0 for types without a declared supply. """
+    return _supply[type_id._value_]
+
+
+def trait_mask(type_ids: np.ndarray, trait: UnitTrait) -> np.ndarray:
+    """ Mask of the unit type ids (array of UnitTypeId values) that have any of the given traits. """
+    known: np.ndarray = type_ids < TABLE_SIZE
+    return known & ((TRAITS[np.where(known, type_ids, 0)] & np.uint64(trait)) != 0)
+
+
+def types_with(trait: UnitTrait) -> List[UnitTypeId]:
+    """ Unit types of a trait, in the order they were declared. """
+    return list(trait_types[trait])
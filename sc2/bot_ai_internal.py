@@ -33,8 +33,10 @@ from sc2.ids.unit_typeid import UnitTypeId
 from sc2.ids.upgrade_id import UpgradeId
 from sc2.pixel_map import PixelMap
 from sc2.position import Point2, _PointLike
+from sc2.step_profiler import StepProfiler
 from sc2.unit import Unit
 from sc2.unit_command import UnitCommand
+from sc2.unit_snapshot import UnitSnapshot, UnitTypeColumns
 from sc2.units import Units
 
 with warnings.catch_warnings():
@@ -69,6 +71,18 @@ class BotAIInternal(ABC):
         # Select if the Unit.command should return UnitCommand objects. Set this to True if your bot uses 'unit(ability, target)'
         if not hasattr(self, "unit_command_uses_self_do"):
             self.unit_command_uses_self_do: bool = False
+        # Amount of game loops between two RequestGameInfo calls used to refresh the pathing grid
+        # 1 requests it every step, higher values reuse the last pathing grid patched from structure footprints
+        # The grid is also requested when structures, minerals or destructables appear or disappear, or on request_game_info_refresh()
+        if not hasattr(self, "game_info_refresh_interval"):
+            self.game_info_refresh_interval: int = 1
+        # Send actions, debug drawings, step and the next observation in a single round trip (only used when realtime=False)
+        if not hasattr(self, "pipelined_steps"):
+            self.pipelined_steps: bool = False
+        # Time the sections of each step (observation, _prepare_step, on_step, ...) in self.profiler
+        if not hasattr(self, "profile_steps"):
+            self.profile_steps: bool = False
+        self.profiler: StepProfiler = StepProfiler(enabled=self.profile_steps)
         # This value will be set to True by main.py in self._prepare_start if game is played in realtime (if true, the bot will have limited time per step)
         self.realtime: bool = False
         self.base_build: int = -1
@@ -91,6 +105,7 @@ class BotAIInternal(ABC):
         self.placeholders: Units = Units([], self)
         self.techlab_tags: set[int] = set()
         self.reactor_tags: set[int] = set()
+        self._unit_type_columns: UnitTypeColumns | None = None
         self.minerals: int = 50
         self.vespene: int = 0
         self.supply_army: float = 0
@@ -125,6 +140,12 @@ class BotAIInternal(ABC):
         self._last_step_step_time: float = 0
         self._total_time_in_on_step: float = 0
         self._total_steps_iterations: int = 0
+        self._game_info_requests: int = 0
+        self._game_info_game_loop: int = -1
+        self._game_info_refresh_requested: bool = False
+        self._base_pathing_grid: np.ndarray | None = None
+        self._pathing_footprints: dict[int, tuple[Point2, float] | None] = {}
+        self._pathing_blocker_tags: frozenset[int] = frozenset()
         # Internally used to keep track which units received an action in this frame, so that self.train() function does not give the same larva two orders - cleared every frame
         self.unit_tags_received_action: set[int] = set()
 
@@ -657,15 +678,13 @@ class BotAIInternal(ABC):
         self._time_before_step: float = time.perf_counter()
 
     @final
-    def _prepare_step(self: BotAI, state: GameState, proto_game_info: sc_pb.Response) -> None:
+    def _prepare_step(self: BotAI, state: GameState, proto_game_info: sc_pb.Response | None = None) -> None:
         """
         :param state:
-        :param proto_game_info:
+        :param proto_game_info: if None, the last pathing grid is reused and patched from structure footprints
         """
         # Set attributes from new state before on_step."""
         self.state = state  # See game_state.py
-        # update pathing grid, which unfortunately is in GameInfo instead of GameState
-        self.game_info.pathing_grid = PixelMap(proto_game_info.game_info.start_raw.pathing_grid, in_bits=True)
         # Required for events, needs to be before self.units are initialized so the old units are stored
         self._units_previous_map: dict[int, Unit] = {unit.tag: unit for unit in self.units}
         self._structures_previous_map: dict[int, Unit] = {structure.tag: structure for structure in self.structures}
@@ -676,6 +695,11 @@ class BotAIInternal(ABC):
         self._all_units_previous_map: dict[int, Unit] = {unit.tag: unit for unit in self.all_units}
 
         self._prepare_units()
+        # update pathing grid, which unfortunately is in GameInfo instead of GameState
+        if proto_game_info is not None:
+            self._update_pathing_grid(proto_game_info)
+        elif self._base_pathing_grid is not None:
+            self._patch_pathing_grid()
         self.minerals: int = state.common.minerals
         self.vespene: int = state.common.vespene
         self.supply_army: int = state.common.food_army
@@ -795,16 +819,95 @@ class BotAIInternal(ABC):
                     else:
                         self.enemy_units.append(unit_obj)
 
+        # Columnar copy of all units for vectorized filters, row i is self.all_units[i]
+        if self._unit_type_columns is None:
+            self._unit_type_columns = UnitTypeColumns(self.game_data)
+        self.unit_snapshot: UnitSnapshot = UnitSnapshot(
+            [unit._proto for unit in self.all_units], self.all_units, self._unit_type_columns
+        )
+
         # Force distance calculation and caching on all units using scipy pdist or cdist
         if self.distance_calculation_method == 1:
             _ = self._pdist
         elif self.distance_calculation_method in {2, 3}:
             _ = self._cdist
 
+    def request_game_info_refresh(self) -> None:
+        """Request an up to date pathing grid from the game before the next step.
+        Only useful if 'self.game_info_refresh_interval' is greater than 1."""
+        self._game_info_refresh_requested = True
+
     @final
-    async def _after_step(self) -> int:
-        """Executed by main.py after each on_step function."""
-        # Keep track of the bot on_step duration
+    def _game_info_outdated(self) -> bool:
+        """Returns True if the pathing grid should be requested from the game this step."""
+        if (
+            self.game_info_refresh_interval <= 1
+            or self._base_pathing_grid is None
+            or self._game_info_refresh_requested
+            or self.state.game_loop - self._game_info_game_loop >= self.game_info_refresh_interval
+        ):
+            return True
+        return self._current_pathing_blocker_tags() != self._pathing_blocker_tags
+
+    @final
+    def _current_pathing_blocker_tags(self) -> frozenset[int]:
+        """Tags of everything that blocks pathing and can only be created or destroyed."""
+        return frozenset(
+            unit.tag
+            for unit in itertools.chain(self.structures, self.enemy_structures, self.mineral_field, self.destructables)
+        )
+
+    @final
+    @staticmethod
+    def _structure_footprint(structure: Unit) -> tuple[Point2, float] | None:
+        """Center and half size of the tiles a structure removes from the pathing grid, None if it doesn't block."""
+        if structure.is_flying or structure.type_id == UnitTypeId.SUPPLYDEPOTLOWERED:
+            return None
+        if not structure.footprint_radius:
+            return None
+        return structure.position, structure.footprint_radius
+
+    @final
+    def _update_pathing_grid(self, proto_game_info: sc_pb.Response) -> None:
+        """Set the pathing grid from a RequestGameInfo response and remember the structures it was made with."""
+        self.game_info.pathing_grid = PixelMap(proto_game_info.game_info.start_raw.pathing_grid, in_bits=True)
+        self._game_info_requests += 1
+        self._game_info_game_loop = self.state.game_loop
+        self._game_info_refresh_requested = False
+        if self.game_info_refresh_interval <= 1:
+            return
+        self._base_pathing_grid = self.game_info.pathing_grid.data_numpy.copy()
+        self._pathing_footprints = {
+            structure.tag: self._structure_footprint(structure)
+            for structure in itertools.chain(self.structures, self.enemy_structures)
+        }
+        self._pathing_blocker_tags = self._current_pathing_blocker_tags()
+
+    @final
+    def _patch_pathing_grid(self) -> None:
+        """Rebuild the pathing grid from the last requested one, with the structures that lifted, landed, lowered or raised since."""
+        # pyrefly: ignore
+        grid: np.ndarray = self._base_pathing_grid.copy()
+        height, width = grid.shape
+        for structure in itertools.chain(self.structures, self.enemy_structures):
+            if structure.tag not in self._pathing_footprints:
+                continue
+            previous = self._pathing_footprints[structure.tag]
+            current = self._structure_footprint(structure)
+            if previous == current:
+                continue
+            for footprint, value in ((previous, 1), (current, 0)):
+                if footprint is None:
+                    continue
+                center, radius = footprint
+                x1, x2 = max(0, round(center.x - radius)), min(width, round(center.x + radius))
+                y1, y2 = max(0, round(center.y - radius)), min(height, round(center.y + radius))
+                grid[y1:y2, x1:x2] = value
+        self.game_info.pathing_grid.data_numpy = grid
+
+    @final
+    def _record_step_time(self) -> None:
+        """Keep track of the bot on_step duration"""
         self._time_after_step: float = time.perf_counter()
         step_duration = self._time_after_step - self._time_before_step
         self._min_step_time = min(step_duration, self._min_step_time)
@@ -812,6 +915,11 @@ class BotAIInternal(ABC):
         self._last_step_step_time = step_duration
         self._total_time_in_on_step += step_duration
         self._total_steps_iterations += 1
+
+    @final
+    async def _after_step(self) -> int:
+        """Executed by main.py after each on_step function."""
+        self._record_step_time()
         # Commit and clear bot actions
         if self.actions:
             await self._do_actions(self.actions)
@@ -823,6 +931,17 @@ class BotAIInternal(ABC):
 
         return self.state.game_loop
 
+    @final
+    async def _after_step_pipelined(self, game_info: bool = False) -> tuple[sc_pb.Response, sc_pb.Response | None]:
+        """Executed by main.py after each on_step function instead of '_after_step' when 'self.pipelined_steps' is True.
+        Sends the actions, the debug drawings, the step and the next observation requests in a single round trip.
+        Returns the next observation, and the game info response if 'game_info' is True."""
+        self._record_step_time()
+        actions: list[UnitCommand] = list(filter(self.prevent_double_actions, self.actions))
+        self.actions.clear()
+        self.unit_tags_received_action.clear()
+        return await self.client.step_pipelined(actions, game_info=game_info)
+
     @final
     async def _advance_steps(self: BotAI, steps: int) -> None:
         """Advances the game loop by amount of 'steps'. This function is meant to be used as a debugging and testing tool only.
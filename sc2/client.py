@@ -14,6 +14,7 @@ from s2clientprotocol import sc2api_pb2 as sc_pb
 from s2clientprotocol import spatial_pb2 as spatial_pb
 from sc2.action import combine_actions
 from sc2.data import ActionResult, ChatChannel, Race, Result, Status
+from sc2.debug_logging import debug_logging_enabled
 from sc2.game_data import AbilityData, GameData
 from sc2.game_info import GameInfo
 from sc2.ids.ability_id import AbilityId
@@ -143,6 +144,10 @@ class Client(Protocol):
             result = await self._execute(observation=sc_pb.RequestObservation(game_loop=game_loop))
         else:
             result = await self._execute(observation=sc_pb.RequestObservation())
+        return await self._process_observation(result)
+
+    async def _process_observation(self, result: sc_pb.Response) -> sc_pb.Response:
+        """Store the game result if the game ended and render the observation if requested."""
         assert result.HasField("observation")
 
         if not self.in_game or result.observation.player_result:
@@ -167,6 +172,47 @@ class Client(Protocol):
         step_size = step_size or self.game_step
         return await self._execute(step=sc_pb.RequestStep(count=step_size))
 
+    async def step_pipelined(
+        self, actions: list[UnitCommand], game_info: bool = False, step_size: int | None = None
+    ) -> tuple[sc_pb.Response, sc_pb.Response | None]:
+        """Send the actions, the debug drawings, the step and the next observation requests at once,
+        so a whole game step only costs a single round trip. Only for realtime=False.
+        Returns the next observation, and the game info response if 'game_info' is True.
+
+        :param actions:
+        :param game_info:
+        :param step_size:"""
+        requests: list[sc_pb.Request] = [
+            request for request in (self._action_request(actions), self._debug_request()) if request is not None
+        ]
+        requests.append(sc_pb.Request(step=sc_pb.RequestStep(count=step_size or self.game_step)))
+        requests.append(sc_pb.Request(observation=sc_pb.RequestObservation()))
+        if game_info:
+            requests.append(sc_pb.Request(game_info=sc_pb.RequestGameInfo()))
+
+        responses: list[sc_pb.Response] = await self._execute_pipelined(requests)
+        for request, response in zip(requests, responses):
+            request_type: str | None = request.WhichOneof("request")
+            if request_type == "action" and __debug__ and debug_logging_enabled():
+                failed = [ActionResult(result) for result in response.action.result if result != ActionResult.Success.value]
+                if failed:
+                    logger.debug(f"Failed actions: {failed}")
+            if not response.error:
+                continue
+            error = ProtocolError(f"{response.error}")
+            # The observation after the step that ended the game holds the game result
+            if request_type == "step" and error.is_game_over_error:
+                continue
+            # Failed actions and debug drawings don't stop the game, like in 'actions' and '_send_debug'
+            if request_type in {"action", "debug"}:
+                logger.warning(f"Pipelined {request_type} request failed: {error}")
+                continue
+            raise error
+
+        observation_index: int = -2 if game_info else -1
+        observation: sc_pb.Response = await self._process_observation(responses[observation_index])
+        return observation, responses[-1] if game_info else None
+
     async def get_game_data(self) -> GameData:
         result: sc_pb.Response = await self._execute(
             data=sc_pb.RequestData(ability_id=True, unit_type_id=True, upgrade_id=True, buff_id=True, effect_id=True)
@@ -212,12 +258,8 @@ class Client(Protocol):
 
         # On realtime=True, might get an error here: sc2.protocol.ProtocolError: ['Not in a game']
         try:
-            response = await self._execute(
-                action=sc_pb.RequestAction(
-                    # pyrefly: ignore
-                    actions=(sc_pb.Action(action_raw=action) for action in combine_actions(actions))
-                )
-            )
+            # pyrefly: ignore
+            response = await self._execute(action=self._action_request(actions).action)
         except ProtocolError:
             return []
         if return_successes:
@@ -226,6 +268,16 @@ class Client(Protocol):
             ActionResult(result) for result in response.action.result if ActionResult(result) != ActionResult.Success
         ]
 
+    def _action_request(self, actions: list[UnitCommand]) -> sc_pb.Request | None:
+        if not actions:
+            return None
+        return sc_pb.Request(
+            action=sc_pb.RequestAction(
+                # pyrefly: ignore
+                actions=(sc_pb.Action(action_raw=action) for action in combine_actions(actions))
+            )
+        )
+
     async def query_pathing(self, start: Unit | Point2 | Point3, end: Point2 | Point3) -> float | None:
         """Caution: returns "None" when path not found
         Try to combine queries with the function below because the pathing query is generally slow.
@@ -631,6 +683,17 @@ class Client(Protocol):
         """Sends the debug draw execution. This is run by main.py now automatically, if there is any items in the list. You do not need to run this manually any longer.
         Check examples/terran/ramp_wall.py for example drawing. Each draw request needs to be sent again in every single on_step iteration.
         """
+        request: sc_pb.Request | None = self._debug_request()
+        if request is None:
+            return
+        try:
+            await self._execute(debug=request.debug)
+        except ProtocolError:
+            return
+
+    def _debug_request(self) -> sc_pb.Request | None:
+        """Returns the debug draw request for this iteration, None if the drawings did not change, and clears the drawings."""
+        request: sc_pb.Request | None = None
         debug_hash = (
             sum(hash(item) for item in self._debug_texts),
             sum(hash(item) for item in self._debug_lines),
@@ -641,35 +704,26 @@ class Client(Protocol):
             if debug_hash != self._debug_hash_tuple_last_iteration:
                 # Something has changed, either more or less is to be drawn, or a position of a drawing changed (e.g. when drawing on a moving unit)
                 self._debug_hash_tuple_last_iteration = debug_hash
-                try:
-                    await self._execute(
-                        debug=sc_pb.RequestDebug(
-                            debug=[
-                                debug_pb.DebugCommand(
-                                    draw=debug_pb.DebugDraw(
-                                        # pyrefly: ignore
-                                        text=[text.to_proto() for text in self._debug_texts]
-                                        if self._debug_texts
-                                        else None,
-                                        # pyrefly: ignore
-                                        lines=[line.to_proto() for line in self._debug_lines]
-                                        if self._debug_lines
-                                        else None,
-                                        # pyrefly: ignore
-                                        boxes=[box.to_proto() for box in self._debug_boxes]
-                                        if self._debug_boxes
-                                        else None,
-                                        # pyrefly: ignore
-                                        spheres=[sphere.to_proto() for sphere in self._debug_spheres]
-                                        if self._debug_spheres
-                                        else None,
-                                    )
+                request = sc_pb.Request(
+                    debug=sc_pb.RequestDebug(
+                        debug=[
+                            debug_pb.DebugCommand(
+                                draw=debug_pb.DebugDraw(
+                                    # pyrefly: ignore
+                                    text=[text.to_proto() for text in self._debug_texts] if self._debug_texts else None,
+                                    # pyrefly: ignore
+                                    lines=[line.to_proto() for line in self._debug_lines] if self._debug_lines else None,
+                                    # pyrefly: ignore
+                                    boxes=[box.to_proto() for box in self._debug_boxes] if self._debug_boxes else None,
+                                    # pyrefly: ignore
+                                    spheres=[sphere.to_proto() for sphere in self._debug_spheres]
+                                    if self._debug_spheres
+                                    else None,
                                 )
-                            ]
-                        )
+                            )
+                        ]
                     )
-                except ProtocolError:
-                    return
+                )
             self._debug_draw_last_frame = True
             self._debug_texts.clear()
             self._debug_lines.clear()
@@ -678,7 +732,7 @@ class Client(Protocol):
         elif self._debug_draw_last_frame:
             # Clear drawing if we drew last frame but nothing to draw this frame
             self._debug_hash_tuple_last_iteration = (0, 0, 0, 0)
-            await self._execute(
+            request = sc_pb.Request(
                 debug=sc_pb.RequestDebug(
                     debug=[
                         # pyrefly: ignore
@@ -687,6 +741,7 @@ class Client(Protocol):
                 )
             )
             self._debug_draw_last_frame = False
+        return request
 
     async def debug_leave(self) -> None:
         await self._execute(debug=sc_pb.RequestDebug(debug=[debug_pb.DebugCommand(end_game=debug_pb.DebugEndGame())]))
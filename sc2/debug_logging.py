@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from loguru import logger
+
+DEBUG_LEVEL: int = logger.level("DEBUG").no
+
+
+def debug_logging_enabled() -> bool:
+    """
+    Returns True if at least one loguru handler accepts DEBUG messages.
+
+    Hot paths (protocol requests, game loop) guard their debug logs with
+    'if __debug__ and debug_logging_enabled():' so the message is only formatted when it is actually written,
+    and running python with -O removes the whole statement at compile time.
+    """
+    # loguru keeps the lowest level accepted by its handlers, if that ever changes the debug logs are kept
+    return getattr(getattr(logger, "_core", None), "min_level", 0) <= DEBUG_LEVEL
@@ -21,6 +21,7 @@ from sc2.bot_ai import BotAI
 from sc2.client import Client
 from sc2.controller import Controller
 from sc2.data import CreateGameError, Result, Status
+from sc2.debug_logging import debug_logging_enabled
 from sc2.game_state import GameState
 from sc2.maps import Map
 from sc2.observer_ai import ObserverAI
@@ -150,63 +151,139 @@ async def _play_game_ai(
     if result is not None:
         return result
 
-    async def run_bot_iteration(iteration: int):
-        nonlocal gs
-        logger.debug(f"Running AI step, it={iteration} {gs.game_loop / 22.4:.2f}s")
+    game_loop = AIGameLoop(client, player_id, ai, realtime, game_time_limit, gs)
+    for iteration in range(10**10):
+        result = await game_loop.step(iteration)
+        if result is not None:
+            return result
+    return Result.Undecided
+
+
+class AIGameLoop:
+    """The iterations of _play_game_ai after the first step, one call to 'step' per bot iteration.
+    Also steps the bot of the offline harness (test/offline_harness.py)."""
+
+    def __init__(
+        self, client: Client, player_id: int, ai: BotAI, realtime: bool, game_time_limit: int | None, gs: GameState
+    ) -> None:
+        self.client = client
+        self.player_id = player_id
+        self.ai = ai
+        self.realtime = realtime
+        self.game_time_limit = game_time_limit
+        self.gs = gs
+        # Actions, debug, step and the next observation are sent in one round trip, only used in realtime=False
+        self.pipelined: bool = ai.pipelined_steps and not realtime
+        self.next_state: sc_pb.Response | None = None
+        self.next_game_info: sc_pb.Response | None = None
+        # Only used in realtime=True
+        self.previous_state_observation = None
+
+    async def run_bot_iteration(self, iteration: int) -> None:
+        ai = self.ai
+        if __debug__ and debug_logging_enabled():
+            logger.debug(f"Running AI step, it={iteration} {self.gs.game_loop / 22.4:.2f}s")
         # Issue event like unit created or unit destroyed
-        await ai.issue_events()
+        with ai.profiler.section("issue_events"):
+            await ai.issue_events()
         # In on_step various errors can occur - log properly
         try:
-            await ai.on_step(iteration)
+            with ai.profiler.section("on_step"):
+                await ai.on_step(iteration)
         except (AttributeError,) as e:
             logger.exception(f"Caught exception: {e}")
             raise
         except Exception as e:
             logger.exception(f"Caught unknown exception: {e}")
             raise
-        await ai._after_step()
-        logger.debug("Running AI step: done")
-
-    # Only used in realtime=True
-    previous_state_observation = None
-    for iteration in range(10**10):
-        if realtime and gs:
+        if not self.pipelined:
+            with ai.profiler.section("after_step"):
+                await ai._after_step()
+        if __debug__ and debug_logging_enabled():
+            logger.debug("Running AI step: done")
+
+    async def step(self, iteration: int) -> Result | None:
+        """Runs one bot iteration, from the observation request to the game step.
+        Returns the result of the game once it's over, None otherwise."""
+        client, ai, player_id = self.client, self.ai, self.player_id
+        if self.realtime and self.gs:
             # On realtime=True, might get an error here: sc2.protocol.ProtocolError: ['Not in a game']
-            with suppress(ProtocolError):
-                requested_step = gs.game_loop + client.game_step
+            with suppress(ProtocolError), ai.profiler.section("observation"):
+                requested_step = self.gs.game_loop + client.game_step
                 state = await client.observation(requested_step)
                 # If the bot took too long in the previous observation, request another observation one frame after
                 if state.observation.observation.game_loop > requested_step:
                     logger.debug("Skipped a step in realtime=True")
-                    previous_state_observation = state.observation
+                    self.previous_state_observation = state.observation
                     state = await client.observation(state.observation.observation.game_loop + 1)
+        elif self.next_state is not None:
+            # Already received with the previous step, see _after_step_pipelined
+            state = self.next_state
+            self.next_state = None
         else:
-            state = await client.observation()
+            with ai.profiler.section("observation"):
+                state = await client.observation()
 
         # check game result every time we get the observation
         if client._game_result:
+            log_round_trips(client, iteration, self.gs)
             await ai.on_end(client._game_result[player_id])
             return client._game_result[player_id]
-        gs = GameState(state.observation, previous_state_observation)
-        previous_state_observation = None
-        logger.debug(f"Score: {gs.score.score}")
+        with ai.profiler.section("game_state"):
+            self.gs = GameState(state.observation, self.previous_state_observation)
+        self.previous_state_observation = None
+        if __debug__ and debug_logging_enabled():
+            logger.debug(f"Score: {self.gs.score.score}")
 
-        if game_time_limit and gs.game_loop / 22.4 > game_time_limit:
+        if self.game_time_limit and self.gs.game_loop / 22.4 > self.game_time_limit:
             await ai.on_end(Result.Tie)
             return Result.Tie
-        proto_game_info = await client._execute(game_info=sc_pb.RequestGameInfo())
-        ai._prepare_step(gs, proto_game_info)
+        with ai.profiler.section("prepare_step"):
+            if ai.game_info_refresh_interval <= 1:
+                if self.next_game_info is None:
+                    with ai.profiler.section("game_info"):
+                        proto_game_info = await client._execute(game_info=sc_pb.RequestGameInfo())
+                else:
+                    proto_game_info, self.next_game_info = self.next_game_info, None
+                ai._prepare_step(self.gs, proto_game_info)
+            else:
+                # Only request game info when the locally patched pathing grid may be wrong
+                ai._prepare_step(self.gs)
+                if ai._game_info_outdated():
+                    with ai.profiler.section("game_info"):
+                        proto_game_info = await client._execute(game_info=sc_pb.RequestGameInfo())
+                    ai._update_pathing_grid(proto_game_info)
 
-        await run_bot_iteration(iteration)  # Main bot loop
+        await self.run_bot_iteration(iteration)  # Main bot loop
 
-        if not realtime:
+        if not self.realtime:
             if not client.in_game:  # Client left (resigned) the game
+                if self.pipelined:
+                    await ai._after_step()
+                log_round_trips(client, iteration, self.gs)
                 await ai.on_end(client._game_result[player_id])
                 return client._game_result[player_id]
 
             # TODO: In bot vs bot, if the other bot ends the game, this bot gets stuck in requesting an observation when using main.py:run_multiple_games
-            await client.step()
-    return Result.Undecided
+            if self.pipelined:
+                # Actions, debug, step and the next observation in one round trip
+                with ai.profiler.section("after_step_pipelined"):
+                    self.next_state, self.next_game_info = await ai._after_step_pipelined(
+                        game_info=ai.game_info_refresh_interval <= 1
+                    )
+            else:
+                with ai.profiler.section("client.step"):
+                    await client.step()
+        return None
+
+
+def log_round_trips(client: Client, iteration: int, gs: GameState | None) -> None:
+    """Log the amount of websocket round trips per bot iteration and per game loop."""
+    game_loop: int = gs.game_loop if gs else 0
+    logger.info(
+        f"Round trips: {client.round_trips} in {iteration + 1} iterations ({client.round_trips / (iteration + 1):.2f}/iteration)"
+        f", {game_loop} game loops ({client.round_trips / max(game_loop, 1):.2f}/game loop)"
+    )
 
 
 async def _play_game(
@@ -284,12 +361,14 @@ async def _play_replay(client: Client, ai, realtime: bool = False, player_id: in
                     return client._game_result[player_id]
                 return client._game_result[player_id]
             gs = GameState(state.observation)
-            logger.debug(f"Score: {gs.score.score}")
+            if __debug__ and debug_logging_enabled():
+                logger.debug(f"Score: {gs.score.score}")
 
             proto_game_info = await client._execute(game_info=sc_pb.RequestGameInfo())
             ai._prepare_step(gs, proto_game_info)
 
-        logger.debug(f"Running AI step, it={iteration} {gs.game_loop * 0.725 * (1 / 16):.2f}s")
+        if __debug__ and debug_logging_enabled():
+            logger.debug(f"Running AI step, it={iteration} {gs.game_loop * 0.725 * (1 / 16):.2f}s")
 
         try:
             # Issue event like unit created or unit destroyed
@@ -314,7 +393,8 @@ async def _play_replay(client: Client, ai, realtime: bool = False, player_id: in
                 return Result.Defeat
             return Result.Defeat
 
-        logger.debug("Running AI step: done")
+        if __debug__ and debug_logging_enabled():
+            logger.debug("Running AI step: done")
 
         if not realtime and not client.in_game:  # Client left (resigned) the game
             await ai.on_end(Result.Victory)
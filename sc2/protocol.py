@@ -12,6 +12,7 @@ from loguru import logger
 from s2clientprotocol import sc2api_pb2 as sc_pb
 from s2clientprotocol.query_pb2 import RequestQuery
 from sc2.data import Status
+from sc2.debug_logging import debug_logging_enabled
 
 
 class ProtocolError(Exception):
@@ -34,16 +35,26 @@ class Protocol:
         self._ws: ClientWebSocketResponse = ws
         # pyre-fixme[11]
         self._status: Status | None = None
+        # Amount of times the client had to wait for the game to answer
+        self.round_trips: int = 0
 
-    async def __request(self, request: sc_pb.Request) -> sc_pb.Response:
-        logger.debug(f"Sending request: {request!r}")
+    async def __send(self, request: sc_pb.Request) -> None:
+        if __debug__ and debug_logging_enabled():
+            logger.debug(f"Sending request: {request!r}")
         try:
             await self._ws.send_bytes(request.SerializeToString())
         except TypeError as exc:
             logger.exception("Cannot send: Connection already closed.")
             raise ConnectionAlreadyClosedError("Connection already closed.") from exc
-        logger.debug("Request sent")
+        if __debug__ and debug_logging_enabled():
+            logger.debug("Request sent")
+
+    async def __request(self, request: sc_pb.Request) -> sc_pb.Response:
+        await self.__send(request)
+        self.round_trips += 1
+        return await self.__receive()
 
+    async def __receive(self) -> sc_pb.Response:
         response = sc_pb.Response()
         try:
             response_bytes = await self._ws.receive_bytes()
@@ -63,7 +74,8 @@ class Protocol:
             raise
 
         response.ParseFromString(response_bytes)
-        logger.debug("Response received")
+        if __debug__ and debug_logging_enabled():
+            logger.debug("Response received")
         return response
 
     @overload
@@ -114,18 +126,38 @@ class Protocol:
         assert len(kwargs) == 1, "Only one request allowed by the API"
 
         response: sc_pb.Response = await self.__request(sc_pb.Request(**kwargs))
-
-        new_status = Status(response.status)
-        if new_status != self._status:
-            logger.info(f"Client status changed to {new_status} (was {self._status})")
-        self._status = new_status
+        self._update_status(response)
 
         if response.error:
-            logger.debug(f"Response contained an error: {response.error}")
+            if __debug__ and debug_logging_enabled():
+                logger.debug(f"Response contained an error: {response.error}")
             raise ProtocolError(f"{response.error}")
 
         return response
 
+    async def _execute_pipelined(self, requests: list[sc_pb.Request]) -> list[sc_pb.Response]:
+        """Send all requests at once, then wait for their responses which the game answers in order.
+        This costs a single round trip. Errors are not raised, check 'response.error' of each response."""
+        for request in requests:
+            await self.__send(request)
+        self.round_trips += 1
+
+        responses: list[sc_pb.Response] = []
+        for _ in requests:
+            # Each response is parsed while the game still works on the next requests
+            response: sc_pb.Response = await self.__receive()
+            self._update_status(response)
+            if __debug__ and response.error and debug_logging_enabled():
+                logger.debug(f"Response contained an error: {response.error}")
+            responses.append(response)
+        return responses
+
+    def _update_status(self, response: sc_pb.Response) -> None:
+        new_status = Status(response.status)
+        if new_status != self._status:
+            logger.info(f"Client status changed to {new_status} (was {self._status})")
+        self._status = new_status
+
     async def ping(self):
         result = await self._execute(ping=sc_pb.RequestPing())
         return result
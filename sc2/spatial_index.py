@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+if TYPE_CHECKING:
+    from sc2.unit import Unit
+
+
+class SpatialIndex:
+    """KD-tree over the positions of a list of units, used by the Units radius and nearest neighbour queries.
+    Queries return indices into the indexed list, in ascending order for radius queries."""
+
+    # Radius queries are widened by this much so float rounding never drops a unit right on the border
+    EPSILON: float = 1e-6
+
+    def __init__(self, units: Sequence[Unit]) -> None:
+        self.positions: np.ndarray = np.array([unit.position_tuple for unit in units], dtype=np.float64).reshape(-1, 2)
+        self.radii: np.ndarray = np.array([unit.radius for unit in units], dtype=np.float64)
+        self.max_radius: float = float(self.radii.max(initial=0))
+        self.tree: cKDTree | None = cKDTree(self.positions) if units else None
+
+    def __len__(self) -> int:
+        return len(self.radii)
+
+    def query_radius(self, point: tuple[float, float], radius: float, include_radius: bool = False) -> np.ndarray:
+        """Indices of the units whose center is at most 'radius' away from point,
+        if include_radius is True the radius of each unit is added to 'radius'.
+
+        :param point:
+        :param radius:
+        :param include_radius:"""
+        if self.tree is None or radius < 0:
+            return np.empty(0, dtype=np.intp)
+        search_radius: float = radius + (self.max_radius if include_radius else 0) + self.EPSILON
+        candidates: np.ndarray = np.array(self.tree.query_ball_point(point, search_radius), dtype=np.intp)
+        if include_radius and candidates.size:
+            distances: np.ndarray = np.hypot(*(self.positions[candidates] - point).T)
+            candidates = candidates[distances <= radius + self.radii[candidates] + self.EPSILON]
+        candidates.sort()
+        return candidates
+
+    def query_nearest(self, point: tuple[float, float], n: int) -> np.ndarray:
+        """Indices of the n units closest to point, sorted by distance.
+
+        :param point:
+        :param n:"""
+        n = min(n, len(self))
+        if self.tree is None or n <= 0:
+            return np.empty(0, dtype=np.intp)
+        _, indices = self.tree.query(point, k=n)
+        return np.atleast_1d(indices).astype(np.intp)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+# Amount of samples each section keeps for its percentiles, about 6 minutes of game with game_step=4
+WINDOW: int = 2048
+
+
+class SectionStats:
+    """Durations of a profiled section in ms: totals over the whole game, percentiles over the last 'window' samples."""
+
+    __slots__ = ("samples", "count", "total", "max")
+
+    def __init__(self, window: int = WINDOW) -> None:
+        self.samples: list[float] = [0.0] * window
+        self.count: int = 0
+        self.total: float = 0
+        self.max: float = 0
+
+    def add(self, duration: float) -> None:
+        self.samples[self.count % len(self.samples)] = duration
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    @property
+    def last(self) -> float:
+        return self.samples[(self.count - 1) % len(self.samples)] if self.count else 0
+
+    def summary(self) -> dict[str, float]:
+        if self.count == 0:
+            return {"count": 0}
+        window: np.ndarray = np.array(self.samples[: min(self.count, len(self.samples))])
+        p50, p95, p99 = np.percentile(window, [50, 95, 99])
+        return {
+            "count": self.count,
+            "total_ms": self.total,
+            "mean_ms": self.total / self.count,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": self.max,
+        }
+
+
+class ProfiledSection:
+    """Context manager timing one run of a section, returned by StepProfiler.section."""
+
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler: StepProfiler, name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.profiler.start(self.name)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.profiler.stop()
+
+
+class DisabledSection:
+    """Context manager doing nothing, used when the profiler is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+DISABLED_SECTION: DisabledSection = DisabledSection()
+
+
+class StepProfiler:
+    """
+    Hierarchical timer of the bot steps. Sections opened inside another section are recorded under its path,
+    e.g. 'on_step/influence_maps.update':
+
+        with self.profiler.section("influence_maps.update"):
+            self.map.influence_maps.update()
+
+    Recording a section costs a couple of microseconds, so the profiler can stay enabled in ladder games.
+    """
+
+    def __init__(self, enabled: bool = True, window: int = WINDOW) -> None:
+        self.enabled: bool = enabled
+        self.window: int = window
+        self.sections: dict[str, SectionStats] = {}
+        self._stack: list[tuple[str, float]] = []
+
+    def section(self, name: str) -> ProfiledSection | DisabledSection:
+        if not self.enabled:
+            return DISABLED_SECTION
+        return ProfiledSection(self, name)
+
+    def start(self, name: str) -> None:
+        """Opens a section, for code that can't be wrapped in 'with self.section(name)'. Must be closed by stop."""
+        if not self.enabled:
+            return
+        path: str = f"{self._stack[-1][0]}/{name}" if self._stack else name
+        self._stack.append((path, perf_counter()))
+
+    def stop(self) -> None:
+        if not self.enabled:
+            return
+        path, start = self._stack.pop()
+        self.record(path, (perf_counter() - start) * 1000)
+
+    def record(self, path: str, duration: float) -> None:
+        """Adds a duration in ms measured by the caller."""
+        stats: SectionStats | None = self.sections.get(path)
+        if stats is None:
+            stats = self.sections[path] = SectionStats(self.window)
+        stats.add(duration)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Stats of every section, in the order they were first recorded."""
+        return {path: stats.summary() for path, stats in self.sections.items()}
+
+    def slowest(self, amount: int = 5, key: str = "p95_ms") -> list[tuple[str, dict[str, float]]]:
+        """The 'amount' sections with the highest 'key' stat."""
+        summaries: list[tuple[str, dict[str, float]]] = [
+            (path, summary) for path, summary in self.summary().items() if summary["count"]
+        ]
+        return sorted(summaries, key=lambda item: item[1][key], reverse=True)[:amount]
+
+    def dump(self, path: Path, **metadata: Any) -> None:
+        """Writes the summary to a JSON file, along with the given metadata."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("w") as file:
+                json.dump({**metadata, "sections": self.summary()}, file, indent=2)
+        except OSError as error:
+            logger.error(f"Could not write step profile {path}: {error}")
+
+
+def section_name(function: Callable[..., Any]) -> str:
+    """Readable section name of a function, 'Class.method' for bound methods."""
+    owner: Any = getattr(function, "__self__", None)
+    name: str = getattr(function, "__name__", repr(function))
+    return name if owner is None else f"{type(owner).__name__}.{name}"
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import cached_property
+from operator import attrgetter
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from s2clientprotocol import raw_pb2
+from sc2.constants import IS_ENEMY, IS_MINE, IS_PLACEHOLDER, IS_STRUCTURE, IS_VISIBLE
+from sc2.ids.buff_id import BuffId
+from sc2.ids.unit_typeid import UnitTypeId
+
+if TYPE_CHECKING:
+    from sc2.game_data import GameData
+    from sc2.units import Units
+
+# Same exceptions as Unit.can_attack
+ATTACKING_WITHOUT_WEAPONS: set[UnitTypeId] = {
+    UnitTypeId.BATTLECRUISER,
+    UnitTypeId.SENTRY,
+    UnitTypeId.ORACLE,
+    UnitTypeId.VOIDRAY,
+}
+IS_NEUTRAL: int = 3
+
+
+class UnitTypeColumns:
+    """Per unit type lookup tables, indexed by unit type id."""
+
+    def __init__(self, game_data: GameData) -> None:
+        size: int = max(max((type_id.value for type_id in UnitTypeId), default=0), max(game_data.units, default=0)) + 1
+        self.is_structure: np.ndarray = np.zeros(size, dtype=bool)
+        self.can_attack: np.ndarray = np.zeros(size, dtype=bool)
+        for type_id, type_data in game_data.units.items():
+            self.is_structure[type_id] = IS_STRUCTURE in type_data._proto.attributes
+            self.can_attack[type_id] = bool(type_data._proto.weapons)
+        for type_id in ATTACKING_WITHOUT_WEAPONS:
+            self.can_attack[type_id.value] = True
+
+    def lookup(self, table: np.ndarray, type_ids: np.ndarray) -> np.ndarray:
+        """Values of 'table' for each type id, False for unknown type ids."""
+        known: np.ndarray = type_ids < len(table)
+        return np.where(known, table[np.where(known, type_ids, 0)], False)
+
+
+class UnitSnapshot:
+    """Columnar copy of the units of one frame, built in bulk from the raw protos in _prepare_units.
+    Row i describes 'bot.all_units[i]' (which is also its 'distance_calculation_index'),
+    so a boolean mask or index array over the columns can be turned back into a Units object with 'units'.
+    Each column is read from the protos the first time it is used in the frame."""
+
+    def __init__(self, raw_units: list[raw_pb2.Unit], all_units: Units, type_columns: UnitTypeColumns) -> None:
+        self.raw_units: list[raw_pb2.Unit] = raw_units
+        self.all_units: Units = all_units
+        self.type_columns: UnitTypeColumns = type_columns
+
+    def _column(self, attribute: str, dtype: type) -> np.ndarray:
+        return np.fromiter(map(attrgetter(attribute), self.raw_units), dtype=dtype, count=len(self))
+
+    @cached_property
+    def tag(self) -> np.ndarray:
+        return self._column("tag", np.uint64)
+
+    @cached_property
+    def type_id(self) -> np.ndarray:
+        return self._column("unit_type", np.int32)
+
+    @cached_property
+    def alliance(self) -> np.ndarray:
+        return self._column("alliance", np.int8)
+
+    @cached_property
+    def display_type(self) -> np.ndarray:
+        return self._column("display_type", np.int8)
+
+    @cached_property
+    def x(self) -> np.ndarray:
+        return self._column("pos.x", np.float64)
+
+    @cached_property
+    def y(self) -> np.ndarray:
+        return self._column("pos.y", np.float64)
+
+    @cached_property
+    def radius(self) -> np.ndarray:
+        return self._column("radius", np.float32)
+
+    @cached_property
+    def health(self) -> np.ndarray:
+        return self._column("health", np.float32)
+
+    @cached_property
+    def health_max(self) -> np.ndarray:
+        return self._column("health_max", np.float32)
+
+    @cached_property
+    def shield(self) -> np.ndarray:
+        return self._column("shield", np.float32)
+
+    @cached_property
+    def shield_max(self) -> np.ndarray:
+        return self._column("shield_max", np.float32)
+
+    @cached_property
+    def energy(self) -> np.ndarray:
+        return self._column("energy", np.float32)
+
+    @cached_property
+    def weapon_cooldown(self) -> np.ndarray:
+        return self._column("weapon_cooldown", np.float32)
+
+    @cached_property
+    def build_progress(self) -> np.ndarray:
+        return self._column("build_progress", np.float32)
+
+    @cached_property
+    def is_flying(self) -> np.ndarray:
+        # Same as Unit.is_flying, lifted units count as flying
+        graviton_beam: int = BuffId.GRAVITONBEAM.value
+        return np.fromiter(
+            (unit.is_flying or graviton_beam in unit.buff_ids for unit in self.raw_units), dtype=bool, count=len(self)
+        )
+
+    @cached_property
+    def is_burrowed(self) -> np.ndarray:
+        return self._column("is_burrowed", bool)
+
+    @cached_property
+    def is_structure(self) -> np.ndarray:
+        return self.type_columns.lookup(self.type_columns.is_structure, self.type_id)
+
+    @cached_property
+    def can_attack(self) -> np.ndarray:
+        return self.type_columns.lookup(self.type_columns.can_attack, self.type_id)
+
+    def __len__(self) -> int:
+        return len(self.raw_units)
+
+    @property
+    def positions(self) -> np.ndarray:
+        """(n, 2) array of the unit positions."""
+        return np.column_stack((self.x, self.y))
+
+    @property
+    def is_placeholder(self) -> np.ndarray:
+        return self.display_type == IS_PLACEHOLDER
+
+    @property
+    def is_visible(self) -> np.ndarray:
+        return self.display_type == IS_VISIBLE
+
+    @property
+    def own(self) -> np.ndarray:
+        return (self.alliance == IS_MINE) & ~self.is_placeholder
+
+    @property
+    def enemy(self) -> np.ndarray:
+        return (self.alliance == IS_ENEMY) & ~self.is_placeholder
+
+    @property
+    def neutral(self) -> np.ndarray:
+        return (self.alliance == IS_NEUTRAL) & ~self.is_placeholder
+
+    @property
+    def own_units(self) -> np.ndarray:
+        """Same rows as bot.units"""
+        return self.own & ~self.is_structure
+
+    @property
+    def own_structures(self) -> np.ndarray:
+        """Same rows as bot.structures"""
+        return self.own & self.is_structure
+
+    @property
+    def enemy_units(self) -> np.ndarray:
+        """Same rows as bot.enemy_units"""
+        return self.enemy & ~self.is_structure
+
+    @property
+    def enemy_structures(self) -> np.ndarray:
+        """Same rows as bot.enemy_structures"""
+        return self.enemy & self.is_structure
+
+    def of_type(self, types: UnitTypeId | Iterable[UnitTypeId]) -> np.ndarray:
+        """Mask of the units of the given types.
+
+        :param types:
+        """
+        if isinstance(types, UnitTypeId):
+            return self.type_id == types.value
+        return np.isin(self.type_id, np.fromiter((type_id.value for type_id in types), dtype=np.int32))
+
+    def units(self, rows: np.ndarray) -> Units:
+        """Units object of the rows selected by a boolean mask or an index array, in snapshot order.
+
+        :param rows:
+        """
+        indices: np.ndarray = np.flatnonzero(rows) if rows.dtype == bool else rows
+        return self.all_units.subgroup(self.all_units[index] for index in indices)
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 import random
-from collections.abc import Callable, Generator, Iterable
+from collections.abc import Callable, Iterable
 from itertools import chain
 from typing import TYPE_CHECKING, Any
 
 from s2clientprotocol import raw_pb2
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.position import Point2
+from sc2.spatial_index import SpatialIndex
 from sc2.unit import Unit
 
 if TYPE_CHECKING:
@@ -28,6 +29,68 @@ class Units(list[Unit]):
         """
         super().__init__(units)
         self._bot_object = bot_object
+        self._spatial_index: SpatialIndex | None = None
+        self._tag_index: dict[int, Unit] | None = None
+        self._tags: frozenset[int] | None = None
+        self._indexed_length: int = 0
+
+    def _invalidate_indexes(self) -> None:
+        """Called whenever the list is modified in place"""
+        self._spatial_index = None
+        self._tag_index = None
+        self._tags = None
+
+    def _drop_appended_indexes(self) -> None:
+        """append is not overridden, _prepare_units calls it for every unit of every step.
+        Every other modification drops the indexes, so an index built before an append is the only one
+        with the wrong length."""
+        if len(self) != self._indexed_length:
+            self._invalidate_indexes()
+            self._indexed_length = len(self)
+
+    def extend(self, units: Iterable[Unit]) -> None:
+        self._invalidate_indexes()
+        super().extend(units)
+
+    def insert(self, index: int, unit: Unit) -> None:
+        self._invalidate_indexes()
+        super().insert(index, unit)
+
+    def remove(self, unit: Unit) -> None:
+        self._invalidate_indexes()
+        super().remove(unit)
+
+    def pop(self, index: int = -1) -> Unit:
+        self._invalidate_indexes()
+        return super().pop(index)
+
+    def clear(self) -> None:
+        self._invalidate_indexes()
+        super().clear()
+
+    def sort(self, *args, **kwargs) -> None:
+        self._invalidate_indexes()
+        super().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        self._invalidate_indexes()
+        super().reverse()
+
+    def __setitem__(self, index, value) -> None:
+        self._invalidate_indexes()
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index) -> None:
+        self._invalidate_indexes()
+        super().__delitem__(index)
+
+    def __iadd__(self, units: Iterable[Unit]) -> Units:
+        self._invalidate_indexes()
+        return super().__iadd__(units)
+
+    def __imul__(self, n: int) -> Units:
+        self._invalidate_indexes()
+        return super().__imul__(n)
 
     def __call__(self, unit_types: UnitTypeId | Iterable[UnitTypeId]) -> Units:
         """Creates a new mutable Units object from Units or list object.
@@ -36,9 +99,6 @@ class Units(list[Unit]):
         """
         return self.of_type(unit_types)
 
-    def __iter__(self) -> Generator[Unit, None, None]:
-        return (item for item in super().__iter__())
-
     def copy(self) -> Units:
         """Creates a new mutable Units object from Units or list object.
 
@@ -46,47 +106,41 @@ class Units(list[Unit]):
         """
         return Units(self, self._bot_object)
 
+    def _other_tags(self, other: Iterable[Unit]) -> frozenset[int]:
+        if isinstance(other, Units):
+            return other.tags
+        return frozenset(unit.tag for unit in other)
+
     def __or__(self, other: Units) -> Units:
-        """
+        """Units of self, then the units of other that are not in self, keeping their order.
+
         :param other:
         """
-        return Units(
-            chain(
-                iter(self),
-                (other_unit for other_unit in other if other_unit.tag not in (self_unit.tag for self_unit in self)),
-            ),
-            self._bot_object,
-        )
+        self_tags: frozenset[int] = self.tags
+        return Units(chain(self, (unit for unit in other if unit.tag not in self_tags)), self._bot_object)
 
     def __add__(self, other: Units) -> Units:
-        """
+        """Same as '|'.
+
         :param other:
         """
-        return Units(
-            chain(
-                iter(self),
-                (other_unit for other_unit in other if other_unit.tag not in (self_unit.tag for self_unit in self)),
-            ),
-            self._bot_object,
-        )
+        return self | other
 
     def __and__(self, other: Units) -> Units:
-        """
+        """Units of other that are also in self, keeping their order.
+
         :param other:
         """
-        return Units(
-            (other_unit for other_unit in other if other_unit.tag in (self_unit.tag for self_unit in self)),
-            self._bot_object,
-        )
+        self_tags: frozenset[int] = self.tags
+        return Units((unit for unit in other if unit.tag in self_tags), self._bot_object)
 
     def __sub__(self, other: Units) -> Units:
-        """
+        """Units of self that are not in other, keeping their order.
+
         :param other:
         """
-        return Units(
-            (self_unit for self_unit in self if self_unit.tag not in (other_unit.tag for other_unit in other)),
-            self._bot_object,
-        )
+        other_tags: frozenset[int] = self._other_tags(other)
+        return Units((unit for unit in self if unit.tag not in other_tags), self._bot_object)
 
     def __hash__(self) -> int:
         return hash(unit.tag for unit in self)
@@ -103,14 +157,21 @@ class Units(list[Unit]):
     def exists(self) -> bool:
         return bool(self)
 
+    @property
+    def tag_index(self) -> dict[int, Unit]:
+        """Returns a dict of all units by tag, built on first use and rebuilt after the list is modified.
+        Do not modify the returned dict."""
+        self._drop_appended_indexes()
+        if self._tag_index is None:
+            # The first unit with a given tag wins, like a linear search would
+            self._tag_index = {unit.tag: unit for unit in reversed(self)}
+        return self._tag_index
+
     def find_by_tag(self, tag: int) -> Unit | None:
         """
         :param tag:
         """
-        for unit in self:
-            if unit.tag == tag:
-                return unit
-        return None
+        return self.tag_index.get(tag)
 
     def by_tag(self, tag: int) -> Unit:
         """
@@ -377,6 +438,47 @@ class Units(list[Unit]):
             return self
         return self.subgroup(self._list_sorted_by_distance_to(position)[-n:])
 
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        """KD-tree over the positions of these units, built on first use and rebuilt after the list is modified."""
+        self._drop_appended_indexes()
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex(self)
+        return self._spatial_index
+
+    def in_radius(self, position: Unit | Point2, radius: float, include_radius: bool = False) -> Units:
+        """Returns all units (from this Units object) whose center is at most 'radius' away from the target unit or position,
+        keeping their order. Uses the spatial index instead of computing the distance to every unit.
+
+        Example::
+
+            enemy_zerglings = self.enemy_units(UnitTypeId.ZERGLING)
+            my_marine = next((unit for unit in self.units if unit.type_id == UnitTypeId.MARINE), None)
+            if my_marine:
+                touching_zerglings = enemy_zerglings.in_radius(my_marine, 5, include_radius=True)
+                # Contains all zerglings whose edge is 5 or less away from the marine center
+
+        :param position:
+        :param radius:
+        :param include_radius: add the radius of each unit to 'radius'
+        """
+        if not self:
+            return self
+        point: tuple[float, float] = position.position_tuple if isinstance(position, Unit) else position
+        return self.subgroup(self[index] for index in self.spatial_index.query_radius(point, radius, include_radius))
+
+    def nearest_n_units(self, position: Unit | Point2, n: int) -> Units:
+        """Returns the n closest units in distance to position, sorted by distance.
+        Same as closest_n_units, but uses the spatial index instead of sorting all units.
+
+        :param position:
+        :param n:
+        """
+        if not self:
+            return self
+        point: tuple[float, float] = position.position_tuple if isinstance(position, Unit) else position
+        return self.subgroup(self[index] for index in self.spatial_index.query_nearest(point, n))
+
     def in_distance_of_group(self, other_units: Units, distance: float) -> Units:
         """Returns units that are closer than distance from any unit in the other units object.
 
@@ -656,9 +758,12 @@ class Units(list[Unit]):
         return self.filter(lambda unit: unit.is_selected)
 
     @property
-    def tags(self) -> set[int]:
-        """Returns all unit tags as a set."""
-        return {unit.tag for unit in self}
+    def tags(self) -> frozenset[int]:
+        """Returns all unit tags as a set, cached until the list is modified."""
+        self._drop_appended_indexes()
+        if self._tags is None:
+            self._tags = frozenset(self.tag_index)
+        return self._tags
 
     @property
     def ready(self) -> Units:
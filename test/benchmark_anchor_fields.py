@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import numpy as np
+
+import bot.utils.map_cache as map_cache
+from bot.macro.map.anchor_fields import AnchorFields
+from test.test_anchor_fields import _anchor_fields
+from test.test_pickled_data import MAPS
+
+
+def _positions(anchor_fields: AnchorFields, amount: int = 200) -> tuple[np.ndarray, np.ndarray]:
+    _, height, width = anchor_fields.fields.shape
+    rng = np.random.default_rng(0)
+    return rng.uniform(0, width, amount), rng.uniform(0, height, amount)
+
+
+def test_bench_anchor_fields_bulk(benchmark, tmp_path, monkeypatch):
+    monkeypatch.setattr(map_cache, "CACHE_FOLDER", tmp_path)
+    anchor_fields = _anchor_fields(sorted(MAPS)[0])
+    xs, ys = _positions(anchor_fields)
+    main, enemy_main = anchor_fields.anchors[0], anchor_fields.anchors[-1]
+    benchmark(anchor_fields.closer_to, main, enemy_main, xs, ys)
+
+
+def test_bench_anchor_fields_per_unit(benchmark, tmp_path, monkeypatch):
+    monkeypatch.setattr(map_cache, "CACHE_FOLDER", tmp_path)
+    anchor_fields = _anchor_fields(sorted(MAPS)[0])
+    xs, ys = _positions(anchor_fields)
+    main, enemy_main = anchor_fields.anchors[0], anchor_fields.anchors[-1]
+    positions = [type(main)((x, y)) for x, y in zip(xs, ys)]
+    benchmark(lambda: [anchor_fields.is_closer_to(main, enemy_main, position) for position in positions])
+
+
+# Run this file using
+# uv run pytest test/benchmark_anchor_fields.py --benchmark-compare
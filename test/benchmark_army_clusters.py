@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from scipy.spatial import cKDTree
+
+from bot.combat.army_clusters import cluster_labels
+from test.test_army_clusters import RADIUS, _positions, clusters_dfs
+
+
+def test_bench_clusters_dfs(benchmark):
+    benchmark(clusters_dfs, _positions(), RADIUS)
+
+
+def test_bench_clusters_connected_components(benchmark):
+    benchmark(lambda positions: cluster_labels(cKDTree(positions), RADIUS), _positions())
+
+
+# Run this file using
+# uv run pytest test/benchmark_army_clusters.py --benchmark-compare
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import asyncio
+import io
+from contextlib import redirect_stdout
+
+from test.test_offline_harness import _game
+from test.test_pickled_data import MAPS
+
+
+def test_bench_bot_step(benchmark, monkeypatch, tmp_path):
+    game = _game(sorted(MAPS)[0], monkeypatch, tmp_path)
+
+    def step():
+        with redirect_stdout(io.StringIO()):
+            asyncio.run(game.step())
+
+    benchmark(step)
+
+
+# Run this file using
+# uv run pytest test/benchmark_bot_step.py --benchmark-compare
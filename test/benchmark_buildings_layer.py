@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from test.test_buildings_layer import _layer, _queries, should_build_building_scalar
+from test.test_pickled_data import MAPS
+
+
+def test_bench_should_build_building_scalar(benchmark):
+    layer = _layer(sorted(MAPS)[0])
+    queries = _queries(layer)
+    benchmark(lambda: [should_build_building_scalar(layer, *query) for query in queries])
+
+
+def test_bench_should_build_building_raster(benchmark):
+    layer = _layer(sorted(MAPS)[0])
+    queries = _queries(layer)
+
+    def check_all():
+        # rebuild the rasters like on a new frame
+        layer.version += 1
+        return [layer.should_build_building(*query) for query in queries]
+
+    benchmark(check_all)
+
+
+# Run this file using
+# uv run pytest test/benchmark_buildings_layer.py --benchmark-compare
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import numpy as np
+
+from bot.macro.map.influence_maps.layers.creep_layer import CreepLayer
+from sc2.position import Point2
+from test.test_creep_layer import (
+    FRAMES,
+    CreepGame,
+    closest_creep_clamp_brute_force,
+    closest_creep_edge_brute_force,
+    full_update,
+)
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+
+def _bench(benchmark, update) -> None:
+    bot = get_map_specific_bot(sorted(MAPS)[0])
+    game = CreepGame(bot)
+    # the frames are generated up front so only the update is measured
+    frames: list[tuple[np.ndarray, np.ndarray]] = []
+    for _ in range(FRAMES):
+        frames.append((bot.state.creep.data_numpy, bot.state.visibility.data_numpy))
+        game.step()
+    layer = CreepLayer(bot)
+    layer.update()
+
+    def step():
+        bot.state.game_loop += 1
+        bot.state.creep.data_numpy, bot.state.visibility.data_numpy = frames[bot.state.game_loop % FRAMES]
+        update(layer)
+
+    benchmark(step)
+
+
+def test_bench_creep_layer_full(benchmark):
+    _bench(benchmark, full_update)
+
+
+def test_bench_creep_layer_incremental(benchmark):
+    _bench(benchmark, CreepLayer.update)
+
+
+def _queries_layer() -> tuple[CreepLayer, list[Point2]]:
+    bot = get_map_specific_bot(sorted(MAPS)[0])
+    CreepGame(bot)
+    layer = CreepLayer(bot)
+    layer.update()
+    rng = np.random.default_rng(2)
+    height, width = bot.game_info.pathing_grid.data_numpy.shape
+    return layer, [Point2((rng.uniform(0, width), rng.uniform(0, height))) for _ in range(100)]
+
+
+def test_bench_creep_queries_brute_force(benchmark):
+    layer, positions = _queries_layer()
+    benchmark(lambda: [
+        (closest_creep_edge_brute_force(layer, pos), closest_creep_clamp_brute_force(layer, pos)) for pos in positions
+    ])
+
+
+def test_bench_creep_queries_indexed(benchmark):
+    layer, positions = _queries_layer()
+    benchmark(lambda: [(layer.closest_creep_edge(pos), layer.closest_creep_clamp(pos)) for pos in positions])
+
+
+# Run this file using
+# uv run pytest test/benchmark_creep_layer.py --benchmark-compare
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from test.test_danger_map import _run_rings, _run_stamps, _setups
+
+
+def test_bench_danger_map_rings(benchmark):
+    _result = benchmark(_run_rings, _setups())
+
+
+def test_bench_danger_map_stamps(benchmark):
+    _result = benchmark(_run_stamps, _setups())
+
+
+# Run this file using
+# uv run pytest test/benchmark_danger_map_update.py --benchmark-compare
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import pytest
+from loguru import logger
+
+from s2clientprotocol import sc2api_pb2 as sc_pb
+from sc2.protocol import Protocol
+from test.test_debug_logging import FakeWebSocket, _action_request, _send, log_level
+
+
+def send_log_eager(protocol: Protocol, request: sc_pb.Request) -> None:
+    """Previous behavior: the request is formatted even if no handler writes debug logs"""
+    logger.debug(f"Sending request: {request!r}")
+    logger.debug("Request sent")
+    _send(protocol, [request])
+
+
+@pytest.mark.parametrize("log_level", ["INFO"], indirect=True)
+def test_bench_request_log_eager(benchmark, log_level):
+    benchmark(send_log_eager, Protocol(FakeWebSocket()), _action_request())
+
+
+@pytest.mark.parametrize("log_level", ["INFO"], indirect=True)
+def test_bench_request_log_lazy(benchmark, log_level):
+    benchmark(_send, Protocol(FakeWebSocket()), [_action_request()])
+
+
+# Run this file using
+# uv run pytest test/benchmark_debug_logging.py --benchmark-compare
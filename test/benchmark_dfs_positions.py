@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from bot.utils.point2_functions.dfs_positions import dfs_in_pathing
+from sc2.ids.unit_typeid import UnitTypeId
+from test.test_dfs_positions import _fill_main, _map_data
+from test.test_pickled_data import MAPS
+
+
+def test_bench_dfs_in_pathing_full_main(benchmark, monkeypatch):
+    map_data = _map_data(sorted(MAPS)[0], monkeypatch)
+    start = _fill_main(map_data)
+    buildings = map_data.influence_maps.buildings
+
+    def search():
+        # a new layer version skips the memo
+        buildings.version += 1
+        return dfs_in_pathing(map_data.bot, start, UnitTypeId.BARRACKS, map_data.bot.game_info.map_center, 1.5, True)
+
+    benchmark(search)
+
+
+# Run this file using
+# uv run pytest test/benchmark_dfs_positions.py --benchmark-compare
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from bot.scouting.ghost_units.ghost_units import GhostUnit
+from bot.scouting.ghost_units.store import GhostUnitStore
+from test.test_ghost_units import _bot_and_rows, ghost_unit
+from test.test_pickled_data import MAPS
+
+
+def test_bench_ghost_units_dataclasses(benchmark):
+    bot, _ = _bot_and_rows(sorted(MAPS)[0])
+    ghosts: dict[int, GhostUnit] = {}
+
+    def refresh():
+        for unit in bot.all_units:
+            ghosts[unit.tag] = ghost_unit(unit, 10)
+        expired = [tag for tag, ghost in ghosts.items() if ghost.expiry_frame < 10]
+        for tag in expired:
+            del ghosts[tag]
+        # assumed units, rebuilt on every access
+        visible_tags = {unit.tag for unit in bot.all_units}
+        return [ghost for tag, ghost in ghosts.items() if tag not in visible_tags and ghost.expiry_frame >= 10]
+
+    benchmark(refresh)
+
+
+def test_bench_ghost_units_store(benchmark):
+    bot, rows = _bot_and_rows(sorted(MAPS)[0])
+    store = GhostUnitStore()
+    store.refresh(10, bot.unit_snapshot, rows)
+
+    def refresh():
+        store.refresh(11, bot.unit_snapshot, rows)
+        store.keep(store["expiry_frame"] >= 11)
+        return store.ghost_units((store["last_seen_frame"] != 11) & (store["expiry_frame"] >= 11))
+
+    benchmark(refresh)
+
+
+# Run this file using
+# uv run pytest test/benchmark_ghost_units.py --benchmark-compare
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from test.test_influence_map_pick_tile import _queries, _run_loop, _run_vectorized, build_influence_maps
+
+
+def test_bench_pick_tile_loop(benchmark):
+    manager = build_influence_maps()
+    _result = benchmark(_run_loop, manager, _queries(manager))
+
+
+def test_bench_pick_tile_vectorized(benchmark):
+    manager = build_influence_maps()
+    _result = benchmark(_run_vectorized, manager, _queries(manager))
+
+
+# Run this file using
+# uv run pytest test/benchmark_influence_map_pick_tile.py --benchmark-compare
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from test.test_pathfinder import _pathfinder_and_points
+from test.test_pickled_data import MAPS
+
+
+def test_bench_pathfinder_distance_field(benchmark):
+    pathfinder, points = _pathfinder_and_points(sorted(MAPS)[0])
+
+    def build_field():
+        pathfinder.fields.clear()
+        return pathfinder.distance_field(points[0])
+
+    benchmark(build_field)
+
+
+def test_bench_pathfinder_astar(benchmark):
+    pathfinder, points = _pathfinder_and_points(sorted(MAPS)[0])
+    benchmark(lambda: [pathfinder.distance(points[0], point) for point in points[1:]])
+
+
+# Run this file using
+# uv run pytest test/benchmark_pathfinder.py --benchmark-compare
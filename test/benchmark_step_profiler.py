@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from sc2.step_profiler import StepProfiler
+
+SECTIONS: int = 60
+
+
+def _step(profiler: StepProfiler) -> None:
+    """A step with as many sections as WickedBot.on_step"""
+    with profiler.section("on_step"):
+        for _ in range(SECTIONS):
+            with profiler.section("subsystem"):
+                pass
+
+
+def test_bench_step_profiler_enabled(benchmark):
+    benchmark(_step, StepProfiler())
+
+
+def test_bench_step_profiler_disabled(benchmark):
+    benchmark(_step, StepProfiler(enabled=False))
+
+
+# Run this file using
+# uv run pytest test/benchmark_step_profiler.py --benchmark-compare
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sc2.unit_snapshot import UnitSnapshot
+from test.test_unit_snapshot import _bots, _run_filter, _run_snapshot
+
+if TYPE_CHECKING:
+    from sc2.bot_ai import BotAI
+
+
+def _run_build(bots: list[BotAI], columns: list[str]) -> list[UnitSnapshot]:
+    """Snapshot built as in _prepare_units, plus the given columns read once"""
+    snapshots: list[UnitSnapshot] = []
+    for bot in bots:
+        snapshot = UnitSnapshot([unit._proto for unit in bot.all_units], bot.all_units, bot._unit_type_columns)
+        for column in columns:
+            getattr(snapshot, column)
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def _run_prepare_units(bots: list[BotAI]) -> None:
+    for bot in bots:
+        bot._prepare_units()
+
+
+def test_bench_units_filter(benchmark):
+    benchmark(_run_filter, _bots())
+
+
+def test_bench_unit_snapshot_mask(benchmark):
+    benchmark(_run_snapshot, _bots())
+
+
+def test_bench_prepare_units_of_snapshot_maps(benchmark):
+    """Whole _prepare_units on the same maps for comparison, the snapshot build is part of it"""
+    benchmark(_run_prepare_units, _bots())
+
+
+def test_bench_unit_snapshot_build(benchmark):
+    benchmark(_run_build, _bots(), [])
+
+
+def test_bench_unit_snapshot_build_filter_columns(benchmark):
+    """Columns read by the enemy filters of a step: enemy_units, enemy_structures and positions"""
+    benchmark(_run_build, _bots(), ["alliance", "display_type", "is_structure", "x", "y"])
+
+
+def test_bench_unit_snapshot_build_all_columns(benchmark):
+    benchmark(
+        _run_build,
+        _bots(),
+        [
+            "tag",
+            "alliance",
+            "display_type",
+            "x",
+            "y",
+            "radius",
+            "health",
+            "health_max",
+            "shield",
+            "shield_max",
+            "energy",
+            "weapon_cooldown",
+            "build_progress",
+            "is_flying",
+            "is_burrowed",
+            "is_structure",
+            "can_attack",
+        ],
+    )
+
+
+# Run this file using
+# uv run pytest test/benchmark_unit_snapshot.py --benchmark-compare
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from bot.utils import unit_tags
+from bot.utils.unit_traits import has_trait
+from sc2.ids.unit_typeid import UnitTypeId
+from test.test_unit_traits import ALL_TYPES, MENACING_OR_WORKER
+
+
+def _lookup_list(types: list[UnitTypeId]) -> int:
+    return sum(1 for type_id in types if type_id in unit_tags.menacing or type_id in unit_tags.worker_types)
+
+
+def _lookup_trait(types: list[UnitTypeId]) -> int:
+    return sum(1 for type_id in types if has_trait(type_id, MENACING_OR_WORKER))
+
+
+def test_bench_unit_tags_list_lookup(benchmark):
+    benchmark(_lookup_list, ALL_TYPES)
+
+
+def test_bench_unit_tags_trait_lookup(benchmark):
+    benchmark(_lookup_trait, ALL_TYPES)
+
+
+# Run this file using
+# uv run pytest test/benchmark_unit_traits.py --benchmark-compare
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from sc2.units import Units
+from test.test_units_set_operations import _run_hashed, _run_nested, _units_pair
+
+
+def test_bench_units_set_operations_nested(benchmark):
+    benchmark(_run_nested, *_units_pair())
+
+
+def test_bench_units_set_operations_hashed(benchmark):
+    benchmark(_run_hashed, *_units_pair())
+
+
+def _iterate(units: Units) -> int:
+    return sum(1 for _unit in units)
+
+
+def _iterate_generator(units: Units) -> int:
+    """Previous Units.__iter__ wrapped the list iterator in a generator"""
+    return sum(1 for _unit in (item for item in list.__iter__(units)))
+
+
+def test_bench_units_iteration_generator(benchmark):
+    units, _ = _units_pair()
+    benchmark(_iterate_generator, units)
+
+
+def test_bench_units_iteration(benchmark):
+    units, _ = _units_pair()
+    benchmark(_iterate, units)
+
+
+# Run this file using
+# uv run pytest test/benchmark_units_set_operations.py --benchmark-compare
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from test.test_units_spatial_index import _run_filter, _run_in_radius, _setups
+
+
+def test_bench_units_radius_filter(benchmark):
+    benchmark(_run_filter, _setups())
+
+
+def test_bench_units_radius_index(benchmark):
+    benchmark(_run_in_radius, _setups())
+
+
+# Run this file using
+# uv run pytest test/benchmark_units_spatial_index.py --benchmark-compare
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from test.test_wall_distance import _pathing_grids, _run_bfs, _run_transform
+
+
+def test_bench_wall_distance_bfs(benchmark):
+    _result = benchmark(_run_bfs, _pathing_grids())
+
+
+def test_bench_wall_distance_transform(benchmark):
+    _result = benchmark(_run_transform, _pathing_grids())
+
+
+# Run this file using
+# uv run pytest test/benchmark_wall_distance.py --benchmark-compare
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import pytest
+
+from sc2.unit import Unit
+
+
+@pytest.fixture(autouse=True, scope="module")
+def restore_unit_class_cache():
+    """Each test module starts with the unit type cache it would have on its own, test_pickled_data checks its content"""
+    cached = dict(Unit.class_cache)
+    yield
+    Unit.class_cache.clear()
+    Unit.class_cache.update(cached)
@@ -1,6 +1,8 @@
 """
 This "bot" will loop over several available ladder maps and generate the pickle file in the "/test/pickle_data/" subfolder.
 These will then be used to run tests from the test script "test_pickled_data.py"
+It also records a sequence of mid-game observations in the "/test/observation_data/" subfolder, both armies fighting
+in the middle of the map, which "offline_harness.py" steps the bot through.
 """
 
 import lzma
@@ -21,14 +23,21 @@ from sc2.main import run_game
 from sc2.player import Bot, Computer
 from sc2.protocol import ProtocolError
 
+# amount of observations recorded after the armies are spawned
+RECORDED_OBSERVATIONS: int = 100
+
 
 class ExporterBot(BotAI):
     def __init__(self):
         BotAI.__init__(self)
         self.map_name: str = None  # pyrefly: ignore
+        self.observations: list[sc_pb.ResponseObservation] = []
 
     async def on_step(self, iteration):
-        pass
+        self.observations.append(self.state.response_observation)
+        if len(self.observations) >= RECORDED_OBSERVATIONS:
+            self.store_observations_to_file(self.get_observations_file_path())
+            await self.client.leave()
 
     def get_pickle_file_path(self) -> Path:
         folder_path = Path(__file__).parent
@@ -44,6 +53,22 @@ class ExporterBot(BotAI):
         file_path = folder_path / subfolder_name / file_name
         return file_path
 
+    def get_observations_file_path(self) -> Path:
+        folder_path = Path(__file__).parent
+        subfolder_name = "observation_data"
+        file_name = f"{self.map_name}.xz"
+        file_path = folder_path / subfolder_name / file_name
+        return file_path
+
+    def store_observations_to_file(self, file_path: Path):
+        # To test if this data is convertable in the first place
+        for raw_observation in self.observations:
+            _game_state = GameState(raw_observation)
+
+        Path(file_path).parent.mkdir(exist_ok=True, parents=True)
+        with lzma.open(file_path, "wb") as f:
+            pickle.dump(self.observations, f)
+
     async def store_data_to_file(self, file_path: Path):
         # Grab all raw data from observation
         raw_game_data = await self.client._execute(
@@ -65,8 +90,10 @@ class ExporterBot(BotAI):
 
     async def on_start(self):
         file_path = self.get_pickle_file_path()
-        logger.info(f"Saving pickle file to {self.map_name}.xz")
-        await self.store_data_to_file(file_path)
+        # Maps generated before the observations were recorded keep their pickle file
+        if not file_path.is_file():
+            logger.info(f"Saving pickle file to {self.map_name}.xz")
+            await self.store_data_to_file(file_path)
 
         # Make map visible
         await self.client.debug_show_map()
@@ -97,7 +124,9 @@ class ExporterBot(BotAI):
         file_path = self.get_combat_file_path()
         await self.store_data_to_file(file_path)
 
-        await self.client.leave()
+        # Both armies meet in the middle of the map, the observations are recorded in on_step
+        for unit in self.units + self.enemy_units:
+            unit.attack(self.game_info.map_center)
 
 
 def main():
@@ -214,7 +243,7 @@ def main():
             bot = ExporterBot()
             bot.map_name = map_
             file_path = bot.get_pickle_file_path()
-            if Path(file_path).is_file():
+            if Path(file_path).is_file() and bot.get_observations_file_path().is_file():
                 logger.warning(
                     f"Pickle file for map {map_} was already generated. Skipping. If you wish to re-generate files, please remove them first."
                 )
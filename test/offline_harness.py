@@ -0,0 +1,378 @@
+"""
+Offline harness running the whole bot step (issue_events, on_step, _after_step) without a SC2 client.
+
+The bot is stepped by the same loop as a real game (sc2.main.AIGameLoop), the sections of the steps are timed by
+the bot profiler (see sc2/step_profiler.py), --sections shows the slowest ones.
+The game is fed from recorded observations: the mid-game frames of the map in "test/observation_data" when they
+were generated (see generate_pickle_files_bot.py), otherwise the pickled observation of the map in "test/pickle_data"
+replayed with an advancing game loop.
+"test/observation_data" is not committed: until it's generated locally, every map replays its game start, 12 workers
+and a townhall without any enemy, which sends no query and leaves the combat and scouting code mostly idle.
+Requests to the game are answered by a fake client:
+ - actions, chat and debug drawings are recorded
+ - pathing queries are answered from the pathing grid
+ - placement queries are answered from the placement, pathing and creep grids
+ - available abilities are every tracked ability of the unit type
+Everything is deterministic, so the step timings can be compared between two versions of the bot.
+
+Usage:
+uv run python test/offline_harness.py --steps 200 --maps 3
+uv run python test/offline_harness.py --steps 200 --map AbyssalReefLE --replayed
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import lzma
+import math
+import pickle
+import sys
+from collections.abc import Iterable, Iterator
+from itertools import chain
+from contextlib import redirect_stdout
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from s2clientprotocol import common_pb2 as common_pb
+from s2clientprotocol import query_pb2 as query_pb
+from s2clientprotocol import sc2api_pb2 as sc_pb
+
+import bot.combat.ability_availability
+import bot.army_composition.army_composition_manager
+import bot.macro.expansion_manager
+import bot.macro.map.map
+import bot.macro.map.pathing_distances
+import bot.scouting.ghost_units.manager
+import bot.scouting.scouting
+import bot.strategy.build_order.manager
+import bot.strategy.handler
+import bot.utils.matchup
+from bot.bot import WickedBot
+from bot.combat.ability_availability import TRACKED_ABILITIES
+from bot.macro.map.pathfinder import Pathfinder
+from sc2.bot_ai import BotAI
+from sc2.client import Client
+from sc2.data import ActionResult, Status
+from sc2.game_data import GameData
+from sc2.game_info import GameInfo
+from sc2.game_state import GameState
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.main import AIGameLoop
+from sc2.position import Point2
+from test.test_pickled_data import MAPS, load_map_pickle_data
+
+# mid-game observations recorded by generate_pickle_files_bot.py, one file per map
+OBSERVATIONS_FOLDER: Path = Path(__file__).parent / "observation_data"
+
+# module level instances of the bot, shared by every bot of the process
+SINGLETONS: list[tuple[Any, str]] = [
+    (bot.combat.ability_availability, "ability_availability"),
+    (bot.army_composition.army_composition_manager, "composition_manager"),
+    (bot.macro.expansion_manager, "expansions"),
+    (bot.macro.map.map, "map_data"),
+    (bot.macro.map.pathing_distances, "pathing_distances"),
+    (bot.scouting.ghost_units.manager, "ghost_units_manager"),
+    (bot.scouting.scouting, "scouting"),
+    (bot.strategy.build_order.manager, "build_order_manager"),
+    (bot.strategy.handler, "strategy"),
+    (bot.utils.matchup, "matchup"),
+]
+
+
+def reset_singletons() -> None:
+    """Forget the instances of the previous game, so the next bot gets its own."""
+    for module, name in SINGLETONS:
+        setattr(module, name, None)
+
+
+class FakeClient(Client):
+    """
+    Client answering the requests of the bot locally, see the module docstring.
+    With raw_game_data and observations it can also serve sc2.main._play_game_ai, pipelined steps included.
+    """
+
+    def __init__(
+        self,
+        raw_game_info: sc_pb.Response,
+        raw_game_data: sc_pb.Response | None = None,
+        observations: Iterable[sc_pb.ResponseObservation] | None = None,
+    ) -> None:
+        super().__init__(True)  # pyrefly: ignore
+        self.raw_game_info = raw_game_info
+        self.raw_game_data = raw_game_data
+        self.observations: Iterator[sc_pb.ResponseObservation] | None = (
+            iter(observations) if observations is not None else None
+        )
+        self.bot: BotAI | None = None
+        self.pathfinder: Pathfinder | None = None
+        self._status = Status.in_game
+        self.actions_sent: list[sc_pb.RequestAction] = []
+        self.chat_messages: list[str] = []
+        self.debug_requests: int = 0
+        self.queries: int = 0
+        self.steps: int = 0
+        # request types of each round trip, in order
+        self.round_trip_requests: list[list[str]] = []
+
+    async def _execute(self, **kwargs) -> sc_pb.Response:
+        assert len(kwargs) == 1, "Only one request per call"
+        self.round_trips += 1
+        request_type, request = next(iter(kwargs.items()))
+        self.round_trip_requests.append([request_type])
+        return self.answer(request_type, request)
+
+    async def _execute_pipelined(self, requests: list[sc_pb.Request]) -> list[sc_pb.Response]:
+        self.round_trips += 1
+        request_types: list[str] = [request.WhichOneof("request") for request in requests]
+        self.round_trip_requests.append(request_types)
+        return [
+            self.answer(request_type, getattr(request, request_type))
+            for request_type, request in zip(request_types, requests)
+        ]
+
+    def answer(self, request_type: str, request: Any) -> sc_pb.Response:
+        if request_type == "game_info":
+            return self.raw_game_info
+        if request_type == "data" and self.raw_game_data is not None:
+            return self.raw_game_data
+        if request_type == "ping":
+            return sc_pb.Response(ping=sc_pb.ResponsePing(base_build=0))
+        if request_type == "observation" and self.observations is not None:
+            observation: sc_pb.ResponseObservation = next(self.observations)
+            if observation.player_result:
+                self._status = Status.ended
+            return sc_pb.Response(observation=observation)
+        if request_type == "step":
+            self.steps += 1
+            if self._status == Status.ended:
+                return sc_pb.Response(error=["Game has already ended"])
+            return sc_pb.Response()
+        if request_type == "action":
+            self.actions_sent.append(request)
+            for action in request.actions:
+                if action.HasField("action_chat"):
+                    self.chat_messages.append(action.action_chat.message)
+            return sc_pb.Response(
+                action=sc_pb.ResponseAction(result=[ActionResult.Success.value] * len(request.actions))
+            )
+        if request_type == "debug":
+            self.debug_requests += 1
+            return sc_pb.Response()
+        if request_type == "query":
+            self.queries += 1
+            return sc_pb.Response(query=self.query(request))
+        if request_type == "leave_game":
+            self._status = Status.ended
+            return sc_pb.Response()
+        raise NotImplementedError(f"The offline client can't answer {request_type} requests")
+
+    def query(self, request: query_pb.RequestQuery) -> query_pb.ResponseQuery:
+        assert self.bot is not None, "The bot is set once it's created"
+        return query_pb.ResponseQuery(
+            pathing=[query_pb.ResponseQueryPathing(distance=self.pathing(query)) for query in request.pathing],
+            placements=[
+                query_pb.ResponseQueryBuildingPlacement(result=self.placement(query)) for query in request.placements
+            ],
+            abilities=[self.abilities(query) for query in request.abilities],
+        )
+
+    def pathing(self, query: query_pb.RequestQueryPathing) -> float:
+        """Ground distance from the pathing grid, 0 when there is no path like the game."""
+        if self.pathfinder is None:
+            self.pathfinder = Pathfinder(self.bot, None)
+        if query.HasField("unit_tag"):
+            unit = self.bot.all_units.find_by_tag(query.unit_tag)
+            if unit is None:
+                return 0
+            start: Point2 = unit.position
+        else:
+            start = Point2((query.start_pos.x, query.start_pos.y))
+        end: Point2 = Point2((query.end_pos.x, query.end_pos.y))
+        # one field per start, the bot usually queries many ends from the same start
+        distance: float | None = self.pathfinder.field_distance(self.pathfinder.distance_field(start), end)
+        return 0 if distance is None else distance
+
+    def placement(self, query: query_pb.RequestQueryBuildingPlacement) -> int:
+        ability_data = self.bot.game_data.abilities.get(query.ability_id)
+        radius: float = ability_data._proto.footprint_radius if ability_data is not None else 0
+        if radius <= 0:
+            return ActionResult.Error.value
+        x0: int = int(round(query.target_pos.x - radius))
+        y0: int = int(round(query.target_pos.y - radius))
+        size: int = int(round(radius * 2))
+        placement: np.ndarray = self.bot.game_info.placement_grid.data_numpy
+        height, width = placement.shape
+        if x0 < 0 or y0 < 0 or x0 + size > width or y0 + size > height:
+            return ActionResult.CantBuildLocationInvalid.value
+        footprint = (slice(y0, y0 + size), slice(x0, x0 + size))
+        valid: bool = bool(
+            (placement[footprint] == 1).all()
+            and (self.bot.game_info.pathing_grid.data_numpy[footprint] == 1).all()
+            and (self.bot.state.creep.data_numpy[footprint] == 0).all()
+        )
+        return ActionResult.Success.value if valid else ActionResult.CantBuildLocationInvalid.value
+
+    def abilities(self, query: query_pb.RequestQueryAvailableAbilities) -> query_pb.ResponseQueryAvailableAbilities:
+        unit = self.bot.all_units.find_by_tag(query.unit_tag)
+        type_id: UnitTypeId | None = unit.type_id if unit is not None else None
+        return query_pb.ResponseQueryAvailableAbilities(
+            unit_tag=query.unit_tag,
+            unit_type_id=type_id.value if type_id is not None else 0,
+            abilities=[
+                common_pb.AvailableAbility(ability_id=ability.value)
+                for ability in sorted(TRACKED_ABILITIES.get(type_id, set()), key=lambda ability: ability.value)
+            ],
+        )
+
+
+def replayed_observations(raw_observation: sc_pb.ResponseObservation, game_step: int) -> Iterator[sc_pb.ResponseObservation]:
+    """The same observation over and over, game_step game loops apart."""
+    game_loop: int = raw_observation.observation.game_loop
+    while True:
+        game_loop += game_step
+        observation = sc_pb.ResponseObservation()
+        observation.CopyFrom(raw_observation)
+        observation.observation.game_loop = game_loop
+        yield observation
+
+
+def recorded_observations(map_path: Path) -> Iterator[sc_pb.ResponseObservation] | None:
+    """
+    The recorded observations of the map in order, then the last one replayed, None if none were recorded.
+    """
+    file_path: Path = OBSERVATIONS_FOLDER / map_path.name
+    if not file_path.is_file():
+        return None
+    with lzma.open(file_path, "rb") as f:
+        observations: list[sc_pb.ResponseObservation] = pickle.load(f)
+    if not observations:
+        return None
+    game_loops: list[int] = [observation.observation.game_loop for observation in observations[-2:]]
+    game_step: int = game_loops[-1] - game_loops[0] if len(game_loops) == 2 else 4
+    return chain(observations, replayed_observations(observations[-1], max(game_step, 1)))
+
+
+def percentile(values: list[float], percent: float) -> float:
+    ordered: list[float] = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(percent / 100 * len(ordered)) - 1))]
+
+
+class OfflineGame:
+    """
+    One game of a bot on a map of the pickle data, stepped offline with a FakeClient.
+    Construct it, `await start()`, then `await run(steps)`: `step_times` holds the duration of each step in ms.
+    """
+
+    def __init__(
+        self,
+        map_path: Path,
+        bot_class: type[BotAI] = WickedBot,
+        observations: Iterable[sc_pb.ResponseObservation] | None = None,
+    ) -> None:
+        raw_game_data, raw_game_info, raw_observation = load_map_pickle_data(map_path)
+        reset_singletons()
+        self.map_path = map_path
+        self.bot: BotAI = bot_class()
+        self.raw_game_data = raw_game_data
+        self.raw_game_info = raw_game_info
+        self.raw_observation = raw_observation
+        # the client serves the observations, like the game does
+        self.client = FakeClient(
+            raw_game_info,
+            raw_game_data,
+            observations if observations is not None else replayed_observations(raw_observation, 4),
+        )
+        self.client.bot = self.bot
+        self.game_loop: AIGameLoop | None = None
+        self.iteration: int = 0
+        self.step_times: list[float] = []
+
+    async def start(self) -> None:
+        """Same as the first step of sc2.main._play_game_ai."""
+        self.bot._initialize_variables()
+        self.bot._prepare_start(
+            self.client, 1, GameInfo(self.raw_game_info.game_info), GameData(self.raw_game_data.data)
+        )
+        self.bot._prepare_step(GameState(self.raw_observation), self.raw_game_info)
+        await self.bot.on_before_start()
+        self.bot._prepare_first_step()
+        await self.bot.on_start()
+        self.game_loop = AIGameLoop(self.client, 1, self.bot, False, None, self.bot.state)
+
+    async def step(self) -> float:
+        """
+        Runs a bot iteration with the loop of sc2.main._play_game_ai, pipelined or not,
+        from the observation request to the game step. Returns its duration in ms.
+        """
+        start: float = perf_counter()
+        await self.game_loop.step(self.iteration)
+        duration: float = (perf_counter() - start) * 1000
+        self.step_times.append(duration)
+        self.iteration += 1
+        return duration
+
+    async def run(self, steps: int) -> list[float]:
+        for _ in range(steps):
+            await self.step()
+        return self.step_times
+
+    def report(self) -> dict[str, float]:
+        times: list[float] = self.step_times
+        if not times:
+            return {"steps": 0}
+        return {
+            "steps": len(times),
+            "mean": sum(times) / len(times),
+            "p50": percentile(times, 50),
+            "p95": percentile(times, 95),
+            "max": max(times),
+        }
+
+
+async def run_games(
+    map_paths: list[Path], steps: int, verbose: bool = False, sections: int = 0, replayed: bool = False
+) -> None:
+    for map_path in map_paths:
+        observations: Iterator[sc_pb.ResponseObservation] | None = None if replayed else recorded_observations(map_path)
+        game = OfflineGame(map_path, observations=observations)
+        # the bot prints every step, only the report is shown by default
+        with redirect_stdout(sys.stdout if verbose else io.StringIO()):
+            await game.start()
+            await game.run(steps)
+        report: dict[str, float] = game.report()
+        print(
+            f"{map_path.stem:<30} {report['steps']} steps | mean {report['mean']:.2f} ms | p50 {report['p50']:.2f} ms"
+            f" | p95 {report['p95']:.2f} ms | max {report['max']:.2f} ms | {game.client.queries} queries"
+            f" | {'replayed' if observations is None else 'recorded'} observations"
+        )
+        for path, stats in game.bot.profiler.slowest(sections):
+            print(f"    {path:<60} p50 {stats['p50_ms']:.2f} ms | p95 {stats['p95_ms']:.2f} ms | max {stats['max_ms']:.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the bot steps offline on the pickled maps")
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--maps", type=int, default=3, help="amount of maps, in alphabetical order")
+    parser.add_argument("--map", type=str, default=None, help="name of a single map, e.g. AbyssalReefLE")
+    parser.add_argument("--verbose", action="store_true", help="show what the bot prints")
+    parser.add_argument("--sections", type=int, default=0, help="amount of slowest profiled sections shown per map")
+    parser.add_argument(
+        "--replayed", action="store_true", help="replay the game start observation even if mid-game ones were recorded"
+    )
+    args = parser.parse_args()
+    map_paths: list[Path] = sorted(MAPS)[: args.maps]
+    if args.map is not None:
+        map_paths = [map_path for map_path in MAPS if map_path.stem == args.map]
+    asyncio.run(run_games(map_paths, args.steps, args.verbose, args.sections, args.replayed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from bot.combat import ability_availability
+from bot.combat.ability_availability import CONFIRMATION_DELAY, PREDICTED_COOLDOWNS, AbilityAvailability
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+ABILITY: AbilityId = AbilityId.KD8CHARGE_KD8CHARGE
+
+
+class QueryClient:
+    """Answers the ability queries with the abilities of `available`, counts the queried units."""
+
+    def __init__(self) -> None:
+        self.available: set[int] = set()
+        self.queried: list[int] = []
+
+    async def query_available_abilities_with_tag(self, units):
+        self.queried.extend(unit.tag for unit in units)
+        return {unit.tag: {ABILITY} if unit.tag in self.available else set() for unit in units}
+
+
+@pytest.fixture
+def availability(monkeypatch) -> tuple[AbilityAvailability, QueryClient]:
+    bot = get_map_specific_bot(sorted(MAPS)[0])
+    # the pickled games only have workers, they stand in for a reaper
+    monkeypatch.setitem(ability_availability.TRACKED_ABILITIES, UnitTypeId.SCV, {ABILITY})
+    client = QueryClient()
+    bot.client = client
+    return AbilityAvailability(bot), client
+
+
+def _frame(availability: AbilityAvailability, seconds: float) -> None:
+    availability.bot.state.game_loop = round(seconds * 22.4)
+    asyncio.run(availability.update())
+
+
+def test_cooldown_starts_when_the_query_confirms_the_use(availability):
+    availability, client = availability
+    worker = availability.bot.workers.first
+    client.available = {worker.tag}
+    _frame(availability, 10)
+    assert ABILITY in availability.available(worker)
+
+    availability.used(worker, ABILITY)
+    assert ABILITY not in availability.available(worker)
+    # the query after the use shows the ability is gone, the cooldown is counted from the use
+    client.available = set()
+    _frame(availability, 10.2)
+    assert availability.cooldowns[(worker.tag, ABILITY)] == pytest.approx(10 + PREDICTED_COOLDOWNS[ABILITY])
+    client.queried.clear()
+    _frame(availability, 15)
+    assert worker.tag not in client.queried and ABILITY not in availability.available(worker)
+    _frame(availability, 10 + PREDICTED_COOLDOWNS[ABILITY] + 0.1)
+    assert worker.tag in client.queried
+
+
+def test_rejected_use_doesnt_hide_the_ability(availability):
+    availability, client = availability
+    worker = availability.bot.workers.first
+    client.available = {worker.tag}
+    _frame(availability, 10)
+    availability.used(worker, ABILITY)
+    # the game rejected the command: the ability is still there on every following query
+    for seconds in [10.2, 10.4, 10 + CONFIRMATION_DELAY + 0.5]:
+        client.queried.clear()
+        _frame(availability, seconds)
+        assert worker.tag in client.queried and ABILITY in availability.available(worker)
+    assert not availability.cooldowns and not availability.pending_uses
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import bot.utils.map_cache as map_cache
+from bot.macro.map.anchor_fields import AnchorFields
+from bot.macro.map.pathfinder import Pathfinder
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+
+def _anchor_fields(map_path) -> AnchorFields:
+    bot = get_map_specific_bot(map_path)
+    bot._find_expansion_locations()
+    bot.game_info.map_ramps, bot.game_info.vision_blockers = bot.game_info._find_ramps_and_vision_blockers()
+    anchors = list(bot.expansion_locations_list) + [ramp.top_center for ramp in bot.game_info.map_ramps]
+    return AnchorFields(bot, anchors)
+
+
+@pytest.mark.parametrize("map_path", sorted(MAPS)[:2])
+def test_anchor_fields_match_pathfinder(map_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(map_cache, "CACHE_FOLDER", tmp_path)
+    anchor_fields = _anchor_fields(map_path)
+    pathfinder = Pathfinder(anchor_fields.bot, None)
+    for anchor in anchor_fields.anchors[:4]:
+        field = pathfinder.distance_field(anchor)
+        for position in anchor_fields.anchors:
+            expected = pathfinder.field_distance(field, position)
+            if expected is not None and pathfinder.snap(pathfinder.graph(), position) == (int(position.x), int(position.y)):
+                assert anchor_fields.distance(anchor, position) == pytest.approx(expected, rel=1e-5)
+    # the second game on the map reads the fields from the cache
+    assert np.array_equal(_anchor_fields(map_path).fields, anchor_fields.fields)
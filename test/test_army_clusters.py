@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from bot.combat.army_clusters import cluster_labels
+
+UNIT_AMOUNT: int = 200
+RADIUS: float = 12
+
+
+def _positions(seed: int = 0) -> np.ndarray:
+    """A few groups of units spread over a 200x200 map"""
+    rng = np.random.default_rng(seed)
+    centers: np.ndarray = rng.uniform(0, 200, size=(8, 2))
+    return centers[rng.integers(0, len(centers), UNIT_AMOUNT)] + rng.normal(0, 8, size=(UNIT_AMOUNT, 2))
+
+
+def clusters_dfs(positions: np.ndarray, radius: float) -> list[set[int]]:
+    """Python DFS growing each cluster from every reached unit"""
+    visited: set[int] = set()
+    clusters: list[set[int]] = []
+    for seed in range(len(positions)):
+        if seed in visited:
+            continue
+        cluster: set[int] = set()
+        stack: list[int] = [seed]
+        while stack:
+            current = stack.pop()
+            if current in visited:
+                continue
+            visited.add(current)
+            cluster.add(current)
+            for other in range(len(positions)):
+                if other not in visited and np.hypot(*(positions[current] - positions[other])) <= radius:
+                    stack.append(other)
+        clusters.append(cluster)
+    return clusters
+
+
+def _clusters_from_labels(labels: np.ndarray) -> list[set[int]]:
+    clusters: dict[int, set[int]] = {}
+    for index, label in enumerate(labels):
+        clusters.setdefault(label, set()).add(index)
+    return list(clusters.values())
+
+
+def test_cluster_labels_match_dfs():
+    for seed in range(5):
+        positions = _positions(seed)
+        expected = clusters_dfs(positions, RADIUS)
+        result = _clusters_from_labels(cluster_labels(cKDTree(positions), RADIUS))
+        assert sorted(map(sorted, expected)) == sorted(map(sorted, result))
+
+
+def test_cluster_labels_transitive():
+    # each unit only reaches its neighbours, the chain still forms a single cluster
+    positions = np.array([[x * 10.0, 0.0] for x in range(10)])
+    assert len(set(cluster_labels(cKDTree(positions), 11))) == 1
+    assert len(set(cluster_labels(cKDTree(positions), 9))) == 10
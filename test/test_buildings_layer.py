@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from bot.macro.map.influence_maps.layers.buildings_layer import BuildingLayer
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+UNIT_TYPES: list[tuple[UnitTypeId, float]] = [
+    (UnitTypeId.SUPPLYDEPOT, 1),
+    (UnitTypeId.BARRACKS, 1.5),
+    (UnitTypeId.BUNKER, 1.5),
+    (UnitTypeId.COMMANDCENTER, 2.5),
+    (UnitTypeId.BARRACKSTECHLAB, 1),
+]
+
+
+def _layer(map_path) -> BuildingLayer:
+    bot = get_map_specific_bot(map_path)
+    bot._find_expansion_locations()
+    bot.game_info.map_ramps, bot.game_info.vision_blockers = bot.game_info._find_ramps_and_vision_blockers()
+    bot.game_info.player_start_location = bot.game_info.start_locations[0]
+    layer = BuildingLayer(bot)
+    layer.initialize()
+    return layer
+
+
+def should_build_building_scalar(layer: BuildingLayer, pos: Point2, unit_type: UnitTypeId, radius: float) -> bool:
+    """Previous BuildingLayer.should_build_building, one can_build call per footprint tile"""
+    pos = pos.rounded
+    size: int = int(round(radius * 2))
+    half: int = size // 2
+    points = [Point2((pos.x - half + x, pos.y - half + y)) for x in range(size) for y in range(size)]
+    if any(not layer.can_build(point, unit_type) for point in points):
+        return False
+    reserved_amount: int = 0
+    for point in points:
+        reserved_for = layer.reservations.get(point)
+        if reserved_for is not None and unit_type not in reserved_for:
+            return False
+        if reserved_for is not None:
+            reserved_amount += 1
+    return reserved_amount == 0 or reserved_amount == len(points)
+
+
+def _queries(layer: BuildingLayer, amount: int = 500) -> list[tuple[Point2, UnitTypeId, float]]:
+    height, width = layer.occupancy.shape
+    rng = random.Random(0)
+    return [
+        (Point2((rng.uniform(4, width - 4), rng.uniform(4, height - 4))), *rng.choice(UNIT_TYPES))
+        for _ in range(amount)
+    ]
+
+
+@pytest.mark.parametrize("map_path", sorted(MAPS)[:3])
+def test_raster_matches_scalar_checks(map_path):
+    layer = _layer(map_path)
+    rng = random.Random(1)
+    height, width = layer.occupancy.shape
+    for index, (pos, unit_type, radius) in enumerate(_queries(layer)):
+        # changes of the layer must invalidate the rasters
+        if index % 25 == 0:
+            layer.reserve_production(Point2((rng.randrange(6, width - 8), rng.randrange(6, height - 8))))
+        assert layer.should_build_building(pos, unit_type, radius) == should_build_building_scalar(layer, pos, unit_type, radius)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from bot.macro.map.influence_maps.layers.creep_layer import CreepLayer
+from sc2.bot_ai import BotAI
+from sc2.position import Point2
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+TUMOR_AMOUNT: int = 40
+FRAMES: int = 40
+CREEP_RADIUS: int = 36
+
+
+class CreepGame:
+    """
+    Late game creep spread on a pickled map: creep from tumors over the zerg half of the map,
+    a new tumor, a receding tumor and a moving scout every frame.
+    """
+
+    def __init__(self, bot: BotAI, seed: int = 0) -> None:
+        self.bot = bot
+        self.rng = np.random.default_rng(seed)
+        pathing: np.ndarray = bot.game_info.pathing_grid.data_numpy
+        height, width = pathing.shape
+        self.ys, self.xs = np.mgrid[:height, :width]
+        self.pathable_ys, self.pathable_xs = np.nonzero(pathing[:, width // 2:])
+        self.pathable_xs = self.pathable_xs + width // 2
+        self.tumors: list[tuple[int, int]] = [self.random_tile() for _ in range(TUMOR_AMOUNT)]
+        self.visibility: np.ndarray = np.where(self.xs < width // 2, 2, 1).astype(np.uint8)
+        self.visibility[:height // 3, width // 2:] = 0
+        self.frame: int = 0
+        self.apply()
+
+    def random_tile(self) -> tuple[int, int]:
+        index: int = int(self.rng.integers(len(self.pathable_xs)))
+        return int(self.pathable_ys[index]), int(self.pathable_xs[index])
+
+    def apply(self) -> None:
+        creep: np.ndarray = np.zeros(self.xs.shape, dtype=np.uint8)
+        for y, x in self.tumors:
+            creep[(self.ys - y) ** 2 + (self.xs - x) ** 2 <= 100] = 1
+        self.bot.state.creep.data_numpy = creep & (self.bot.game_info.pathing_grid.data_numpy != 0)
+        self.bot.state.visibility.data_numpy = self.visibility
+        self.bot.state.game_loop = self.frame
+
+    def step(self) -> None:
+        self.frame += 1
+        self.tumors.append(self.random_tile())
+        self.tumors.pop(0)
+        # a scout walking across the zerg side
+        height, width = self.xs.shape
+        scout_y, scout_x = height // 2, width // 2 + (self.frame * 2) % (width // 2)
+        self.visibility = np.where(self.visibility == 2, 1, self.visibility).astype(np.uint8)
+        self.visibility[self.xs < width // 2] = 2
+        self.visibility[(self.ys - scout_y) ** 2 + (self.xs - scout_x) ** 2 <= 64] = 2
+        self.apply()
+
+
+def full_update(layer: CreepLayer) -> None:
+    """Previous behavior: every map recomputed over the whole map"""
+    layer.previous_creep = None
+    layer.update()
+
+
+@pytest.mark.parametrize("map_path", sorted(MAPS)[:3])
+def test_incremental_matches_full_update(map_path):
+    bot = get_map_specific_bot(map_path)
+    game = CreepGame(bot)
+    incremental, full = CreepLayer(bot), CreepLayer(bot)
+    partial_updates: int = 0
+    for _ in range(FRAMES):
+        incremental.update()
+        full_update(full)
+        partial_updates += not incremental.full_rebuild
+        for name in ["distance_to_creep", "creep_assumed", "edge", "density", "bonus"]:
+            assert np.array_equal(getattr(incremental, name).map, getattr(full, name).map), name
+        assert np.array_equal(incremental.grad_x, full.grad_x) and np.array_equal(incremental.grad_y, full.grad_y)
+        game.step()
+    assert partial_updates > FRAMES // 2
+
+
+def closest_creep_edge_brute_force(layer: CreepLayer, pos: Point2) -> float | None:
+    """Distance from pos to the closest edge tile, over every edge tile"""
+    ys, xs = np.nonzero(layer.edge.map)
+    if (len(xs) == 0):
+        return None
+    return float(np.sqrt(((xs - pos.x) ** 2 + (ys - pos.y) ** 2).min()))
+
+
+def closest_creep_clamp_brute_force(layer: CreepLayer, pos: Point2, threshold: float = 0.5) -> float | None:
+    """Distance from pos (clamped to the map) to the closest tile dense enough, over every such tile"""
+    height, width = layer.density.map.shape
+    ys, xs = np.nonzero(layer.density.map >= threshold)
+    if (len(xs) == 0):
+        return None
+    x, y = max(0, min(pos.x, width - 1)), max(0, min(pos.y, height - 1))
+    return float(np.sqrt(((xs - x) ** 2 + (ys - y) ** 2).min()))
+
+
+@pytest.mark.parametrize("map_path", sorted(MAPS)[:3])
+def test_creep_queries_match_brute_force(map_path):
+    bot = get_map_specific_bot(map_path)
+    game = CreepGame(bot)
+    layer = CreepLayer(bot)
+    rng = np.random.default_rng(1)
+    height, width = bot.game_info.pathing_grid.data_numpy.shape
+    for _ in range(5):
+        layer.update()
+        for _ in range(100):
+            pos = Point2((rng.uniform(-5, width + 5), rng.uniform(-5, height + 5)))
+            edge = layer.closest_creep_edge(pos)
+            assert edge is not None and layer.edge.map[edge.y, edge.x] == 1
+            assert math.dist(edge, pos) == pytest.approx(closest_creep_edge_brute_force(layer, pos))
+
+            for threshold in [0.5, 1]:
+                clamp = layer.closest_creep_clamp(pos, threshold)
+                assert clamp is not None and layer.density.map[clamp.y, clamp.x] >= threshold
+                clamped = Point2((max(0, min(pos.x, width - 1)), max(0, min(pos.y, height - 1))))
+                expected = closest_creep_clamp_brute_force(layer, pos, threshold)
+                # exact from tile corners, within a tile from anywhere else
+                assert math.dist(clamp, clamped) <= expected + math.sqrt(2) / 2 + 1e-6
+                corner = clamped.rounded
+                assert math.dist(layer.closest_creep_clamp(corner, threshold), corner) == pytest.approx(
+                    closest_creep_clamp_brute_force(layer, corner, threshold)
+                )
+        game.step()
+
+
+@pytest.mark.parametrize("distance", [-6, 2, 10, 20, 30])
+def test_direction_to_tumor_points_into_creep(distance):
+    """From outside of creep toward its edge, from inside toward its center, `distance` tiles from the edge."""
+    bot = get_map_specific_bot(sorted(MAPS)[0])
+    height, width = bot.game_info.pathing_grid.data_numpy.shape
+    center: Point2 = Point2((width // 2, height // 2))
+    ys, xs = np.mgrid[:height, :width]
+    # a single creep patch thicker than DISTANCE_CAP, its density is flat around its center
+    bot.state.creep.data_numpy = ((ys - center.y) ** 2 + (xs - center.x) ** 2 <= CREEP_RADIUS ** 2).astype(np.uint8)
+    bot.state.visibility.data_numpy = np.full((height, width), 2, dtype=np.uint8)
+    layer = CreepLayer(bot)
+    layer.update()
+
+    pos: Point2 = center.offset((CREEP_RADIUS - distance, 0))
+    direction: Point2 = layer.direction_to_tumor(pos) - pos
+    assert direction.x < -0.9
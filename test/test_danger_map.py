@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import math
+import random
+from types import SimpleNamespace
+from typing import Optional
+
+import attr
+import numpy as np
+import pytest
+
+from bot.macro.map.influence_maps.danger_map import DangerMap, DangerStamp
+from bot.macro.map.influence_maps.layers.static_layer import StaticLayer
+from bot.macro.map.influence_maps.radial_kernels import RadialKernels
+from bot.utils import map_cache
+from bot.scouting.ghost_units.ghost_units import GhostUnit
+from sc2.bot_ai import BotAI
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+MAP_AMOUNT: int = 10
+UNIT_AMOUNT: int = 150
+# default density_alpha of InfluenceMap.update and InfluenceMap.stamp
+DENSITY_ALPHA: float = 0.3
+# the stamp center is within half an offset quantum of the unit on each axis, its radii within half a radius quantum
+INCREMENTAL_UPDATES: int = 12
+OFFSET_ERROR: float = RadialKernels.OFFSET_QUANTUM / 2 * math.sqrt(2)
+RADIUS_ERROR: float = RadialKernels.RADIUS_QUANTUM / 2
+
+# type, radius, ground dps, ground range, air dps, air range, speed, flying
+ZERG_PROFILES: list[tuple[UnitTypeId, float, float, float, float, float, float, bool]] = [
+    (UnitTypeId.ZERGLING, 0.375, 10, 0.1, 0, 0, 4.13, False),
+    (UnitTypeId.BANELING, 0.375, 16, 0.25, 0, 0, 3.5, False),
+    (UnitTypeId.ROACH, 0.625, 11.2, 4, 0, 0, 3.15, False),
+    (UnitTypeId.RAVAGER, 0.75, 14, 6, 0, 0, 3.85, False),
+    (UnitTypeId.HYDRALISK, 0.625, 22.4, 5, 22.4, 5, 3.15, False),
+    (UnitTypeId.QUEEN, 0.875, 11.2, 5, 12.6, 7, 1.31, False),
+    (UnitTypeId.MUTALISK, 0.5, 8.4, 3, 8.4, 3, 5.6, True),
+    (UnitTypeId.CORRUPTOR, 0.625, 0, 0, 10.3, 6, 4.725, True),
+    (UnitTypeId.SPORECRAWLER, 0.875, 0, 0, 20, 7, 0, False),
+    (UnitTypeId.SPINECRAWLER, 0.875, 18.9, 7, 0, 0, 0, False),
+]
+
+
+def fake_enemy_units(bot: BotAI, amount: int = UNIT_AMOUNT, seed: int = 0) -> list[GhostUnit]:
+    """Enemy units spread over the pathable tiles of the map"""
+    rng = random.Random(seed)
+    ys, xs = np.where(bot.game_info.pathing_grid.data_numpy)
+    units: list[GhostUnit] = []
+    for tag in range(amount):
+        type_id, radius, ground_dps, ground_range, air_dps, air_range, speed, flying = rng.choice(ZERG_PROFILES)
+        index: int = rng.randrange(len(xs))
+        units.append(
+            GhostUnit(
+                tag=tag,
+                type_id=type_id,
+                position=Point2((xs[index] + rng.random(), ys[index] + rng.random())),
+                radius=radius,
+                ground_dps=ground_dps,
+                ground_range=ground_range,
+                air_dps=air_dps,
+                air_range=air_range,
+                real_speed=speed,
+                health=100,
+                health_max=100,
+                health_percentage=1,
+                shield=0,
+                shield_max=0,
+                shield_percentage=0,
+                energy=0,
+                energy_max=0,
+                energy_percentage=0,
+                is_flying=flying,
+                is_armored=False,
+                can_attack=ground_dps > 0 or air_dps > 0,
+                can_attack_ground=ground_dps > 0,
+                can_attack_air=air_dps > 0,
+                last_seen_frame=0,
+                expiry_frame=0,
+                is_cloaked=False,
+                is_visible=True,
+            )
+        )
+    return units
+
+
+def update_unit_rings(danger: DangerMap, unit: GhostUnit):
+    """One InfluenceMap.update call per falloff level, as DangerMap.update_unit used to do"""
+    (position, radius, ground_dps, ground_range, air_dps, air_range, move_speed, minimum_range) = (
+        danger.get_unit_property(unit)
+    )
+    for weight, ms_factor in danger.FALLOFF_LEVELS:
+        ground_radius = radius + ground_range + move_speed * ms_factor / 2
+        air_radius = radius + air_range + move_speed * ms_factor / 2
+        effective_min_radius: float = radius + minimum_range if (minimum_range > 0) else 0
+        danger.ground.update(position, ground_radius, ground_dps * weight, effective_min_radius)
+        danger.air.update(position, air_radius, air_dps * weight, effective_min_radius)
+
+
+def _setups() -> list[tuple[DangerMap, list[GhostUnit]]]:
+    setups = []
+    for map_path in sorted(MAPS)[:MAP_AMOUNT]:
+        bot = get_map_specific_bot(map_path)
+        danger = DangerMap(bot, map=bot.game_info.pathing_grid.data_numpy.astype(np.float32))
+        setups.append((danger, fake_enemy_units(bot)))
+    return setups
+
+
+def _run_rings(setups: list[tuple[DangerMap, list[GhostUnit]]]):
+    for danger, units in setups:
+        danger.reset()
+        for unit in units:
+            update_unit_rings(danger, unit)
+
+
+def _run_stamps(setups: list[tuple[DangerMap, list[GhostUnit]]]):
+    for danger, units in setups:
+        danger.reset()
+        for unit in units:
+            danger.update_unit(unit)
+
+
+def _border_tiles(distances: np.ndarray, stamp: DangerStamp, rings: tuple[tuple[float, float], ...]) -> np.ndarray:
+    """Tiles close enough to a ring border (or the min radius) for the quantized center and radii to move them across"""
+    radii: list[float] = [radius for radius, _ in rings] + ([stamp.min_radius] if stamp.min_radius > 0 else [])
+    border: np.ndarray = np.zeros(distances.shape, dtype=bool)
+    for radius in radii:
+        border |= np.abs(distances - radius) <= OFFSET_ERROR + RADIUS_ERROR
+    return border
+
+
+def _bonus_tolerance(stamp: DangerStamp, rings: tuple[tuple[float, float], ...], dps: float) -> float:
+    """Largest change of the center bonus 1 + alpha * (1 - d / r) of the rings, for the quantized center and radii"""
+    return sum(
+        abs(dps) * weight * DENSITY_ALPHA * (OFFSET_ERROR + 3 * RADIUS_ERROR)
+        / max(radius - stamp.min_radius - 2 * RADIUS_ERROR, RADIUS_ERROR)
+        for radius, weight in rings
+        if radius > 0
+    )
+
+
+def test_stamps_match_rings():
+    for danger, units in _setups()[:3]:
+        height, width = danger.ground.shape
+        ys, xs = np.mgrid[:height, :width]
+        for unit in units:
+            danger.reset()
+            update_unit_rings(danger, unit)
+            expected: list[np.ndarray] = [danger.ground.map.copy(), danger.air.map.copy()]
+            danger.reset()
+            danger.update_unit(unit)
+            stamp: DangerStamp = danger.stamps[unit.tag]
+            # distances to the exact center, clamped into the map like both updates do
+            center_x: float = min(max(stamp.position.x, 0), width - 1)
+            center_y: float = min(max(stamp.position.y, 0), height - 1)
+            distances: np.ndarray = np.hypot(xs - center_x, ys - center_y)
+            for result, reference, rings, dps in [
+                (danger.ground.map, expected[0], stamp.ground_rings, stamp.ground_dps),
+                (danger.air.map, expected[1], stamp.air_rings, stamp.air_dps),
+            ]:
+                error: np.ndarray = np.abs(result - reference)
+                bonus_tolerance: float = _bonus_tolerance(stamp, rings, dps) + 1e-4
+                border: np.ndarray = _border_tiles(distances, stamp, rings)
+                # away from the ring borders, only the center bonus moves a little
+                assert error[~border].max(initial=0) <= bonus_tolerance
+                # on a border, a tile is in or out of each ring at most
+                ring_values: float = sum(abs(dps) * weight * (1 + DENSITY_ALPHA) for _, weight in rings)
+                assert error[border].max(initial=0) <= ring_values + bonus_tolerance
+
+
+def _danger_map(bot: BotAI) -> DangerMap:
+    """Same as InfluenceMapManager.init_influence_maps"""
+    return DangerMap(bot, map=bot.game_info.pathing_grid.data_numpy.astype(np.float32))
+
+
+def _update(
+    danger: DangerMap, units: list[GhostUnit], wall_distance: np.ndarray, block_mask: np.ndarray
+) -> Optional[int]:
+    """Same as InfluenceMapManager.update, the units being the assumed enemy units of the frame.
+    Returns the amount of boxes dirtied by the units, None after a full rebuild."""
+    danger.bot.ghost_units = SimpleNamespace(assumed_enemy_units=list(units))
+    danger.update(include_structures=True)
+    dirty_boxes: Optional[int] = None if danger.dirty_boxes is None else len(danger.dirty_boxes)
+    danger.apply_wall_and_blocking(wall_distance, block_mask)
+    return dirty_boxes
+
+
+def _next_frame(rng: random.Random, units: list[GhostUnit], new_units: list[GhostUnit], moved: int) -> list[GhostUnit]:
+    """Some units move (a few less than an offset quantum), some die and new ones arrive"""
+    units = units.copy()
+    for index in rng.sample(range(len(units)), moved):
+        shift: float = rng.choice([0.01, 1.5, 6])
+        position: Point2 = units[index].position
+        units[index] = attr.evolve(units[index], position=Point2((position.x + shift, position.y - shift)))
+    for index in sorted(rng.sample(range(len(units)), 3), reverse=True):
+        units.pop(index)
+    return units + [new_units.pop() for _ in range(3)]
+
+
+@pytest.mark.parametrize("map_path", sorted(MAPS)[:2])
+def test_incremental_update_matches_full_rebuild(map_path, monkeypatch, tmp_path):
+    monkeypatch.setattr(map_cache, "CACHE_FOLDER", tmp_path)
+    bot = get_map_specific_bot(map_path)
+    wall_distance: np.ndarray = StaticLayer(bot).wall_distance
+    block_mask: np.ndarray = np.zeros(wall_distance.shape, dtype=bool)
+    ys, xs = np.nonzero(bot.game_info.pathing_grid.data_numpy)
+    rng = random.Random(0)
+    all_units: list[GhostUnit] = fake_enemy_units(bot, 200)
+    units, new_units = all_units[:100], all_units[100:]
+
+    danger: DangerMap = _danger_map(bot)
+    danger.FULL_REBUILD_INTERVAL = 5
+    dirty_boxes: list[Optional[int]] = []
+    for frame in range(INCREMENTAL_UPDATES):
+        # a building is placed or lifted, once with more moving units than MAX_DIRTY_BOXES
+        index: int = rng.randrange(len(xs))
+        block_mask[ys[index]:ys[index] + 3, xs[index]:xs[index] + 3] ^= True
+        moved: int = DangerMap.MAX_DIRTY_BOXES + 10 if frame == 3 else 10
+        units = _next_frame(rng, units, new_units, moved)
+        dirty_boxes.append(_update(danger, units, wall_distance, block_mask))
+
+        full: DangerMap = _danger_map(bot)
+        _update(full, units, wall_distance, block_mask)
+        assert danger.stamps.keys() == full.stamps.keys()
+        assert np.allclose(danger.ground_terrain.map, full.ground_terrain.map, rtol=1e-4, atol=1e-3)
+        assert np.allclose(danger.air.map, full.air.map, rtol=1e-4, atol=1e-3)
+    # the first update and every FULL_REBUILD_INTERVAL updates start from a clean map
+    rebuilds: list[int] = [frame for frame, boxes in enumerate(dirty_boxes) if boxes is None]
+    assert rebuilds == list(range(0, INCREMENTAL_UPDATES, danger.FULL_REBUILD_INTERVAL + 1))
+    # past MAX_DIRTY_BOXES the whole ground_terrain is recomputed, otherwise only the boxes of the changed stamps
+    assert dirty_boxes[3] > DangerMap.MAX_DIRTY_BOXES
+    assert all(
+        0 < boxes <= DangerMap.MAX_DIRTY_BOXES for frame, boxes in enumerate(dirty_boxes) if frame not in rebuilds + [3]
+    )
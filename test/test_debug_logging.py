@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from loguru import logger
+
+from s2clientprotocol import raw_pb2 as raw_pb
+from s2clientprotocol import sc2api_pb2 as sc_pb
+from sc2.data import Status
+from sc2.debug_logging import debug_logging_enabled
+from sc2.protocol import Protocol
+
+ACTION_AMOUNT: int = 100
+
+
+def _action_request() -> sc_pb.Request:
+    """A request as big as what a bot sends when microing a large army"""
+    return sc_pb.Request(
+        action=sc_pb.RequestAction(
+            actions=[
+                sc_pb.Action(
+                    action_raw=raw_pb.ActionRaw(
+                        unit_command=raw_pb.ActionRawUnitCommand(
+                            ability_id=16, unit_tags=[4294967296 + i], target_world_space_pos={"x": i, "y": i}
+                        )
+                    )
+                )
+                for i in range(ACTION_AMOUNT)
+            ]
+        )
+    )
+
+
+class FakeWebSocket:
+    """Answers every request with an empty response of a game in progress"""
+
+    def __init__(self) -> None:
+        self.sent: list[bytes] = []
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.sent.append(data)
+
+    async def receive_bytes(self) -> bytes:
+        return sc_pb.Response(status=Status.in_game.value).SerializeToString()
+
+
+class CountedRequest:
+    """Sent like the request it wraps, counts how many times it is formatted for the logs"""
+
+    def __init__(self, request: sc_pb.Request) -> None:
+        self.request = request
+        self.formatted: int = 0
+
+    def SerializeToString(self) -> bytes:  # noqa: N802
+        return self.request.SerializeToString()
+
+    def __repr__(self) -> str:
+        self.formatted += 1
+        return repr(self.request)
+
+
+def _send(protocol: Protocol, requests: list[sc_pb.Request]) -> list[sc_pb.Response]:
+    return asyncio.run(protocol._execute_pipelined(requests))
+
+
+@pytest.fixture
+def log_level(request):
+    """Replace the loguru handlers by a single one at the given level, like main.py does.
+    The previous handlers are put back afterwards, removing them would close their sinks."""
+    messages: list[str] = []
+    core = logger._core
+    handlers, min_level = core.handlers, core.min_level
+    core.handlers, core.min_level = {}, float("inf")
+    handler_id: int = logger.add(messages.append, level=request.param, format="{message}")
+    yield messages
+    logger.remove(handler_id)
+    core.handlers, core.min_level = handlers, min_level
+
+
+@pytest.mark.parametrize("log_level", ["DEBUG"], indirect=True)
+def test_requests_logged_when_enabled(log_level):
+    assert debug_logging_enabled()
+    protocol = Protocol(FakeWebSocket())
+    request = CountedRequest(_action_request())
+    _send(protocol, [request])
+    assert request.formatted == 1
+    assert log_level[0].startswith("Sending request: action")
+
+    log_level.clear()
+    asyncio.run(protocol._execute(ping=sc_pb.RequestPing()))
+    assert [message.split(":")[0].strip() for message in log_level] == [
+        "Sending request",
+        "Request sent",
+        "Response received",
+    ]
+
+
+@pytest.mark.parametrize("log_level", ["INFO"], indirect=True)
+def test_requests_not_formatted_when_disabled(log_level):
+    assert not debug_logging_enabled()
+    websocket = FakeWebSocket()
+    protocol = Protocol(websocket)
+    requests = [CountedRequest(_action_request()), CountedRequest(_action_request())]
+    responses = _send(protocol, requests)
+    assert [request.formatted for request in requests] == [0, 0]
+    assert len(responses) == 2 and len(websocket.sent) == 2 and protocol.round_trips == 1
+
+    asyncio.run(protocol._execute(ping=sc_pb.RequestPing()))
+    # only the status change, logged at INFO level, gets through
+    assert [message.strip() for message in log_level] == ["Client status changed to Status.in_game (was None)"]
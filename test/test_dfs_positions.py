@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+import bot.macro.map.map as map_module
+from bot.macro.map.influence_maps.layers.buildings_layer import BuildingLayer
+from bot.macro.map.map import MapData
+from bot.utils.point2_functions import dfs_positions
+from bot.utils.point2_functions.dfs_positions import dfs_in_pathing, valid_building_position
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+UNIT_TYPES: list[tuple[UnitTypeId, float, bool]] = [
+    (UnitTypeId.SUPPLYDEPOT, 1, False),
+    (UnitTypeId.BARRACKS, 1.5, True),
+    (UnitTypeId.BUNKER, 1.5, False),
+    (UnitTypeId.COMMANDCENTER, 2.5, False),
+]
+
+
+def _map_data(map_path, monkeypatch) -> MapData:
+    bot = get_map_specific_bot(map_path)
+    bot._find_expansion_locations()
+    bot.game_info.map_ramps, bot.game_info.vision_blockers = bot.game_info._find_ramps_and_vision_blockers()
+    bot.game_info.player_start_location = bot.game_info.start_locations[0]
+    map_data = MapData(bot)
+    map_data.influence_maps.buildings = BuildingLayer(bot)
+    map_data.influence_maps.buildings.initialize()
+    monkeypatch.setattr(map_module, "map_data", map_data)
+    return map_data
+
+
+def _fill_main(map_data: MapData) -> Point2:
+    """ Blocks every tile around the start location, like a main full of buildings. """
+    start: Point2 = map_data.bot.game_info.player_start_location
+    map_data.influence_maps.buildings.block_area(Point2((start.x - 30, start.y - 30)), 60)
+    return start
+
+
+@pytest.mark.parametrize("map_path", sorted(MAPS)[:3])
+def test_search_returns_a_closest_valid_position(map_path, monkeypatch):
+    map_data = _map_data(map_path, monkeypatch)
+    bot = map_data.bot
+    rng = random.Random(0)
+    width, height = bot.game_info.map_size
+    for _ in range(100):
+        unit_type, radius, has_addon = rng.choice(UNIT_TYPES)
+        position = Point2((rng.uniform(10, width - 10), rng.uniform(10, height - 10)))
+        result = dfs_in_pathing(bot, position, unit_type, bot.game_info.map_center, radius, has_addon, max_distance=8)
+        normalized = position.rounded_half if int(round(radius * 2)) % 2 else position.rounded
+        if (result is None):
+            # nothing valid at all within the budget
+            assert not any(
+                valid_building_position(bot, normalized + Point2((dx, dy)), unit_type, radius, has_addon)
+                for dx in range(-8, 9) for dy in range(-8, 9) if dx ** 2 + dy ** 2 <= 64
+            )
+            continue
+        assert valid_building_position(bot, result, unit_type, radius, has_addon)
+        closer = [
+            normalized + Point2((dx, dy))
+            for dx in range(-8, 9) for dy in range(-8, 9)
+            if round((dx ** 2 + dy ** 2) ** 0.5) < round(result.distance_to(normalized))
+            and dx ** 2 + dy ** 2 <= 64
+        ]
+        # nothing valid in the rings before the result
+        assert not any(valid_building_position(bot, point, unit_type, radius, has_addon) for point in closer)
+
+
+def test_full_main_stays_in_budget(monkeypatch):
+    map_data = _map_data(sorted(MAPS)[0], monkeypatch)
+    start = _fill_main(map_data)
+    assert dfs_in_pathing(map_data.bot, start, UnitTypeId.BARRACKS, None, 1.5, True, max_distance=10) is None
+    # the miss is remembered for the frame too
+    assert list(dfs_positions.search_memo.values()) == [None]
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from bot.scouting.ghost_units.ghost_units import GhostUnit
+from bot.scouting.ghost_units.store import GhostUnitStore
+from sc2.bot_ai import BotAI
+from sc2.unit import Unit
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+FIELDS: list[str] = [
+    "tag", "type_id", "position", "radius", "ground_dps", "ground_range", "air_dps", "air_range", "real_speed",
+    "health", "health_max", "health_percentage", "shield", "shield_max", "shield_percentage",
+    "energy", "energy_max", "energy_percentage", "is_flying", "is_armored",
+    "can_attack", "can_attack_ground", "can_attack_air", "is_cloaked", "is_visible",
+]
+
+
+def ghost_unit(unit: Unit, frame: int) -> GhostUnit:
+    """Previous GhostUnitsManager refresh, one GhostUnit built from the Unit properties"""
+    return GhostUnit(
+        last_seen_frame=frame,
+        expiry_frame=round(frame + 300 - unit.real_speed * 60),
+        **{field: getattr(unit, field) for field in FIELDS},
+    )
+
+
+def _bot_and_rows(map_path) -> tuple[BotAI, np.ndarray]:
+    bot = get_map_specific_bot(map_path)
+    # the pickled games have no enemy units, all units stand in for them
+    return bot, np.ones(len(bot.unit_snapshot), dtype=bool)
+
+
+@pytest.mark.parametrize("map_path", sorted(MAPS)[:3])
+def test_store_matches_units(map_path):
+    bot, rows = _bot_and_rows(map_path)
+    store = GhostUnitStore()
+    store.refresh(10, bot.unit_snapshot, rows)
+    # a second refresh only updates the rows
+    store.refresh(11, bot.unit_snapshot, rows)
+    assert len(store) == len(bot.all_units)
+    for ghost in store.ghost_units(np.ones(len(store), dtype=bool)):
+        expected = ghost_unit(bot.all_units.find_by_tag(ghost.tag), 11)
+        for field in FIELDS + ["last_seen_frame", "expiry_frame"]:
+            value, expected_value = getattr(ghost, field), getattr(expected, field)
+            if (field == "position"):
+                value, expected_value = tuple(value), tuple(expected_value)
+            assert value == pytest.approx(expected_value), field
+
+    removed = bot.all_units[0].tag
+    store.remove(removed)
+    assert removed not in store.rows and len(store) == len(bot.all_units) - 1
+    assert all(int(store["tag"][row]) == tag for tag, row in store.rows.items())
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+
+from bot.macro.map.influence_maps.danger_map import DangerMap
+from bot.macro.map.influence_maps.layers.creep_layer import CreepLayer
+from bot.macro.map.influence_maps.layers.effect_layer import EffectLayer
+from bot.macro.map.influence_maps.layers.static_layer import StaticLayer
+from bot.macro.map.influence_maps.manager import InfluenceMapManager
+from bot.utils.point2_functions.utils import sample_tile_path
+from sc2.position import Point2
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+RADIUS: int = 16
+UNIT_AMOUNT: int = 80
+
+
+def build_influence_maps(map_index: int = 0, enemy_amount: int = UNIT_AMOUNT, seed: int = 0) -> InfluenceMapManager:
+    """Influence maps of a pickled map, with random enemy danger stamped on it"""
+    bot = get_map_specific_bot(sorted(MAPS)[map_index])
+    manager = InfluenceMapManager(bot)
+    manager.static = StaticLayer(bot)
+    manager.static.update_dynamic_block_grid()
+    manager.effects = EffectLayer(bot)
+    manager.creep = CreepLayer(bot)
+    manager.creep.compute_empty_maps()
+    manager.danger = DangerMap(bot, map=bot.game_info.pathing_grid.data_numpy.astype(np.float32))
+    manager.danger.reset()
+
+    rng = random.Random(seed)
+    for position in random_pathable_points(manager, enemy_amount, rng):
+        manager.danger.ground.update(position, rng.uniform(4, 10), rng.uniform(5, 30))
+        manager.danger.air.update(position, rng.uniform(4, 10), rng.uniform(5, 30))
+    manager.danger.apply_wall_and_blocking(manager.static.wall_distance, manager.static.dynamic_block_grid.map)
+    return manager
+
+
+def random_pathable_points(manager: InfluenceMapManager, amount: int, rng: random.Random) -> list[Point2]:
+    ys, xs = np.where(manager.bot.game_info.pathing_grid.data_numpy)
+    indices = [rng.randrange(len(xs)) for _ in range(amount)]
+    return [Point2((xs[i] + rng.random(), ys[i] + rng.random())) for i in indices]
+
+
+def pick_tile_loop(manager: InfluenceMapManager, pos: Point2, radius: float, air: bool, score_fn, prefer_direction=None):
+    """Per-tile python loop that was used by InfluenceMapManager.pick_tile"""
+    x1, y1, masked_values = manager.read(pos, radius, air)
+    ys, xs = np.where(~np.ma.getmaskarray(masked_values))
+
+    Dx = Dy = None
+    if prefer_direction is not None:
+        vec: Point2 = prefer_direction - pos
+        length: float = (vec.x * vec.x + vec.y * vec.y) ** 0.5
+        if length >= 1e-6:
+            Dx = vec.x / length
+            Dy = vec.y / length
+
+    rounded: Point2 = pos.rounded
+    x: int = int(rounded.x)
+    y: int = int(rounded.y)
+    best_point = None
+    best_score: float = -999
+    for iy, ix in zip(ys, xs):
+        px: int = x1 + ix
+        py: int = y1 + iy
+        dx: int = px - x
+        dy: int = py - y
+        _path = sample_tile_path(Point2((x, y)), Point2((px, py)))
+        value: float = masked_values[iy, ix]
+        if Dx is not None:
+            towards: float = dx * Dx + dy * Dy
+            perp_x: float = dx - towards * Dx
+            perp_y: float = dy - towards * Dy
+            extend: float = (perp_x * perp_x + perp_y * perp_y) ** 0.5
+        else:
+            towards = extend = 0.0
+        score: float = score_fn(value, towards, extend)
+        if score > best_score:
+            best_score = score
+            best_point = Point2((px, py))
+    return best_point, best_score
+
+
+def _score(value, towards, extend):
+    return -value - 2 * towards + extend
+
+
+def _queries(manager: InfluenceMapManager) -> list[tuple[Point2, Point2]]:
+    rng = random.Random(1)
+    positions = random_pathable_points(manager, UNIT_AMOUNT, rng)
+    threats = random_pathable_points(manager, UNIT_AMOUNT, rng)
+    return list(zip(positions, threats))
+
+
+def _run_loop(manager: InfluenceMapManager, queries: list[tuple[Point2, Point2]]):
+    return [pick_tile_loop(manager, pos, RADIUS, False, _score, threat) for pos, threat in queries]
+
+
+def _run_vectorized(manager: InfluenceMapManager, queries: list[tuple[Point2, Point2]]):
+    return [manager.pick_tile(pos, RADIUS, False, _score, prefer_direction=threat) for pos, threat in queries]
+
+
+def test_pick_tile_matches_loop():
+    manager = build_influence_maps()
+    queries = _queries(manager)
+    for (_, loop_score), (_, score) in zip(_run_loop(manager, queries), _run_vectorized(manager, queries)):
+        assert np.isclose(loop_score, score, rtol=1e-4, atol=1e-4)
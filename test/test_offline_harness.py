@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import lzma
+import pickle
+from contextlib import redirect_stdout
+from itertools import islice
+
+import pytest
+
+import bot.bot
+import bot.utils.map_cache
+from sc2.data import Result
+from test import offline_harness
+from test.offline_harness import OfflineGame, recorded_observations, replayed_observations
+from test.test_pickled_data import MAPS, load_map_pickle_data
+
+STEPS: int = 20
+
+
+def _game(map_path, monkeypatch, tmp_path) -> OfflineGame:
+    # the pathing distances are cached on disk, keep them out of data/map_cache
+    monkeypatch.setattr(bot.utils.map_cache, "CACHE_FOLDER", tmp_path)
+    game = OfflineGame(map_path)
+    with redirect_stdout(io.StringIO()):
+        asyncio.run(game.start())
+    return game
+
+
+@pytest.mark.parametrize("map_path", sorted(MAPS)[:2])
+def test_offline_game_runs(map_path, monkeypatch, tmp_path):
+    game = _game(map_path, monkeypatch, tmp_path)
+    with redirect_stdout(io.StringIO()):
+        asyncio.run(game.run(STEPS))
+    assert len(game.step_times) == STEPS
+    assert game.bot.state.game_loop == game.raw_observation.observation.game_loop + STEPS * game.client.game_step
+    assert len(game.client.actions_sent) > 0
+    report = game.report()
+    assert report["steps"] == STEPS
+    assert report["p50"] <= report["p95"] <= report["max"]
+
+    monkeypatch.setattr(bot.bot, "PROFILE_FOLDER", tmp_path / "step_profiles")
+    with redirect_stdout(io.StringIO()):
+        game.bot.save_step_profile(Result.Victory)
+    (profile_path,) = (tmp_path / "step_profiles").iterdir()
+    profile = json.loads(profile_path.read_text())
+    assert profile["result"] == "Victory"
+    assert profile["sections"]["on_step"]["count"] == STEPS
+    assert "on_step/map.influence_maps.update" in profile["sections"]
+
+
+def test_recorded_observations(monkeypatch, tmp_path):
+    map_path = sorted(MAPS)[0]
+    _, _, raw_observation = load_map_pickle_data(map_path)
+    recorded = list(islice(replayed_observations(raw_observation, 8), 3))
+    monkeypatch.setattr(offline_harness, "OBSERVATIONS_FOLDER", tmp_path / "observation_data")
+    assert recorded_observations(map_path) is None
+
+    offline_harness.OBSERVATIONS_FOLDER.mkdir()
+    with lzma.open(offline_harness.OBSERVATIONS_FOLDER / map_path.name, "wb") as f:
+        pickle.dump(recorded, f)
+    monkeypatch.setattr(bot.utils.map_cache, "CACHE_FOLDER", tmp_path)
+    game = OfflineGame(map_path, observations=recorded_observations(map_path))
+    game_loops: list[int] = []
+    with redirect_stdout(io.StringIO()):
+        asyncio.run(game.start())
+        for _ in range(5):
+            asyncio.run(game.step())
+            game_loops.append(game.bot.state.game_loop)
+    # the recorded observations in order, then the last one replayed with the same game step
+    start: int = raw_observation.observation.game_loop
+    assert game_loops == [start + 8 * step for step in range(1, 6)]
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from bot.macro.map.pathfinder import Pathfinder
+from sc2.position import Point2
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+
+def _pathfinder_and_points(map_path, amount: int = 6) -> tuple[Pathfinder, list[Point2]]:
+    bot = get_map_specific_bot(map_path)
+    ys, xs = np.nonzero(bot.game_info.pathing_grid.data_numpy)
+    rng = random.Random(0)
+    points = [Point2((xs[index] + 0.5, ys[index] + 0.5)) for index in rng.sample(range(len(xs)), amount)]
+    return Pathfinder(bot, None), points
+
+
+@pytest.mark.parametrize("map_path", sorted(MAPS)[:3])
+def test_astar_matches_distance_field(map_path):
+    pathfinder, points = _pathfinder_and_points(map_path)
+    # A* distances first, distance() reads the field once it exists
+    distances = [pathfinder.distance(points[0], point) for point in points[1:]]
+    field = pathfinder.distance_field(points[0])
+    for point, distance in zip(points[1:], distances):
+        assert distance == pytest.approx(pathfinder.field_distance(field, point), rel=1e-5)
+        if distance is not None:
+            # a ground path is never shorter than the straight line between the tiles
+            assert distance >= points[0].distance_to(point) - 1e-6
+            path = pathfinder.path(points[0], point)
+            assert path[0] == points[0] and path[-1] == point
+            assert all(abs(a.x - b.x) <= 1 and abs(a.y - b.y) <= 1 for a, b in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("map_path", sorted(MAPS)[:3])
+def test_ground_distances_reuse_the_field_of_a_moving_source(map_path):
+    bot = get_map_specific_bot(map_path)
+    bot._find_expansion_locations()
+    pathfinder = Pathfinder(bot, None)
+    source: Point2 = bot.townhalls.first.position.offset((0, -6))
+    bases: list[Point2] = bot.expansion_locations_list
+
+    distances: list[float] = pathfinder.ground_distances(source, bases)
+    assert len(distances) == len(bases)
+    # rounding the source costs a few tiles at most, a path is never much shorter than the straight line
+    for base, distance in zip(bases, distances):
+        assert math.isinf(distance) or distance >= source.distance_to(base) - Pathfinder.SOURCE_GRID * math.sqrt(2)
+    assert not all(math.isinf(distance) for distance in distances)
+
+    # half a tile further, the army center reads the same field
+    fields: int = len(pathfinder.fields)
+    assert pathfinder.ground_distances(source.offset((0.5, 0)), bases) == distances
+    assert len(pathfinder.fields) == fields
+    assert pathfinder.closest(source, bases) == int(np.argmin(distances))
+
+
+def test_ground_distances_away_from_walkable_tiles():
+    bot = get_map_specific_bot(sorted(MAPS)[0])
+    pathfinder = Pathfinder(bot, None)
+    # the map corner is never walkable, straight line distances are returned
+    corner: Point2 = Point2((0, 0))
+    points: list[Point2] = [bot.townhalls.first.position, bot.enemy_start_locations[0]]
+    assert pathfinder.ground_distances(corner, points) == [corner.distance_to(point) for point in points]
+    assert pathfinder.closest(corner, points) == 0
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import io
+from contextlib import redirect_stdout
+from itertools import islice
+
+import pytest
+from loguru import logger
+
+from s2clientprotocol import sc2api_pb2 as sc_pb
+from bot.utils import map_cache
+from sc2.bot_ai import BotAI
+from sc2.data import Result
+from sc2.main import _play_game_ai
+from sc2.protocol import ProtocolError
+from test.offline_harness import FakeClient, OfflineGame, replayed_observations
+from test.test_pickled_data import MAPS, load_map_pickle_data
+
+STEPS: int = 6
+
+
+class PipelinedBot(BotAI):
+    """Moves a worker and draws a text every step, so each step sends actions and debug drawings."""
+
+    def __init__(self, game_info_refresh_interval: int = 16) -> None:
+        super().__init__()
+        self.game_info_refresh_interval = game_info_refresh_interval
+        self.pipelined_steps = True
+        self.iterations: list[int] = []
+        self.game_loops: list[int] = []
+        self.results: list[Result] = []
+
+    async def on_step(self, iteration: int):
+        self.iterations.append(iteration)
+        self.game_loops.append(self.state.game_loop)
+        worker = self.workers.first
+        worker.move(worker.position.offset((iteration % 2 * 2 - 1, 0)))
+        self.client.debug_text_screen(f"Iteration {iteration}", (0.01, 0.01))
+
+    async def on_end(self, game_result: Result):
+        self.results.append(game_result)
+
+
+def _game(client_class: type[FakeClient] = FakeClient, **bot_options) -> tuple[PipelinedBot, FakeClient]:
+    raw_game_data, raw_game_info, raw_observation = load_map_pickle_data(sorted(MAPS)[0])
+    observations: list[sc_pb.ResponseObservation] = [raw_observation]
+    # the first step gets its observation on its own, each step then receives the next one
+    observations.extend(islice(replayed_observations(raw_observation, 4), STEPS + 1))
+    # the observation after the last step holds the game result
+    observations[-1].player_result.add(player_id=1, result=Result.Victory.value)
+    client = client_class(raw_game_info, raw_game_data, observations)
+    bot = PipelinedBot(**bot_options)
+    client.bot = bot
+    return bot, client
+
+
+def _play(bot: BotAI, client: FakeClient) -> Result:
+    return asyncio.run(_play_game_ai(client, 1, bot, realtime=False, game_time_limit=None))
+
+
+def test_pipelined_steps_until_game_over():
+    bot, client = _game()
+    assert _play(bot, client) == Result.Victory
+    assert bot.results == [Result.Victory]
+    assert bot.iterations == list(range(STEPS))
+    assert bot.game_loops == sorted(set(bot.game_loops))
+
+    # data, game info, ping, observation and game info of on_start, observation of the first step,
+    # then a single round trip per step
+    assert client.round_trip_requests[:6] == [["data"], ["game_info"], ["ping"], ["observation"], ["game_info"], ["observation"]]
+    # the pathing grid is refreshed with its own game info request every game_info_refresh_interval game loops
+    steps: list[list[str]] = [requests for requests in client.round_trip_requests[6:] if requests != ["game_info"]]
+    assert len(steps) == STEPS and client.steps == STEPS
+    assert all(requests == ["action", "debug", "step", "observation"] for requests in steps)
+    assert len(client.actions_sent) == STEPS
+
+
+def test_pipelined_steps_with_game_info():
+    bot, client = _game(game_info_refresh_interval=1)
+    assert _play(bot, client) == Result.Victory
+    # the game info of the next step comes with its observation, it's only requested on its own for the first step
+    assert client.round_trip_requests[5:7] == [["observation"], ["game_info"]]
+    steps: list[list[str]] = client.round_trip_requests[7:]
+    assert len(steps) == STEPS
+    assert all(requests == ["action", "debug", "step", "observation", "game_info"] for requests in steps)
+
+
+class GameOverStepClient(FakeClient):
+    """The game ends during the last step: the step fails and the observation holds the result."""
+
+    def answer(self, request_type, request):
+        if request_type == "step" and self.steps == STEPS - 1:
+            self.steps += 1
+            return sc_pb.Response(error=["Game has already ended"])
+        return super().answer(request_type, request)
+
+
+def test_pipelined_step_after_game_over():
+    bot, client = _game(GameOverStepClient)
+    assert _play(bot, client) == Result.Victory
+    assert bot.results == [Result.Victory]
+
+
+class FailingActionsClient(FakeClient):
+    def answer(self, request_type, request):
+        if request_type in {"action", "debug"}:
+            return sc_pb.Response(error=[f"{request_type} failed"])
+        return super().answer(request_type, request)
+
+
+def test_pipelined_failed_actions_are_logged():
+    bot, client = _game(FailingActionsClient)
+    messages: list[str] = []
+    handler: int = logger.add(messages.append, level="WARNING", format="{message}")
+    try:
+        assert _play(bot, client) == Result.Victory
+    finally:
+        logger.remove(handler)
+    assert sum("action request failed" in message for message in messages) == STEPS
+    assert sum("debug request failed" in message for message in messages) == STEPS
+
+
+class FailingObservationClient(FakeClient):
+    def answer(self, request_type, request):
+        if request_type == "observation" and self.steps == 2:
+            return sc_pb.Response(error=["Not in a game"])
+        return super().answer(request_type, request)
+
+
+def test_pipelined_observation_error_is_raised():
+    bot, client = _game(FailingObservationClient)
+    with pytest.raises(ProtocolError):
+        _play(bot, client)
+
+
+@pytest.mark.parametrize("pipelined_steps", [False, True])
+def test_wickedbot_steps(pipelined_steps, monkeypatch, tmp_path):
+    monkeypatch.setattr(map_cache, "CACHE_FOLDER", tmp_path)
+    game = OfflineGame(sorted(MAPS)[0])
+    game.bot.pipelined_steps = pipelined_steps
+    with redirect_stdout(io.StringIO()):
+        asyncio.run(game.start())
+        round_trips: int = game.client.round_trips
+        asyncio.run(game.run(STEPS))
+    # each pipelined step costs a single round trip, not counting game info and queries
+    step_round_trips: list[list[str]] = [
+        requests for requests in game.client.round_trip_requests[-(game.client.round_trips - round_trips):]
+        if "step" in requests
+    ]
+    assert game.client.steps == STEPS
+    assert len(step_round_trips) == STEPS
+    assert all((len(requests) > 1) == pipelined_steps for requests in step_round_trips)
+    assert len(game.client.actions_sent) > 0
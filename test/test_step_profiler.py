@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from sc2.step_profiler import SectionStats, StepProfiler, section_name
+
+
+def test_sections_nest_and_percentiles(tmp_path):
+    profiler = StepProfiler()
+    with profiler.section("on_step"):
+        with profiler.section("combat.execute_orders"):
+            pass
+        with pytest.raises(ValueError), profiler.section("failing"):
+            raise ValueError
+    assert list(profiler.sections) == ["on_step/combat.execute_orders", "on_step/failing", "on_step"]
+
+    stats = SectionStats(window=100)
+    for duration in range(1, 251):
+        stats.add(float(duration))
+    summary = stats.summary()
+    # percentiles over the last 100 samples, totals over all of them
+    window = np.arange(151, 251)
+    assert summary["count"] == 250 and summary["max_ms"] == 250 and summary["mean_ms"] == pytest.approx(125.5)
+    assert summary["p50_ms"] == pytest.approx(np.percentile(window, 50))
+    assert summary["p99_ms"] == pytest.approx(np.percentile(window, 99))
+    assert stats.last == 250
+
+    profiler.dump(tmp_path / "profile.json", map="test")
+    dumped = json.loads((tmp_path / "profile.json").read_text())
+    assert dumped["map"] == "test" and set(dumped["sections"]) == set(profiler.sections)
+
+    disabled = StepProfiler(enabled=False)
+    with disabled.section("on_step"):
+        pass
+    assert not disabled.sections
+    assert section_name(profiler.stop) == "StepProfiler.stop"
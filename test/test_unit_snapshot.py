@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.units import Units
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+if TYPE_CHECKING:
+    from sc2.bot_ai import BotAI
+
+MAP_AMOUNT: int = 5
+MINERAL_TYPES: list[UnitTypeId] = [UnitTypeId.MINERALFIELD, UnitTypeId.MINERALFIELD750]
+
+
+def _bots() -> list[BotAI]:
+    return [get_map_specific_bot(map_path) for map_path in sorted(MAPS)[:MAP_AMOUNT]]
+
+
+def _tags(units: Units) -> list[int]:
+    return [unit.tag for unit in units]
+
+
+def test_snapshot_matches_units():
+    for bot in _bots():
+        snapshot = bot.unit_snapshot
+        assert len(snapshot) == len(bot.all_units)
+        assert _tags(snapshot.units(snapshot.own_units)) == _tags(bot.units)
+        assert _tags(snapshot.units(snapshot.own_structures)) == _tags(bot.structures)
+        assert _tags(snapshot.units(snapshot.enemy_units)) == _tags(bot.enemy_units)
+        assert _tags(snapshot.units(snapshot.enemy_structures)) == _tags(bot.enemy_structures)
+        for index, unit in enumerate(bot.all_units):
+            assert snapshot.tag[index] == unit.tag
+            assert snapshot.type_id[index] == unit.type_id.value
+            assert (snapshot.x[index], snapshot.y[index]) == unit.position_tuple
+            assert snapshot.is_flying[index] == unit.is_flying
+            assert snapshot.is_structure[index] == unit.is_structure
+            assert snapshot.can_attack[index] == unit.can_attack
+
+
+def _run_filter(bots: list[BotAI]) -> list[Units]:
+    results: list[Units] = []
+    for bot in bots:
+        center = bot.game_info.map_center
+        results.append(
+            bot.all_units.filter(
+                lambda unit: unit.type_id in MINERAL_TYPES and unit.position.distance_to_point2(center) < 60
+            )
+        )
+    return results
+
+
+def _run_snapshot(bots: list[BotAI]) -> list[Units]:
+    results: list[Units] = []
+    for bot in bots:
+        snapshot = bot.unit_snapshot
+        x, y = bot.game_info.map_center
+        close: np.ndarray = (snapshot.x - x) ** 2 + (snapshot.y - y) ** 2 < 3600
+        results.append(snapshot.units(snapshot.of_type(MINERAL_TYPES) & close))
+    return results
+
+
+def test_snapshot_filter_matches():
+    bots = _bots()
+    for expected, result in zip(_run_filter(bots), _run_snapshot(bots)):
+        assert _tags(expected) == _tags(result)
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import numpy as np
+
+from bot.utils import unit_tags
+from bot.utils.unit_traits import UnitTrait, has_trait, trait_mask, trait_types
+from sc2.ids.unit_typeid import UnitTypeId
+
+ALL_TYPES: list[UnitTypeId] = list(UnitTypeId)
+MENACING_OR_WORKER: UnitTrait = UnitTrait.MENACING | UnitTrait.WORKER
+
+
+def test_traits_match_tag_lists():
+    for trait, types in trait_types.items():
+        for type_id in ALL_TYPES:
+            assert has_trait(type_id, trait) == (type_id in types), (trait, type_id)
+    type_ids: np.ndarray = np.array([type_id.value for type_id in ALL_TYPES] + [1 << 20], dtype=np.int32)
+    expected: list[bool] = [type_id in unit_tags.menacing or type_id in unit_tags.worker_types for type_id in ALL_TYPES]
+    assert trait_mask(type_ids, MENACING_OR_WORKER).tolist() == expected + [False]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from itertools import chain
+
+from s2clientprotocol import raw_pb2
+
+from sc2.unit import Unit
+from sc2.units import Units
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+UNIT_AMOUNT: int = 200
+
+
+def _units_pair() -> tuple[Units, Units]:
+    """Two groups of 200 units sharing half of their tags"""
+    bot = get_map_specific_bot(sorted(MAPS)[0])
+    units = [Unit(raw_pb2.Unit(tag=tag, unit_type=48, alliance=4), bot) for tag in range(UNIT_AMOUNT * 3 // 2)]
+    return Units(units[:UNIT_AMOUNT], bot), Units(units[UNIT_AMOUNT // 2 :], bot)
+
+
+def or_nested(units: Units, other: Units) -> Units:
+    """Previous Units.__or__ / __add__"""
+    return Units(
+        chain(
+            iter(units),
+            (other_unit for other_unit in other if other_unit.tag not in (self_unit.tag for self_unit in units)),
+        ),
+        units._bot_object,
+    )
+
+
+def and_nested(units: Units, other: Units) -> Units:
+    """Previous Units.__and__"""
+    return Units(
+        (other_unit for other_unit in other if other_unit.tag in (self_unit.tag for self_unit in units)),
+        units._bot_object,
+    )
+
+
+def sub_nested(units: Units, other: Units) -> Units:
+    """Previous Units.__sub__"""
+    return Units(
+        (self_unit for self_unit in units if self_unit.tag not in (other_unit.tag for other_unit in other)),
+        units._bot_object,
+    )
+
+
+def _run_nested(units: Units, other: Units) -> tuple[Units, Units, Units]:
+    return or_nested(units, other), and_nested(units, other), sub_nested(units, other)
+
+
+def _run_hashed(units: Units, other: Units) -> tuple[Units, Units, Units]:
+    # Fresh copies so the cached tag sets have to be built, like on the first operation of a frame
+    units, other = units.copy(), other.copy()
+    return units | other, units & other, units - other
+
+
+def test_set_operations_match_nested():
+    units, other = _units_pair()
+    for expected, result in zip(_run_nested(units, other), _run_hashed(units, other)):
+        assert [unit.tag for unit in expected] == [unit.tag for unit in result]
+    assert [unit.tag for unit in units + other] == [unit.tag for unit in units | other]
+    assert [unit.tag for unit in units - list(other)] == [unit.tag for unit in units - other]
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+
+from sc2.position import Point2
+from sc2.units import Units
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+if TYPE_CHECKING:
+    from sc2.bot_ai import BotAI
+
+MAP_AMOUNT: int = 5
+QUERY_AMOUNT: int = 100
+RADIUS: float = 10
+
+
+def _setups() -> list[tuple[BotAI, list[Point2]]]:
+    rng = random.Random(0)
+    setups: list[tuple[BotAI, list[Point2]]] = []
+    for map_path in sorted(MAPS)[:MAP_AMOUNT]:
+        bot = get_map_specific_bot(map_path)
+        width, height = bot.game_info.map_size
+        points = [Point2((rng.uniform(0, width), rng.uniform(0, height))) for _ in range(QUERY_AMOUNT)]
+        setups.append((bot, points))
+    return setups
+
+
+def _run_filter(setups: list[tuple[BotAI, list[Point2]]]) -> list[Units]:
+    return [
+        bot.all_units.filter(lambda unit: unit.distance_to(point) <= RADIUS + unit.radius)
+        for bot, points in setups
+        for point in points
+    ]
+
+
+def _run_in_radius(setups: list[tuple[BotAI, list[Point2]]]) -> list[Units]:
+    return [bot.all_units.in_radius(point, RADIUS, include_radius=True) for bot, points in setups for point in points]
+
+
+def test_in_radius_matches_filter():
+    setups = _setups()
+    for expected, result in zip(_run_filter(setups), _run_in_radius(setups)):
+        assert [unit.tag for unit in expected] == [unit.tag for unit in result]
+    for bot, points in setups:
+        for point in points:
+            # closer_than is strict, in_radius is not
+            closer = bot.all_units.closer_than(RADIUS, point).tags
+            assert bot.all_units.in_radius(point, RADIUS - 1e-5).tags <= closer <= bot.all_units.in_radius(point, RADIUS).tags
+            closest = bot.all_units.closest_n_units(point, 5)
+            nearest = bot.all_units.nearest_n_units(point, 5)
+            assert [unit.distance_to(point) for unit in closest] == [unit.distance_to(point) for unit in nearest]
+
+
+def test_spatial_index_invalidated_on_mutation():
+    bot = _setups()[0][0]
+    units = bot.all_units.copy()
+    point = units[0].position
+    assert units[0] in units.in_radius(point, 0.1)
+    units.pop(0)
+    assert len(units.spatial_index) == len(units)
+    assert units.find_by_tag(bot.all_units[0].tag) is None
+    # append does not drop the indexes, they are rebuilt because the length changed
+    units.append(bot.all_units[0])
+    assert units.in_radius(point, 0.1)[-1] is bot.all_units[0]
+    assert units.find_by_tag(bot.all_units[0].tag) is bot.all_units[0]
+    assert bot.all_units[0].tag in units.tags
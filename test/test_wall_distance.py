@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from bot.macro.map.influence_maps.layers.static_layer import StaticLayer, wall_distance_transform
+from bot.utils import map_cache
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+MAP_AMOUNT: int = 5
+
+
+def wall_distance_bfs(pathing: np.ndarray) -> np.ndarray:
+    """4-neighborhood python BFS that was used by StaticLayer.compute_wall_distance"""
+    wall_mask: np.ndarray = pathing == 0
+    dist: np.ndarray = np.full_like(pathing, fill_value=9999, dtype=np.float32)
+    dist[wall_mask] = 0
+    offsets = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+    queue = list(zip(*np.where(wall_mask)))
+    idx = 0
+    while idx < len(queue):
+        y, x = queue[idx]
+        idx += 1
+        d = dist[y, x] + 1
+        for dy, dx in offsets:
+            ny, nx = y + dy, x + dx
+            if 0 <= ny < dist.shape[0] and 0 <= nx < dist.shape[1] and d < dist[ny, nx]:
+                dist[ny, nx] = d
+                queue.append((ny, nx))
+    return dist
+
+
+def _pathing_grids() -> list[np.ndarray]:
+    return [get_map_specific_bot(map_path).game_info.pathing_grid.data_numpy for map_path in sorted(MAPS)[:MAP_AMOUNT]]
+
+
+def _run_bfs(grids: list[np.ndarray]):
+    return [wall_distance_bfs(grid) for grid in grids]
+
+
+def _run_transform(grids: list[np.ndarray]):
+    return [wall_distance_transform(grid, "manhattan") for grid in grids]
+
+
+def test_transform_matches_bfs():
+    grids = _pathing_grids()
+    for expected, dist in zip(_run_bfs(grids), _run_transform(grids)):
+        assert dist.dtype == np.float32
+        assert (expected == dist).all()
+
+
+def test_transform_metrics():
+    grid = _pathing_grids()[0]
+    manhattan = wall_distance_transform(grid, "manhattan")
+    chebyshev = wall_distance_transform(grid, "chebyshev")
+    euclidean = wall_distance_transform(grid, "euclidean")
+    assert ((manhattan == 0) == (grid == 0)).all()
+    assert (chebyshev <= euclidean + 1e-6).all()
+    assert (euclidean <= manhattan + 1e-6).all()
+
+
+@pytest.fixture
+def cache_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(map_cache, "CACHE_FOLDER", tmp_path)
+    return tmp_path
+
+
+def _wall_distance_file(bot, metric: str):
+    key: str = f'{metric}_{map_cache.grid_hash(bot.game_info.pathing_grid.data_numpy)}'
+    return map_cache.cache_file(bot.game_info.map_name, "wall_distance", key, "npy")
+
+
+def test_map_cache_round_trip(cache_folder):
+    array = np.arange(12, dtype=np.float32).reshape(3, 4)
+    assert map_cache.load_array("Some Map LE", "layer", "key") is None
+    map_cache.save_array("Some Map LE", "layer", "key", array)
+    assert map_cache.cache_file("Some Map LE", "layer", "key", "npy") == cache_folder / "SomeMapLE" / "layer_key.npy"
+    loaded = map_cache.load_array("Some Map LE", "layer", "key")
+    assert loaded.dtype == array.dtype and (loaded == array).all()
+    assert map_cache.load_array("Some Map LE", "layer", "other_key") is None
+
+
+def test_wall_distance_cached_per_metric_and_grid(cache_folder):
+    bot = get_map_specific_bot(sorted(MAPS)[0])
+    pathing = bot.game_info.pathing_grid.data_numpy
+    layer = StaticLayer(bot)
+    assert (layer.wall_distance == wall_distance_transform(pathing, "manhattan")).all()
+    assert _wall_distance_file(bot, "manhattan").is_file()
+    assert not _wall_distance_file(bot, "euclidean").is_file()
+
+    # a cached array of the right shape is read instead of computed
+    marker = np.full(pathing.shape, 7, dtype=np.float32)
+    np.save(_wall_distance_file(bot, "manhattan"), marker)
+    assert (layer.compute_wall_distance() == marker).all()
+    assert (layer.compute_wall_distance("euclidean") == wall_distance_transform(pathing, "euclidean")).all()
+    assert _wall_distance_file(bot, "euclidean").is_file()
+
+    # another pathing grid on the same map is another key
+    pathing[pathing.shape[0] // 2, :] = 0
+    assert (layer.compute_wall_distance() == wall_distance_transform(pathing, "manhattan")).all()
+    assert len(list(cache_folder.rglob("wall_distance_manhattan_*.npy"))) == 2
+
+
+def test_wall_distance_recomputed_on_shape_mismatch(cache_folder):
+    bot = get_map_specific_bot(sorted(MAPS)[0])
+    expected = wall_distance_transform(bot.game_info.pathing_grid.data_numpy, "manhattan")
+    path = _wall_distance_file(bot, "manhattan")
+    path.parent.mkdir(parents=True)
+    np.save(path, np.zeros((3, 3), dtype=np.float32))
+
+    assert (StaticLayer(bot).wall_distance == expected).all()
+    assert (np.load(path) == expected).all()
+
+
+def test_wall_distance_recomputed_on_corrupt_file(cache_folder, capsys):
+    bot = get_map_specific_bot(sorted(MAPS)[0])
+    expected = wall_distance_transform(bot.game_info.pathing_grid.data_numpy, "manhattan")
+    path = _wall_distance_file(bot, "manhattan")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not a numpy file")
+
+    assert (StaticLayer(bot).wall_distance == expected).all()
+    assert "could not read map cache" in capsys.readouterr().out
+    assert (np.load(path) == expected).all()